@@ -0,0 +1,36 @@
+'''
+Horner BHT correction of many stations: one temperature.horner_batch call
+against a loop of temperature.horner (one np.polyfit per station).
+    python benchmarks/horner_batch.py [stations]
+'''
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from petrophysics.temperature import temperature
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    rng = np.random.default_rng(0)
+    circulation = rng.uniform(3, 8, size)
+    times = [np.sort(rng.uniform(4, 30, rng.integers(2, 6))) for _ in range(size)]
+    temps = [90 + 10 * np.log1p(t) + rng.normal(0, 0.5, len(t)) for t in times]
+
+    start = time.perf_counter()
+    fit = temperature.horner_batch(circulation, times, temps)
+    batch = time.perf_counter() - start
+    start = time.perf_counter()
+    looped = [temperature.horner(c, t, y) for c, t, y in zip(circulation, times, temps)]
+    loop = time.perf_counter() - start
+
+    print('%d stations, %d runs' % (size, fit['runs'].sum()))
+    print('%-14s %8.1f ms' % ('horner_batch', 1000 * batch))
+    print('%-14s %8.1f ms  (%.0fx)' % ('horner loop', 1000 * loop, loop / batch))
+    print('largest difference %.3g (horner rounds to 2 decimals)' % np.max(np.abs(fit['temperature'] - looped)))
+
+if __name__ == '__main__':
+    main()
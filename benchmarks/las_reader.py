@@ -0,0 +1,73 @@
+'''
+io.read_las and io.iter_las against a naive parser (one float() per value, line
+by line) on a generated unwrapped LAS 2.0 file, with the peak RSS of each reader
+measured in its own process (Linux/macOS).
+    python benchmarks/las_reader.py [rows] [curves]
+'''
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+from petrophysics.io.las import iter_las, read_las
+
+def write_las(path, rows, curves):
+    rng = np.random.default_rng(0)
+    with open(path, 'w') as f:
+        f.write('~V\nVERS. 2.0 :\nWRAP. NO :\n~W\nNULL. -999.25 :\n~C\nDEPT.M :\n')
+        f.write(''.join('C%d. :\n' % i for i in range(1, curves)))
+        f.write('~A\n')
+        for start in range(0, rows, 100000):
+            block = rng.uniform(0, 200, (min(100000, rows - start), curves))
+            block[:, 0] = 1000 + 0.1524 * np.arange(start, start + len(block))
+            np.savetxt(f, block, fmt='%.4f')
+
+def naive(path):
+    columns, data = None, False
+    with open(path) as f:
+        for line in f:
+            if data:
+                for column, value in zip(columns, line.split()):
+                    column.append(float(value))
+            elif line.startswith('~A'):
+                data = True
+            elif line.startswith('DEPT') or line.startswith('C'):
+                columns = (columns or []) + [[]]
+    return [np.array(column) for column in columns]
+
+def streamed(path):
+    for chunk in iter_las(path):
+        pass
+
+READERS = {'naive': naive, 'read_las': read_las, 'iter_las': streamed}
+
+def run(name, path):
+    start = time.perf_counter()
+    READERS[name](path)
+    elapsed = time.perf_counter() - start
+    print('%.3f %d' % (elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'run':
+        return run(sys.argv[2], sys.argv[3])
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    curves = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'bench.las')
+        write_las(path, rows, curves)
+        print('%d rows x %d curves, %.0f MB' % (rows, curves, os.path.getsize(path) / 1e6))
+        for name in READERS:
+            output = subprocess.check_output([sys.executable, __file__, 'run', name, path])
+            elapsed, rss = output.split()
+            scale = 1024 if sys.platform == 'darwin' else 1
+            print('%-10s %7.2f s %8.0f MB peak RSS' % (name, float(elapsed), int(rss) / scale / 1024))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+'''
+Direct evaluation of one-variable transforms against compute.LookupTable
+(4097 nodes, linear interpolation).
+
+A table evaluation is a scale, a cast, a clip and two gathers per sample, which
+costs more than the powers and square roots of these transforms. Only lucia,
+with its four logarithms and two exponentials, is faster from a table, so it is
+the one formula with a table constructor (permeability.lucia_table). The error
+is the largest observed absolute difference relative to the largest value; the
+table reports its own measured errors (max_rel_error, at the cell centres).
+    python benchmarks/lookup_tables.py [samples]
+'''
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from petrophysics.clayvolume import clayvolume
+from petrophysics.compute import LookupTable
+from petrophysics.permeability import permeability
+
+# name, transform of one curve, range of the curve
+TRANSFORMS = [
+    ('vclgr young', lambda gr: clayvolume.vclgr(gr, 20, 120, 'young'), (0, 200)),
+    ('vclgr clavier', lambda gr: clayvolume.vclgr(gr, 20, 120, 'clavier'), (0, 130)),
+    ('phiperm', lambda phi: permeability.phiperm(phi, 20, -1), (0, 0.4)),
+    ('timur (swirr 0.2)', lambda phi: permeability.timur(phi, 0.2), (0, 0.4)),
+    ('lucia (phisec 0.02, swirr 0.2)', lambda phi: permeability.lucia(phi, 0.02, 0.2), (0.04, 0.5)),
+]
+
+def best(func, x, repeat=5):
+    func(x)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(x)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    rng = np.random.default_rng(0)
+    print('%d samples, 4097 table nodes' % size)
+    print('%-32s %10s %10s %10s %14s' % ('transform', 'direct', 'table', 'max error', 'max rel error'))
+    with np.errstate(all='ignore'):
+        for name, func, (low, high) in TRANSFORMS:
+            x = rng.uniform(low, high, size)
+            lookup = LookupTable(func, low, high)
+            exact = func(x)
+            finite = np.isfinite(exact)
+            error = np.max(np.abs(lookup(x)[finite] - exact[finite])) / np.max(np.abs(exact[finite]))
+            print('%-32s %7.0f ms %7.0f ms %10.2e %14.2e' % (name, 1000 * best(func, x), 1000 * best(lookup, x),
+                                                          error, lookup.max_rel_error))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+'''
+Peak RSS of the vclgr -> density -> indonesian chain, with and without out=.
+
+Every mode runs in its own process (ru_maxrss only grows); the figure is the
+peak above the process holding its input curves.
+    python benchmarks/peak_memory.py [samples]
+'''
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+MODES = ('allocating', 'out')
+
+def rss():
+    '''peak resident set size of this process [MB] (ru_maxrss is in kB on Linux)'''
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+def run(mode, size):
+    from petrophysics.clayvolume import clayvolume
+    from petrophysics.porosity import porosity
+    from petrophysics.saturation import sw
+
+    rng = np.random.default_rng(0)
+    gr = rng.uniform(20, 120, size)
+    rhob = rng.uniform(2.2, 2.6, size)
+    rt = rng.uniform(2, 50, size)
+    base = rss()
+    start = time.perf_counter()
+    if mode == 'allocating':
+        vsh = clayvolume.vclgr(gr, 20, 120, 'young')
+        phid = porosity.density(rhob, 2.65, 1.0, vsh, 2.45)
+        water = sw.indonesian(0.05, rt, phid, 4, vsh, 1, 2, 2)
+    else:
+        # the results overwrite the curves they come from
+        vsh = clayvolume.vclgr(gr, 20, 120, 'young', out=gr)
+        phid = porosity.density(rhob, 2.65, 1.0, vsh, 2.45, out=rhob)
+        water = sw.indonesian(0.05, rt, phid, 4, vsh, 1, 2, 2, out=rt)
+    elapsed = time.perf_counter() - start
+    return rss() - base, elapsed, float(np.nanmean(water))
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    print('%d samples, inputs %.0f MB' % (size, 3 * size * 8 / 2**20))
+    for mode in MODES:
+        output = subprocess.check_output([sys.executable, __file__, '--mode', mode, str(size)])
+        peak, elapsed, mean = output.split()
+        print('%-12s +%6.0f MB  %6.2f s  (mean Sw %s)' % (mode, float(peak), float(elapsed), mean.decode()))
+
+if __name__ == '__main__':
+    if len(sys.argv) > 2 and sys.argv[1] == '--mode':
+        print('%f %f %.6f' % run(sys.argv[2], int(sys.argv[3])))
+    else:
+        main()
@@ -0,0 +1,48 @@
+'''
+A whole-well Rw-from-SP profile: one resistivity.rwsp call on the curves
+against a Python loop calling it sample by sample (what its scalar branches
+needed before). The loop runs on the first 20000 samples and is scaled.
+    python benchmarks/rw_from_sp.py [samples]
+'''
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from petrophysics.clayvolume import clayvolume
+from petrophysics.resistivity import rwsp, rwsp1
+
+LOOPED = 20000
+
+def best(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = np.random.default_rng(0)
+    sp = rng.uniform(-120, 0, size)
+    ri = rng.uniform(0.5, 30, size)
+    tf = np.linspace(40, 110, size)
+    bed = rng.uniform(1, 30, size)
+    cases = [('rwsp', rwsp, (sp, 0.9, 0.7, ri, 25, tf, bed)),
+             ('rwsp1', rwsp1, (sp, 0.7, 25, tf)),
+             ('vclr', clayvolume.vclr, (ri, 30.0, 2.0))]
+    print('%d samples' % size)
+    print('%-8s %10s %14s %8s' % ('', 'curves', 'scalar loop', 'speedup'))
+    with np.errstate(all='ignore'):
+        for name, func, args in cases:
+            rows = [[arg[i] if np.ndim(arg) else arg for arg in args] for i in range(LOOPED)]
+            curves = best(lambda: func(*args))
+            loop = best(lambda: [func(*row) for row in rows]) * size / LOOPED
+            print('%-8s %7.1f ms %11.0f ms %7.0fx' % (name, 1000 * curves, 1000 * loop, loop / curves))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+'''
+Every saturation.sw model on whole curves against a Python loop calling it
+sample by sample with scalars (what the models needed before they took arrays).
+The loop runs on the first 20000 samples and is scaled to the curve length.
+    python benchmarks/sw_arrays.py [samples]
+'''
+import inspect
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from petrophysics.saturation import sw
+
+MODELS = ['archie', 'simandoux', 'modified_simandoux', 'schlumberger', 'fertl', 'poupon',
+          'indonesian', 'modified_indonesian', 'waxmansmith', 'juhasz', 'dualwater', 'archiet', 'ratio']
+LOOPED = 20000
+
+def arguments(func, size, rng):
+    '''curves for the log readings, scalars for the parameters'''
+    curves = dict(Rt=rng.uniform(2, 50, size), Phi=rng.uniform(0.05, 0.3, size),
+                  Vsh=rng.uniform(0, 0.4, size), Rxo=rng.uniform(1, 10, size))
+    curves.update(phiT=curves['Phi'], PhiT=curves['Phi'])
+    params = dict(Rw=0.05, Rsh=4.0, Rmf=0.5, a=1.0, aa=1.0, m=2.0, mm=2.0, n=2.0, CEC=2.0,
+                  den_ma=2.65, PhiSh=0.12, PhiTSh=0.12, Temp=80.0)
+    return dict((name, curves[name] if name in curves else params[name])
+                for name in inspect.signature(func).parameters)
+
+def best(func, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    rng = np.random.default_rng(0)
+    print('%d samples' % size)
+    print('%-22s %10s %14s %8s' % ('model', 'arrays', 'scalar loop', 'speedup'))
+    with np.errstate(all='ignore'):
+        for model in MODELS:
+            func = getattr(sw, model)
+            kwargs = arguments(func, size, rng)
+            rows = [dict((name, value[i] if np.ndim(value) else value) for name, value in kwargs.items())
+                    for i in range(LOOPED)]
+            array = best(lambda: func(**kwargs))
+            loop = best(lambda: [func(**row) for row in rows]) * size / LOOPED
+            print('%-22s %7.1f ms %11.0f ms %7.0fx' % (model, 1000 * array, 1000 * loop, loop / array))
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,45 @@
+'''
+Several water saturation models on the same curves: saturation.models.evaluate,
+which computes the shared intermediates (Phi**m, 1/Rt, Vsh/Rsh ...) once,
+against calling the sw functions one after the other. Both give identical results.
+    python benchmarks/sw_models.py [samples]
+'''
+import inspect
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from petrophysics.saturation import models, sw
+
+def best(func, repeat=5):
+    func()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+def separately(curves):
+    results = {}
+    for model in models.MODELS:
+        func = getattr(sw, model)
+        results[model] = func(**dict((name, curves[name]) for name in inspect.signature(func).parameters))
+    return results
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = np.random.default_rng(0)
+    curves = dict(Rw=0.05, Rt=rng.uniform(2, 50, size), Phi=rng.uniform(0.05, 0.3, size),
+                  Rsh=4.0, Vsh=rng.uniform(0, 0.4, size), a=1, m=2, n=2)
+    print('%d samples, %d models' % (size, len(models.MODELS)))
+    with np.errstate(all='ignore'):
+        print('%-20s %7.0f ms' % ('sw functions', 1000 * best(lambda: separately(curves))))
+        print('%-20s %7.0f ms' % ('models.evaluate', 1000 * best(lambda: models.evaluate(None, **curves))))
+
+if __name__ == '__main__':
+    main()
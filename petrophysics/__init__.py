@@ -1,7 +1,10 @@
 from . import clayvolume
+from . import compute
 from . import conversions
+from . import io
 from . import lithology
 from . import permeability
+from . import pipeline
 from . import porosity
 from . import reserves
 from . import resistivity
@@ -9,19 +12,24 @@ from . import rockphysics
 from . import salinity
 from . import saturation
 from . import temperature
+from . import well
 
 
 __all__ = ['clayvolume',
+           'compute',
            'conversions',
+           'io',
            'lithology',
            'permeability',
+           'pipeline',
            'porosity',
            'reserves',
            'resistivity',
            'rockphysics',
            'salinity',
            'saturation',
-           'temperature'
+           'temperature',
+           'well'
            ]
 
 
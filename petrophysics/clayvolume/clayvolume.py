@@ -13,8 +13,15 @@ vclnd - ND,
 vclds - SD,
 vclns - NS,
 vcllog1log2 -log1log2
+
+out=vsh writes a clay volume into an existing curve, computed in blocks
+(compute.transform).
 ''' 
+import numpy as np
+
+from ..compute.transform import transform
 
+@transform
 def vclgr(gr_log, gr_clean, gr_clay, correction=None):
     '''
     vclgr(gr_log, gr_clean, gr_clay, correction=None)
@@ -48,6 +55,7 @@ def vclgr(gr_log, gr_clean, gr_clay, correction=None):
         vclgr=igr
     return vclgr
     
+@transform
 def vclth(th_log, th_clean, th_clay):
     '''
     vclth(th_log, th_clean, th_clay)
@@ -59,8 +67,9 @@ def vclth(th_log, th_clean, th_clay):
     - vclth - volume of clay from Thorium log
     '''
     vclth = (th_log-th_clean)/(th_clay-th_clean)
-    return mvclth
+    return vclth
 
+@transform
 def vclk(k_log, k_clean, k_clay):
     '''
     vclk(th_log, th_clean, th_clay)
@@ -74,6 +83,7 @@ def vclk(k_log, k_clean, k_clay):
     vclk = (k_log-k_clean)/(k_clay-k_clean)
     return vclk
 
+@transform
 def vclsp(sp_log, sp_clean, sp_clay):
     '''
     vclsp(sp_log, sp_clean, sp_clay)
@@ -87,23 +97,24 @@ def vclsp(sp_log, sp_clean, sp_clay):
     vclsp=(sp_log-sp_clean)/(sp_clay-sp_clean)
     return vclsp
 
+@transform
 def vclr(r_log, r_clean, r_clay):
     '''
-    vclr(r_log, r_clay, r_clean)
+    vclr(r_log, r_clean, r_clay)
     *Input parameters:
     - r_log - Resistivity log reading
     - r_clean - Resistivity clean reading
-    - r_clean - Resistivity clay reading
+    - r_clay - Resistivity clay reading
     *Returns:
-    - vclr - volume of clay from Resistivity log
+    - vclr - volume of clay from Resistivity log; samples with r_log > 2*r_clay
+      get the 0.5*(2*vr)**(0.67*(vr+1)) correction
     '''
     vr=(r_clay/r_log)*(r_clean-r_log)/(r_clean-r_clay)
-    if (r_log > 2* r_clay):
-        vclr = 0.5 * (2 * vr)**(0.67*(vr+1)) 
-    else:
-        vclr = vr
-    return vclr
+    with np.errstate(invalid='ignore', over='ignore'):
+        vclr = np.where(r_log > 2* r_clay, 0.5 * (2 * vr)**(0.67*(vr+1)), vr)
+    return vclr[()]
 
+@transform
 def vclneut(neut_log,neut_clay,neut_clean):
     '''
     vclneut(neut_log,neut_clay,neut_clean)
@@ -117,6 +128,7 @@ def vclneut(neut_log,neut_clay,neut_clean):
     vclneut=((neut_log/neut_clay)*(neut_log-neut_clean)/(neut_clay-neut_clean))**0.5
     return vclneut
 
+@transform
 def vcllog(log, log_clean, log_clay):
     '''
     vcllog(log, sp_clean, sp_clay)
@@ -132,6 +144,7 @@ def vcllog(log, log_clean, log_clay):
 
 #DOUBLE-CLAY Indicators: ND, SD, SN
 
+@transform
 def vclnd(neut,den,neut_clean1,den_clean1,neut_clean2,den_clean2,neut_clay,den_clay):
     '''    
     vclnd(neut,den,neut_clean1,den_clean1,neut_clean2,den_clean2,neut_clay,den_clay):
@@ -148,6 +161,7 @@ def vclnd(neut,den,neut_clean1,den_clean1,neut_clean2,den_clean2,neut_clay,den_c
     vclnd=term1/term2
     return vclnd
 
+@transform
 def vclsd(sonic,den,sonic_clean1,den_clean1,sonic_clean2,den_clean2,sonic_clay,den_clay):
     '''
     vclsd(sonic,den,sonic_clean1,den_clean1,sonic_clean2,den_clean2,sonic_clay,den_clay)
@@ -164,6 +178,7 @@ def vclsd(sonic,den,sonic_clean1,den_clean1,sonic_clean2,den_clean2,sonic_clay,d
     vclsd=term1/term2
     return vclsd
 
+@transform
 def vclns(neut,sonic,neut_clean1,sonic_clean1,neut_clean2,sonic_clean2,neut_clay,sonic_clay):
     '''
     vclns(neut,sonic,neut_clean1,sonic_clean1,neut_clean2,sonic_clean2,neut_clay,sonic_clay)
@@ -179,6 +194,7 @@ def vclns(neut,sonic,neut_clean1,sonic_clean1,neut_clean2,sonic_clean2,neut_clay
     vclns=term1/term2
     return vclns
 
+@transform
 def vcllog1log2(log1,log2,log1_clean1,log2_clean1,log1_clean2,log2_clean2,log1_clay,log2_clay):
     '''
     vcllog1log2(log1,log2,log1_clean1,log2_clean1,log1_clean2,log2_clean2,log1_clay,log2_clay)
@@ -0,0 +1,19 @@
+from .kernels import Kernel, kernel, KERNELS, get_backend, set_backend, set_threads, check_kernels
+from .lut import LookupTable
+from .transform import transform
+from .precision import set_precision, get_precision, working_precision, asfloat
+
+__all__ = ['Kernel',
+           'kernel',
+           'KERNELS',
+           'get_backend',
+           'set_backend',
+           'set_threads',
+           'check_kernels',
+           'LookupTable',
+           'transform',
+           'set_precision',
+           'get_precision',
+           'working_precision',
+           'asfloat'
+           ]
@@ -0,0 +1,299 @@
+'''
+Expression kernels for the hot formulas of sw, permeability and clayvolume:
+Kernel - a formula compiled from one array expression; evaluated by numexpr
+         (multi-threaded, no temporaries) when it is installed, else by NumPy
+kernel - returns a kernel by name ('sw.archie', 'permeability.timur' ...)
+KERNELS - all the kernels, by name
+get_backend, set_backend - 'numexpr' or 'numpy'
+set_threads - number of numexpr threads
+check_kernels - compares every kernel with the function it repeats
+
+numexpr is optional (pip install petrophysics[fast]); without it the kernels
+give the same results through plain NumPy. Kernels accept out= (in-place
+evaluation, e.g. out=phi) and where= (only the masked samples of out are
+written), like NumPy ufuncs. The expressions repeat the formulas of the
+original functions operation for operation; every kernel names that function
+(Kernel.source) and kernel() checks the kernel against it on a few samples the
+first time it is looked up, so a formula edited on one side only is caught.
+'''
+import importlib
+import re
+
+import numpy as np
+
+try:
+    import numexpr
+except ImportError:
+    numexpr = None
+
+_backend = 'numexpr' if numexpr is not None else 'numpy'
+_functions = {'exp': np.exp, 'log': np.log, 'sqrt': np.sqrt, 'where': np.where, 'abs': np.abs}
+
+def get_backend():
+    return _backend
+
+def set_backend(backend):
+    '''
+    set_backend(backend)
+    - backend - 'numexpr' (needs the numexpr package) or 'numpy'
+    '''
+    global _backend
+    if backend not in ('numexpr', 'numpy'):
+        raise ValueError('unknown backend "%s", expected numexpr or numpy' % backend)
+    if backend == 'numexpr' and numexpr is None:
+        raise ImportError('the numexpr backend needs the numexpr package (pip install numexpr)')
+    _backend = backend
+
+def set_threads(threads):
+    '''
+    set_threads(threads)
+    Sets the number of threads numexpr evaluates with; returns the previous number.
+    '''
+    if numexpr is None:
+        raise ImportError('threads are a numexpr feature (pip install numexpr)')
+    return numexpr.set_num_threads(threads)
+
+class Kernel(object):
+    '''
+    Kernel(name, args, expression, source=None, **fixed)
+    *Input parameters:
+    - name - kernel name
+    - args - argument names, in call order
+    - expression - formula written with the arguments, + - * / **, and
+      exp, log, sqrt, where, abs
+    - source - dotted name of the function the expression repeats, relative to
+      the petrophysics package (e.g. 'saturation.sw.archie')
+    - fixed - keyword arguments of source fixed by the kernel (e.g. correction='young')
+    *Exemple:
+    archie = kernel('sw.archie')
+    sw = archie(Rw=0.05, Rt=rt, Phi=phie, a=1, m=2, n=2)
+    archie(0.05, rt, phie, 1, 2, 2, out=sw, where=net)   # overwrites sw on net samples only
+    '''
+    def __init__(self, name, args, expression, source=None, **fixed):
+        self.name = name
+        self.args = tuple(args)
+        self.expression = expression
+        self.source = source
+        self.fixed = fixed
+        self.checked = False
+        # arguments are renamed so that none shadows a function (e.g. vcllog's log)
+        self._names = ['_%d' % index for index in range(len(self.args))]
+        for arg, safe in zip(self.args, self._names):
+            expression = re.sub(r'\b%s\b(?!\s*\()' % arg, safe, expression)
+        self._expression = expression
+        self._code = compile(expression, name, 'eval')
+
+    def __repr__(self):
+        return 'Kernel(%s(%s) = %s)' % (self.name, ', '.join(self.args), self.expression)
+
+    def __call__(self, *args, **kwargs):
+        '''
+        kernel(*args, out=None, where=True, **kwargs)
+        *Input parameters:
+        - args, kwargs - the formula arguments (scalars or arrays, broadcast together)
+        - out - array receiving the result (may be one of the inputs)
+        - where - boolean mask; out keeps its values where it is False
+        *Returns:
+        - out, or a new array (a 0-d array for scalar inputs)
+        '''
+        out = kwargs.pop('out', None)
+        where = kwargs.pop('where', True)
+        if len(args) > len(self.args):
+            raise TypeError('%s takes %d arguments, got %d' % (self.name, len(self.args), len(args)))
+        values = dict(zip(self.args, args))
+        for arg, value in kwargs.items():
+            if arg not in self.args:
+                raise TypeError('%s has no argument %s' % (self.name, arg))
+            if arg in values:
+                raise TypeError('%s got multiple values for argument %s' % (self.name, arg))
+            values[arg] = value
+        missing = [arg for arg in self.args if arg not in values]
+        if missing:
+            raise TypeError('%s is missing argument(s) %s' % (self.name, ', '.join(missing)))
+        values = dict((safe, values[arg]) for arg, safe in zip(self.args, self._names))
+        masked = where is not True
+        if _backend == 'numexpr':
+            # scalar parameters are passed as 0-d arrays of the precision of the curves,
+            # so one compiled expression serves every value (NaN and inf included)
+            values = dict((safe, np.asarray(value)) for safe, value in values.items())
+            curves = [value for value in values.values() if value.ndim]
+            dtype = np.result_type(*curves + [1.0]) if curves else np.float64
+            for safe, value in values.items():
+                if not value.ndim:
+                    values[safe] = value.astype(dtype)
+            target = out
+            if out is not None and (masked or any(np.shares_memory(out, value) for value in values.values())):
+                target = None
+            result = numexpr.evaluate(self._expression, local_dict=values, global_dict={}, out=target,
+                                      casting='unsafe')
+        else:
+            scope = dict(_functions)
+            scope['__builtins__'] = {}
+            result = eval(self._code, scope, values)
+        if out is None:
+            if masked:
+                raise ValueError('where= needs an out= array')
+            return np.asarray(result)
+        if result is not out:
+            np.copyto(out, result, casting='unsafe', where=where)
+        return out
+
+    def function(self):
+        '''the function the kernel repeats, with the fixed arguments bound'''
+        module, name = ('petrophysics.' + self.source).rsplit('.', 1)
+        func = getattr(importlib.import_module(module), name)
+        return lambda *args: func(*args, **self.fixed)
+
+    def check(self, size=64, seed=0):
+        '''
+        check(size=64, seed=0)
+        Evaluates the kernel (NumPy backend) and its source function on size random
+        samples in [0.05, 0.95) for every argument.
+        *Returns:
+        - largest relative difference (0 when the kernel repeats the function exactly);
+          the two must also agree on which samples are NaN
+        '''
+        rng = np.random.default_rng(seed)
+        args = [rng.uniform(0.05, 0.95, size) for arg in self.args]
+        global _backend
+        backend, _backend = _backend, 'numpy'
+        try:
+            with np.errstate(all='ignore'):
+                result = self(*args)
+                expected = np.asarray(self.function()(*args), dtype=np.float64)
+        finally:
+            _backend = backend
+        if not np.array_equal(np.isnan(result), np.isnan(expected)):
+            return np.inf
+        finite = np.isfinite(expected)
+        with np.errstate(all='ignore'):
+            difference = np.abs(result[finite] - expected[finite]) / np.maximum(np.abs(expected[finite]), 1e-300)
+        return float(difference.max(initial=0))
+
+def check_kernels(rtol=1e-12):
+    '''
+    check_kernels(rtol=1e-12)
+    Checks every kernel against the function it repeats (Kernel.check).
+    *Returns:
+    - dict of kernel name -> largest relative difference
+    Raises ValueError naming the kernels differing by more than rtol.
+    '''
+    differences = dict((name, KERNELS[name].check()) for name in sorted(KERNELS))
+    _raise_differing(differences, rtol)
+    for name in differences:
+        KERNELS[name].checked = True
+    return differences
+
+def _raise_differing(differences, rtol):
+    differing = ['%s (%g)' % (name, difference) for name, difference in differences.items() if difference > rtol]
+    if differing:
+        raise ValueError('kernel(s) differing from their function: %s' % ', '.join(differing))
+
+def kernel(name):
+    '''
+    kernel(name)
+    Returns the kernel of a formula, named after its module and function
+    (see KERNELS), e.g. kernel('sw.indonesian').
+    '''
+    try:
+        found = KERNELS[name]
+    except KeyError:
+        raise KeyError('no kernel "%s", available: %s' % (name, ', '.join(sorted(KERNELS))))
+    if not found.checked and found.source is not None:
+        _raise_differing({name: found.check()}, 1e-12)
+        found.checked = True
+    return found
+
+_rfn = 'exp(7.163 + 1.883 * log(phie - phisec) + log(swirr)) / (3.063 + 0.610 * log(phie - phisec))'
+_igr = '((gr_log-gr_clean)/(gr_clay-gr_clean))'
+
+KERNELS = dict((name, Kernel(name, args.split(), expression, source, **fixed))
+               for name, args, expression, source, fixed in [
+    # saturation.sw
+    ('sw.archie', 'Rw Rt Phi a m n',
+     '((a / (Phi**m)) * Rw/Rt)**n',
+     'saturation.sw.archie', {}),
+    ('sw.simandoux', 'Rw Rt Phi Rsh Vsh a m',
+     '((-1)*(Vsh/Rsh) + ((Vsh/Rsh)**2 - 4*(Phi**m/(a*Rw))*(-1/Rt))**(0.5)) / (2*(Phi**m/(a*Rw)))',
+     'saturation.sw.simandoux', {}),
+    ('sw.modified_simandoux', 'Rw Rt Phi Rsh Vsh a m',
+     '((-1)*(Vsh/Rsh) + ((Vsh/Rsh)**2 - 4*(Phi**m/(a*Rw*(1-Vsh)))*(-1/Rt))**(0.5)) / (2*(Phi**m/(a*Rw*(1-Vsh))))',
+     'saturation.sw.modified_simandoux', {}),
+    ('sw.schlumberger', 'Rw Rt Phi Rsh Vsh',
+     '(sqrt((Vsh/Rsh)**2 + Phi**2/(0.2*Rw*Rt*(1-Vsh)))-(Vsh/Rsh)) / (Phi**2 /(0.4*Rw*(1-Vsh)))',
+     'saturation.sw.schlumberger', {}),
+    ('sw.fertl', 'Rw Rt Phi Rsh Vsh a',
+     '(1/Phi)*(sqrt(Rw/Rt+((a*Vsh)/2)**2)-a*Vsh/2)',
+     'saturation.sw.fertl', {}),
+    ('sw.poupon', 'Rw Rt Phi Rsh Vsh a m n',
+     '((1/Rt - Vsh/Rsh) * (a * Rw * (1-Vsh) / Phi**m))**(1/n)',
+     'saturation.sw.poupon', {}),
+    ('sw.indonesian', 'Rw Rt Phi Rsh Vsh a m n',
+     '((1/Rt**(0.5)) / ((Phi**m/(a*Rw))**(0.5) + Vsh ** (1-Vsh/2)/Rsh**(0.5)))**(2/n)',
+     'saturation.sw.indonesian', {}),
+    ('sw.modified_indonesian', 'Rw Rt Phi Rsh Vsh a m n',
+     '((1/Rt**(0.5)) / ((Phi**m / (a*Rw))**(0.5) + Vsh**((1-Vsh)/2) / Rsh**(0.5)))**(2/n)',
+     'saturation.sw.modified_indonesian', {}),
+    ('sw.archiet', 'Rw Rt PhiT a m n',
+     '((a / (PhiT**m)) * Rw/Rt)**n',
+     'saturation.sw.archiet', {}),
+    ('sw.ratio', 'Rw Rt Rmf Rxo',
+     '((Rxo/Rt) / (Rmf/Rw)) ** (0.625)',
+     'saturation.sw.ratio', {}),
+    # permeability
+    ('permeability.phiperm', 'phi c1 c2',
+     '10 ** (c1* phi + c2)',
+     'permeability.permeability.phiperm', {}),
+    ('permeability.fperm', 'phi c1 c2 a m',
+     'c1 / ((a / (phi ** m)) ** c2)',
+     'permeability.permeability.fperm', {}),
+    ('permeability.wyllie_rose', 'phi swirr c1 c2 c3',
+     'c1 * phi**c2 / swirr**c3',
+     'permeability.permeability.wyllie_rose', {}),
+    ('permeability.timur', 'phi swirr',
+     '8581 * phi**4.4 / swirr**2',
+     'permeability.permeability.timur', {}),
+    ('permeability.morris_biggs_oil', 'phi swirr',
+     '62500 * phi**6 / swirr**2',
+     'permeability.permeability.morris_biggs_oil', {}),
+    ('permeability.morris_biggs_gas', 'phi swirr',
+     '6241 * phi**6 / swirr**2',
+     'permeability.permeability.morris_biggs_gas', {}),
+    ('permeability.schlumberger', 'phi swirr',
+     '10000 * phi**4.5 / swirr**2',
+     'permeability.permeability.schlumberger', {}),
+    ('permeability.lucia', 'phie phisec swirr',
+     'exp((27.56 - 12.08 * log(%s)) + ((8.671 - 3.603 * log(%s)) * log(phie - phisec)))' % (_rfn, _rfn),
+     'permeability.permeability.lucia', {}),
+    ('permeability.fractureperm', 'wf df kf1',
+     '833 * 10**11 * (0.001* wf * df * kf1)**3 / (df**2 * kf1**2)',
+     'permeability.permeability.fractureperm', {}),
+    # clayvolume
+    ('clayvolume.vclgr', 'gr_log gr_clean gr_clay',
+     _igr,
+     'clayvolume.clayvolume.vclgr', {}),
+    ('clayvolume.vclgr_young', 'gr_log gr_clean gr_clay',
+     '0.083*(2**(3.7*%s)-1)' % _igr,
+     'clayvolume.clayvolume.vclgr', {'correction': 'young'}),
+    ('clayvolume.vclgr_older', 'gr_log gr_clean gr_clay',
+     '0.33*(2**(2*%s)-1)' % _igr,
+     'clayvolume.clayvolume.vclgr', {'correction': 'older'}),
+    ('clayvolume.vclgr_clavier', 'gr_log gr_clean gr_clay',
+     '1.7-(3.38-(%s+0.7)**2)**0.5' % _igr,
+     'clayvolume.clayvolume.vclgr', {'correction': 'clavier'}),
+    ('clayvolume.vclgr_steiber', 'gr_log gr_clean gr_clay',
+     '0.5*%s/(1.5-%s)' % (_igr, _igr),
+     'clayvolume.clayvolume.vclgr', {'correction': 'steiber'}),
+    ('clayvolume.vclk', 'k_log k_clean k_clay',
+     '(k_log-k_clean)/(k_clay-k_clean)',
+     'clayvolume.clayvolume.vclk', {}),
+    ('clayvolume.vclsp', 'sp_log sp_clean sp_clay',
+     '(sp_log-sp_clean)/(sp_clay-sp_clean)',
+     'clayvolume.clayvolume.vclsp', {}),
+    ('clayvolume.vclneut', 'neut_log neut_clay neut_clean',
+     '((neut_log/neut_clay)*(neut_log-neut_clean)/(neut_clay-neut_clean))**0.5',
+     'clayvolume.clayvolume.vclneut', {}),
+    ('clayvolume.vcllog', 'log log_clean log_clay',
+     '(log-log_clean)/(log_clay-log_clean)',
+     'clayvolume.clayvolume.vcllog', {}),
+    ])
@@ -0,0 +1,71 @@
+'''
+Lookup-table (LUT) evaluation of an expensive formula of one curve:
+LookupTable - tabulates the formula on a uniform grid and evaluates curves by
+              linear interpolation, with the interpolation error measured when built
+
+Opt-in, and only worth it where the formula costs more than the table: a table
+evaluation is a scale, a cast, a clip and two gathers per sample, which is slower
+than the vectorized powers and square roots of the clay volume, porosity and
+saturation transforms. Of the package formulas only permeability.lucia (four
+logarithms and two exponentials) is faster from a table, see
+permeability.lucia_table and benchmarks/lookup_tables.py.
+'''
+import numpy as np
+
+class LookupTable(object):
+    '''
+    LookupTable(func, low, high, nodes=4097)
+    *Input parameters:
+    - func - formula of one curve, evaluated on arrays (other arguments fixed, e.g. a lambda)
+    - low, high - tabulated range of the curve
+    - nodes - grid points
+    *Attributes:
+    - grid, values - the grid and func on it
+    - max_error, max_rel_error - largest absolute and relative interpolation errors,
+      measured at the cell centres when the table is built
+    Samples outside [low, high] and NaN samples give NaN.
+    *Exemple:
+    table = LookupTable(lambda phi: permeability.timur(phi, 0.2), 0.01, 0.4)
+    k = table(phie)
+    '''
+    def __init__(self, func, low, high, nodes=4097):
+        if not high > low or nodes < 2:
+            raise ValueError('a lookup table needs low < high and at least 2 nodes')
+        self.low = float(low)
+        self.high = float(high)
+        self.nodes = int(nodes)
+        self.grid = np.linspace(self.low, self.high, self.nodes)
+        self.values = np.asarray(func(self.grid), dtype=np.float64)
+        self._scale = (self.nodes - 1) / (self.high - self.low)
+        centres = (self.grid[1:] + self.grid[:-1]) / 2
+        exact = np.asarray(func(centres), dtype=np.float64)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            error = np.abs(self(centres) - exact)
+            self.max_error = float(np.nanmax(error)) if np.isfinite(error).any() else np.nan
+            relative = error / np.abs(exact)
+            self.max_rel_error = float(np.nanmax(relative)) if np.isfinite(relative).any() else np.nan
+
+    def __repr__(self):
+        return 'LookupTable([%g, %g], %d nodes, max error %.3g, max relative error %.3g)' % (
+            self.low, self.high, self.nodes, self.max_error, self.max_rel_error)
+
+    def __call__(self, x):
+        '''
+        table(x)
+        Returns func(x) interpolated from the table (NaN outside the table range)
+        '''
+        x = np.asarray(x, dtype=np.float64)
+        shape = x.shape
+        x = x.reshape(-1)
+        position = (x - self.low) * self._scale
+        with np.errstate(invalid='ignore'):
+            index = position.astype(np.intp)
+        np.clip(index, 0, self.nodes - 2, out=index)
+        position -= index
+        left = self.values[index]
+        result = self.values[index + 1] - left
+        result *= position
+        result += left
+        # NaN samples are NaN already
+        result[(x < self.low) | (x > self.high)] = np.nan
+        return result.reshape(shape)[()]
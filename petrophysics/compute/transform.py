@@ -0,0 +1,56 @@
+'''
+transform - decorator giving the curve transforms (porosity, clayvolume,
+            rockphysics, saturation) an out= argument
+BLOCK_SIZE - number of samples evaluated at a time when out= is given
+
+The formulas are written with plain NumPy expressions. Without out= they are
+evaluated on the whole curves and return a new array. With out= they are
+evaluated BLOCK_SIZE samples at a time, every block written to its slice of out:
+the temporaries of the expression are block sized (they stay in cache and are
+recycled by the allocator from block to block) instead of curve sized, so the
+peak memory of a call is out plus a few blocks. out may be one of the input
+curves, the formulas being computed sample by sample:
+    phid = np.empty(len(rhob))
+    porosity.density(rhob, 2.65, 1.0, out=phid)
+    sw.indonesian(0.05, rt, phid, 4, vsh, 1, 2, 2, out=rt)     # overwrites rt
+'''
+import functools
+
+import numpy as np
+
+BLOCK_SIZE = 65536
+
+def transform(func):
+    '''
+    transform(func)
+    Adds out= to func, a formula computed sample by sample: the result is written
+    to out (which may be one of the input curves) block by block, and out is
+    returned; without out the result of func is returned
+    '''
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        out = kwargs.pop('out', None)
+        if out is None:
+            return func(*args, **kwargs)
+        if out.ndim == 0 or out.size <= BLOCK_SIZE:
+            np.copyto(out, func(*args, **kwargs), casting='same_kind')
+            return out
+        # array arguments are broadcast to out (views), then sliced along its first axis
+        args = [_broadcast(value, out.shape) for value in args]
+        kwargs = dict((name, _broadcast(value, out.shape)) for name, value in kwargs.items())
+        rows = max(1, BLOCK_SIZE * len(out) // out.size)
+        for start in range(0, len(out), rows):
+            block = slice(start, start + rows)
+            result = func(*[_block(value, block) for value in args],
+                          **dict((name, _block(value, block)) for name, value in kwargs.items()))
+            np.copyto(out[block], result, casting='same_kind')
+        return out
+    return wrapper
+
+def _broadcast(value, shape):
+    if isinstance(value, (np.ndarray, list, tuple)) and np.ndim(value):
+        return np.broadcast_to(np.asarray(value), shape)
+    return value
+
+def _block(value, block):
+    return value[block] if isinstance(value, np.ndarray) and value.ndim else value
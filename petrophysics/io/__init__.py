@@ -0,0 +1,11 @@
+from .las import read_las, iter_las, LasFile
+from .store import write_store, open_store, CurveStore
+
+__all__ = ['read_las',
+           'iter_las',
+           'LasFile',
+           'write_store',
+           'open_store',
+           'CurveStore'
+           ]
+
@@ -0,0 +1,234 @@
+'''
+LAS 2.0 / 3.0 reader:
+read_las - reads a LAS file, the ~A (~Log_Data) section is parsed a chunk at a time
+           into column-major arrays of the working precision (compute.set_precision),
+           NULL values are mapped to NaN
+iter_las - yields the data section in fixed-size depth chunks (bounded memory)
+LasFile - header + curves returned by read_las
+'''
+import itertools
+import warnings
+
+import numpy as np
+
+from ..compute.precision import get_precision
+
+class LasFile(object):
+    '''
+    LasFile(header, mnemonics, units, curves)
+    *Attributes:
+    - header - dict of section name (e.g. 'VERSION', 'WELL', 'CURVE', 'PARAMETER') ->
+               dict of mnemonic -> (unit, value, description)
+    - mnemonics - curve mnemonics in file order (the first one is the depth index)
+    - units - dict of mnemonic -> unit
+    - curves - dict of mnemonic -> array (read curves only), in the working precision
+      except the depth index which is always float64
+    - data - (n_samples, n_curves) Fortran ordered array backing the curves
+    '''
+    def __init__(self, header, mnemonics, units, curves, data=None):
+        self.header = header
+        self.mnemonics = mnemonics
+        self.units = units
+        self.curves = curves
+        self.data = data
+
+    @property
+    def depth(self):
+        return self.curves[self.mnemonics[0]]
+
+    @property
+    def null(self):
+        return _null(self.header)
+
+    def __getitem__(self, name):
+        return self.curves[name]
+
+    def __contains__(self, name):
+        return name in self.curves
+
+def read_las(path, curves=None, top=None, base=None):
+    '''
+    read_las(path, curves=None, top=None, base=None)
+    *Input parameters:
+    - path - LAS file (2.0 wrapped or unwrapped, 3.0 space/comma/tab delimited)
+    - curves - mnemonics to read (default all); the depth index is always read
+    - top, base - depth range to keep (default the whole file)
+    *Returns:
+    - LasFile
+    *Exemple:
+    las = read_las('well_A.las', curves=['GR', 'RHOB', 'RT'], top=1500, base=2100)
+    vsh = clayvolume.vclgr(las['GR'], 20, 120)
+    '''
+    with open(path, 'rb') as f:
+        header, mnemonics, units = _read_header(f)
+        columns = _columns(mnemonics, curves)
+        # parsed in float64 a chunk at a time, only the depth index is kept in float64
+        blocks, depths = [], []
+        for block, depth in _blocks(path, f, header, mnemonics, columns, top, base, 65536):
+            blocks.append(block)
+            depths.append(depth)
+    data = np.empty((sum(len(block) for block in blocks), len(columns)), dtype=get_precision(), order='F')
+    if blocks:
+        np.concatenate(blocks, out=data)
+    del blocks
+    names = [mnemonics[column] for column in columns]
+    curves = dict((name, data[:, i]) for i, name in enumerate(names))
+    if data.dtype != np.float64:
+        curves[names[0]] = np.concatenate(depths) if depths else np.empty(0)
+    return LasFile(header, mnemonics, units, curves, data)
+
+def iter_las(path, chunk_size=65536, curves=None, top=None, base=None):
+    '''
+    iter_las(path, chunk_size=65536, curves=None, top=None, base=None)
+    *Input parameters:
+    - path - LAS file
+    - chunk_size - number of depth samples per chunk
+    - curves - mnemonics to read (default all); the depth index is always read
+    - top, base - depth range to keep
+    *Returns:
+    - generator of dicts mnemonic -> chunk array, chunk_size samples each (the last
+      one, and those cut by top/base, are shorter); memory use does not depend on the file size
+    *Exemple:
+    for chunk in iter_las('well_A.las', curves=['GR']):
+        vsh = clayvolume.vclgr(chunk['GR'], 20, 120)
+    '''
+    with open(path, 'rb') as f:
+        header, mnemonics, units = _read_header(f)
+        columns = _columns(mnemonics, curves)
+        names = [mnemonics[column] for column in columns]
+        for block, depth in _blocks(path, f, header, mnemonics, columns, top, base, chunk_size):
+            chunk = dict((name, block[:, i]) for i, name in enumerate(names))
+            if depth is not None:
+                chunk[names[0]] = depth
+            yield chunk
+
+def _blocks(path, f, header, mnemonics, columns, top, base, chunk_size):
+    '''
+    yields (block, depth) for every chunk_size samples of the data section: block is a
+    Fortran ordered array of the columns in the working precision, depth the float64
+    depth index when the working precision is not float64 (else None)
+    '''
+    delimiter = _delimiter(header)
+    null = _null(header)
+    ncurves = len(mnemonics)
+    wrapped = _wrapped(header)
+    pending = np.empty(0)
+    eof = False
+    while not eof:
+        lines = list(itertools.islice(f, chunk_size))
+        eof = not lines
+        if lines:
+            values = _parse(_data_lines(lines), delimiter)
+            if not wrapped and values.size % ncurves:
+                raise ValueError('%s: %d data values do not fill %d curves' % (path, values.size, ncurves))
+            pending = np.concatenate([pending, values])
+        while len(pending) >= chunk_size * ncurves or (eof and len(pending) >= ncurves):
+            nrows = min(len(pending) // ncurves, chunk_size)
+            rows = pending[:nrows * ncurves].reshape(nrows, ncurves)
+            pending = pending[nrows * ncurves:]
+            if top is not None or base is not None:
+                rows = rows[_depth_mask(rows[:, 0], top, base)]
+            if len(rows):
+                block = np.asfortranarray(rows[:, columns], dtype=get_precision())
+                _nan(block, null)
+                yield block, _depth(rows, header) if block.dtype != rows.dtype else None
+    if len(pending):
+        raise ValueError('%s: %d data values left over' % (path, len(pending)))
+
+def _read_header(f):
+    '''reads the header sections up to the data section, f is left at the first data line'''
+    header = {}
+    mnemonics = []
+    units = {}
+    section = None
+    for raw in iter(f.readline, b''):
+        line = raw.decode('latin-1').strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('~'):
+            name = line[1:].split()[0].split('|')[0].upper() if len(line) > 1 else ''
+            if name.startswith('A') or name == 'LOG_DATA':
+                if not mnemonics:
+                    raise ValueError('LAS data section found before the curve section')
+                return header, mnemonics, units
+            section = _section(name)
+            header.setdefault(section, {})
+            continue
+        if section is None or '.' not in line:
+            continue
+        mnemonic, rest = line.split('.', 1)
+        mnemonic = mnemonic.strip()
+        unit, space, rest = rest.partition(' ')
+        value, colon, description = rest.rpartition(':')
+        if not colon:
+            value, description = rest, ''
+        header[section][mnemonic] = (unit.strip(), value.strip(), description.strip())
+        if section == 'CURVE':
+            mnemonics.append(mnemonic)
+            units[mnemonic] = unit.strip()
+    raise ValueError('LAS file has no data section')
+
+def _section(name):
+    if name == 'LOG_DEFINITION':
+        return 'CURVE'
+    for prefix, section in (('V', 'VERSION'), ('W', 'WELL'), ('C', 'CURVE'),
+                            ('P', 'PARAMETER'), ('O', 'OTHER')):
+        if name.startswith(prefix):
+            return section
+    return name
+
+def _data_lines(lines):
+    '''data lines joined in one block, without blank and '#' comment lines'''
+    return b' '.join(line for line in lines if line.strip() and not line.lstrip().startswith(b'#'))
+
+def _parse(text, delimiter):
+    '''parses a block of data lines into a flat float64 array'''
+    if delimiter is not None:
+        text = text.replace(delimiter.encode(), b' ')
+    # older NumPy only warns and stops at an unreadable value
+    with warnings.catch_warnings():
+        warnings.simplefilter('error', DeprecationWarning)
+        try:
+            return np.fromstring(text, sep=' ')
+        except (ValueError, DeprecationWarning):
+            raise ValueError('LAS data section has an unreadable value')
+
+def _columns(mnemonics, curves):
+    if curves is None:
+        return list(range(len(mnemonics)))
+    missing = [name for name in curves if name not in mnemonics]
+    if missing:
+        raise KeyError('curves not in file: %s' % ', '.join(missing))
+    return [0] + [mnemonics.index(name) for name in curves if name != mnemonics[0]]
+
+def _delimiter(header):
+    dlm = header.get('VERSION', {}).get('DLM', ('', 'SPACE', ''))[1].upper()
+    return ',' if dlm == 'COMMA' else None
+
+def _wrapped(header):
+    return header.get('VERSION', {}).get('WRAP', ('', 'NO', ''))[1].upper() == 'YES'
+
+def _null(header):
+    value = header.get('WELL', {}).get('NULL', ('', '', ''))[1]
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+def _nan(block, null):
+    if null is not None:
+        block[block == null] = np.nan
+
+def _depth(rows, header):
+    '''the depth index (first column of rows) in float64, whatever the working precision'''
+    depth = np.array(rows[:, 0], dtype=np.float64)
+    _nan(depth, _null(header))
+    return depth
+
+def _depth_mask(depth, top, base):
+    mask = np.ones(len(depth), dtype=bool)
+    if top is not None:
+        mask &= depth >= top
+    if base is not None:
+        mask &= depth <= base
+    return mask
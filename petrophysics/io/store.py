@@ -0,0 +1,158 @@
+'''
+On-disk columnar curve store:
+write_store - writes a well (depth index + curves) to a store directory
+open_store - opens a store, curves are exposed as np.memmap views
+CurveStore - the store object returned by open_store
+
+A store is a directory holding one contiguous raw binary file per curve
+(<mnemonic>.bin) and an index.json describing the depth mnemonic, the number
+of samples and the dtype of every curve. Memory-mapped curves can be passed
+directly to the formula functions (vclgr, density, archie ...); processes
+opening the same store share the pages instead of copying the well.
+'''
+import json
+import os
+
+import numpy as np
+
+from ..compute.precision import get_precision
+
+INDEX = 'index.json'
+
+def write_store(path, depth, curves, depth_name='DEPT', dtype=None):
+    '''
+    write_store(path, depth, curves, depth_name='DEPT', dtype=None)
+    *Input parameters:
+    - path - store directory (created if missing)
+    - depth - depth index [m] or [ft], increasing
+    - curves - dict of mnemonic -> array (same length as depth) or iterator of chunks
+    - depth_name - mnemonic of the depth index
+    - dtype - dtype of the stored curves (default the working precision,
+      see compute.set_precision); the depth index is always float64
+    *Returns:
+    - the opened CurveStore (read only)
+    '''
+    depth = np.asarray(depth, dtype=np.float64)
+    if not os.path.isdir(path):
+        os.makedirs(path)
+    index = {'depth': depth_name, 'size': len(depth), 'curves': {}}
+    _write_index(path, index)
+    store = CurveStore(path, mode='r+')
+    store.add(depth_name, depth, dtype=np.float64)
+    for name, curve in curves.items():
+        store.add(name, curve, dtype=dtype)
+    return open_store(path)
+
+def open_store(path, mode='r'):
+    '''
+    open_store(path, mode='r')
+    *Input parameters:
+    - path - store directory
+    - mode - 'r' read only (pages shared between processes), 'r+' read/write
+    *Returns:
+    - CurveStore
+    '''
+    return CurveStore(path, mode)
+
+class CurveStore(object):
+    '''
+    CurveStore(path, mode='r')
+    *Attributes:
+    - depth - depth index (np.memmap)
+    - names - mnemonics of the stored curves (without the depth index)
+    - size - number of depth samples
+    *Exemple:
+    store = open_store('well_A')
+    vsh = clayvolume.vclgr(store['GR'], 20, 120)
+    '''
+    def __init__(self, path, mode='r'):
+        self.path = path
+        self.mode = mode
+        with open(os.path.join(path, INDEX)) as f:
+            self.index = json.load(f)
+        self._maps = {}
+
+    @property
+    def size(self):
+        return self.index['size']
+
+    @property
+    def depth(self):
+        return self[self.index['depth']]
+
+    @property
+    def names(self):
+        return [name for name in self.index['curves'] if name != self.index['depth']]
+
+    def __contains__(self, name):
+        return name in self.index['curves']
+
+    def __getitem__(self, name):
+        if name not in self._maps:
+            if name not in self.index['curves']:
+                raise KeyError('no curve "%s" in store %s' % (name, self.path))
+            entry = self.index['curves'][name]
+            self._maps[name] = np.memmap(os.path.join(self.path, entry['file']),
+                                         dtype=np.dtype(entry['dtype']), mode=self.mode,
+                                         shape=(self.size,))
+        return self._maps[name]
+
+    def depth_slice(self, top=None, base=None):
+        '''
+        depth_slice(top=None, base=None)
+        *Returns:
+        - slice of the samples with top <= depth <= base (found by bisection on the depth index)
+        '''
+        depth = self.depth
+        start = 0 if top is None else int(np.searchsorted(depth, top, side='left'))
+        stop = self.size if base is None else int(np.searchsorted(depth, base, side='right'))
+        return slice(start, stop)
+
+    def curves(self, names=None, top=None, base=None):
+        '''
+        curves(names=None, top=None, base=None)
+        *Returns:
+        - dict of mnemonic -> memmap view, restricted to the [top, base] depth range
+          (ready to be passed to Pipeline.run)
+        '''
+        names = self.names if names is None else names
+        window = self.depth_slice(top, base)
+        return dict((name, self[name][window]) for name in names)
+
+    def add(self, name, data, dtype=None):
+        '''
+        add(name, data, dtype=None)
+        Writes a curve into the store (replacing a curve with the same mnemonic).
+        *Input parameters:
+        - name - curve mnemonic
+        - data - array of length size, or an iterator of chunks (e.g. from pipeline.stream)
+        - dtype - dtype of the stored curve (default the working precision)
+        *Returns:
+        - the new curve (np.memmap)
+        '''
+        if self.mode == 'r':
+            raise IOError('store %s is opened read only' % self.path)
+        dtype = np.dtype(get_precision() if dtype is None else dtype)
+        entry = {'file': name + '.bin', 'dtype': dtype.str}
+        self.index['curves'][name] = entry
+        self._maps.pop(name, None)
+        curve = np.memmap(os.path.join(self.path, entry['file']), dtype=dtype, mode='w+',
+                          shape=(self.size,))
+        if isinstance(data, np.ndarray) or not hasattr(data, '__next__'):
+            curve[:] = data
+        else:
+            start = 0
+            for chunk in data:
+                chunk = np.atleast_1d(chunk)
+                curve[start:start + len(chunk)] = chunk
+                start += len(chunk)
+            if start != self.size:
+                raise ValueError('curve "%s" has %d samples, store has %d' % (name, start, self.size))
+        curve.flush()
+        _write_index(self.path, self.index)
+        self._maps[name] = curve
+        return curve
+
+def _write_index(path, index):
+    with open(os.path.join(path, INDEX), 'w') as f:
+        json.dump(index, f, indent=1)
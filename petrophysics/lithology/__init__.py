@@ -1,4 +1,5 @@
-from .lithology import m,n,romaa,dtmaa,umaa,ur_lith
+from .lithology import m,n,romaa,dtmaa,umaa,ur_lith,ur_solve,UR_ENDMEMBERS
+from .inversion import mineral_inversion, project_simplex
 
 __all__ = ['m',
            'n',
@@ -6,6 +7,10 @@ __all__ = ['m',
            'dtmaa',
            'umaa',
            'ur_lith',
+           'ur_solve',
+           'UR_ENDMEMBERS',
+           'mineral_inversion',
+           'project_simplex',
            ]
 
 
@@ -0,0 +1,167 @@
+'''
+Multi-mineral constrained inversion:
+mineral_inversion - volumes of any set of minerals and fluids from any set of logs,
+                    non-negative and summing to one, solved for the whole well at once
+project_simplex - projection of many vectors onto the unit simplex
+'''
+import numpy as np
+
+def mineral_inversion(logs, endmembers, uncertainties=None, max_iter=50, tol=1e-10,
+                      return_residuals=False):
+    '''
+    mineral_inversion(logs, endmembers, uncertainties=None, max_iter=50, tol=1e-10,
+                      return_residuals=False)
+    Solves, at every depth, min || (A v - log) / uncertainty ||^2 with v >= 0 and sum(v) = 1,
+    where the columns of A are the log responses of the endmembers.
+    All depths are solved together by a Lawson-Hanson type active-set method:
+    samples sharing the same set of non-zero components are solved with one
+    shared KKT matrix. Every depth starts from its projected unconstrained
+    least-squares solution; depths that have not converged after max_iter
+    iterations are restarted from the solution of their (converged) neighbour
+    above, and the few left after that are finished with accelerated projected
+    gradient iterations.
+    *Input parameters:
+    - logs - dict of log name -> curve (e.g. 'RHOB', 'NPHI', 'DT', 'PEF', 'umaa', 'romaa', 'dtmaa')
+    - endmembers - dict of component name -> dict of log name -> response, e.g.
+      {'quartz': {'RHOB': 2.65, 'NPHI': -0.04, 'DT': 55.5},
+       'calcite': {'RHOB': 2.71, 'NPHI': 0.0, 'DT': 47.5},
+       'water': {'RHOB': 1.0, 'NPHI': 1.0, 'DT': 189}}
+    - uncertainties - dict of log name -> uncertainty (default 1) used to weight the logs
+    - max_iter - maximum number of active-set iterations
+    - tol - tolerance on the Lagrange multipliers (relative to the largest entry of A'A)
+    - return_residuals - also return the (n_samples, n_logs) reconstruction residuals
+    *Returns:
+    - volumes - array (n_samples, n_components) in the order of endmembers; samples
+      with a missing (NaN) log are NaN
+    '''
+    names = list(logs)
+    components = list(endmembers)
+    for component in components:
+        missing = [name for name in names if name not in endmembers[component]]
+        if missing:
+            raise ValueError('endmember %s has no response for %s' % (component, ', '.join(missing)))
+    uncertainties = uncertainties or {}
+    weights = np.array([1.0 / uncertainties.get(name, 1.0) for name in names])
+    responses = np.array([[endmembers[component][name] for component in components] for name in names])
+    data = np.column_stack([np.asarray(logs[name], dtype=float).ravel() for name in names])
+    a = responses * weights[:, np.newaxis]
+    valid = ~np.isnan(data).any(axis=1)
+    q = a.T @ a
+    c = (data[valid] * weights) @ a
+    tol = tol * np.abs(q).max()
+
+    x = project_simplex(c @ np.linalg.pinv(q))
+    x, done = _active_set(q, c, x, max_iter, tol)
+    if not done.all():
+        # restart from the converged neighbour above
+        retry = np.flatnonzero(~done[1:] & done[:-1]) + 1
+        x[retry], done[retry] = _active_set(q, c[retry], x[retry - 1], max_iter, tol)
+    if not done.all():
+        left = np.flatnonzero(~done)
+        x[left] = _projected_gradient(q, c[left], project_simplex(x[left]), 20 * max_iter, tol)
+
+    volumes = np.full((len(data), len(components)), np.nan)
+    volumes[valid] = x
+    if return_residuals:
+        residuals = volumes @ responses.T - data
+        return volumes, residuals
+    return volumes
+
+def project_simplex(v):
+    '''
+    project_simplex(v)
+    *Input parameters:
+    - v - array (n_samples, n_components)
+    *Returns:
+    - Euclidean projection of every row of v onto {x >= 0, sum(x) = 1}
+      (sort based algorithm of Duchi et al., 2008)
+    '''
+    k = v.shape[1]
+    u = -np.sort(-v, axis=1)
+    css = np.cumsum(u, axis=1) - 1
+    cond = u - css / np.arange(1, k + 1) > 0
+    rho = k - 1 - np.argmax(cond[:, ::-1], axis=1)
+    theta = css[np.arange(len(v)), rho] / (rho + 1)
+    return np.maximum(v - theta[:, np.newaxis], 0)
+
+def _active_set(q, c, x, max_iter, tol):
+    '''
+    Lawson-Hanson type active-set iterations of min 1/2 x'qx - c'x, x >= 0, sum(x) = 1
+    for every row of c, starting from the feasible rows of x; rows sharing the same
+    free (non-zero) components are solved together with one KKT matrix
+    '''
+    n, k = c.shape
+    x = x.copy()
+    passive = x > 0
+    done = np.zeros(n, dtype=bool)
+    bits = 1 << np.arange(k)
+    kkt = {}
+    for iteration in range(max_iter):
+        todo = np.flatnonzero(~done)
+        if not len(todo):
+            break
+        codes = passive[todo] @ bits
+        z = np.zeros((len(todo), k))
+        mu = np.empty(len(todo))
+        for code in np.unique(codes):
+            group = np.flatnonzero(codes == code)
+            free = (code & bits) > 0
+            if code not in kkt:
+                kkt[code] = _kkt_inverse(q, free)
+            inv = kkt[code]
+            nfree = free.sum()
+            rhs = c[todo[group]][:, free]
+            z[np.ix_(group, np.flatnonzero(free))] = rhs @ inv[:nfree, :nfree].T + inv[:nfree, nfree]
+            mu[group] = rhs @ inv[nfree, :nfree] + inv[nfree, nfree]
+        current = passive[todo]
+        xt = x[todo]
+        blocked = (current & (z <= 0)).any(axis=1)
+
+        # interior solution: accept it and free the component with the most negative multiplier
+        free_rows = ~blocked
+        rows = todo[free_rows]
+        x[rows] = z[free_rows]
+        multipliers = z[free_rows] @ q - c[rows] + mu[free_rows, np.newaxis]
+        multipliers[current[free_rows]] = np.inf
+        best = np.argmin(multipliers, axis=1)
+        release = multipliers[np.arange(len(rows)), best] < -tol
+        passive[rows[release], best[release]] = True
+        done[rows[~release]] = True
+
+        # boundary: move towards the solution until a component hits zero, then fix it at zero
+        rows = todo[blocked]
+        xb, zb = xt[blocked], z[blocked]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratios = np.where(current[blocked] & (zb <= 0), xb / (xb - zb), np.inf)
+        alpha = ratios.min(axis=1)[:, np.newaxis]
+        xb = xb + alpha * (zb - xb)
+        keep = current[blocked] & (xb > tol * 1e-3) & (ratios > alpha)
+        xb[~keep] = 0
+        xb /= xb.sum(axis=1, keepdims=True)
+        x[rows] = xb
+        passive[rows] = keep
+    return x, done
+
+def _kkt_inverse(q, free):
+    '''(pseudo-)inverse of the KKT matrix [[q_ff, 1], [1', 0]] of the free components'''
+    nfree = free.sum()
+    matrix = np.zeros((nfree + 1, nfree + 1))
+    matrix[:nfree, :nfree] = q[np.ix_(free, free)]
+    matrix[:nfree, nfree] = 1
+    matrix[nfree, :nfree] = 1
+    return np.linalg.pinv(matrix)
+
+def _projected_gradient(q, c, x, max_iter, tol):
+    '''accelerated projected gradient (FISTA) iterations, used for the rows the active set did not finish'''
+    lipschitz = np.linalg.eigvalsh(q)[-1]
+    y = x.copy()
+    t = 1.0
+    for iteration in range(max_iter):
+        x_new = project_simplex(y - (y @ q - c) / lipschitz)
+        t_new = (1 + np.sqrt(1 + 4 * t ** 2)) / 2
+        step = x_new - x
+        y = x_new + ((t - 1) / t_new) * step
+        x, t = x_new, t_new
+        if np.abs(step).max() < tol:
+            break
+    return x
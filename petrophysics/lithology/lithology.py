@@ -6,7 +6,16 @@ ro_maa - apparent matrix density
 dtmaa - apparent matrix transit time
 umaa - apparent matrix volumetric cross section
 ur_lith - umaa-ro_maa-based lithology estimate
+ur_solve - batched umaa-ro_maa mineral inversion for any endmember set
 '''
+from functools import lru_cache
+
+import numpy as np
+
+# (name, roma [g/cc], uma [barns/cm3])
+UR_ENDMEMBERS = (('quartz', 2.65, 4.80),
+                 ('calcite', 2.71, 13.80),
+                 ('dolomite', 2.87, 9.00))
 
 def m(dt,dt_fl,den,den_fl):
     '''
@@ -87,42 +96,45 @@ def ur_lith(umaa, romaa, **kwargs):
     - ur_qtz - volume of quartz (v/v)
     - ur_cal - volume of calcite (v/v)
     - ur_dol - volume of dolomite (v/v)
+    umaa and romaa may be scalars or arrays (whole well), see ur_solve.
     Solution after: Doveton, J.H. (1994), _Geologic Log Analysis Using Computer Methods_, 
                     AAPG Computer Applications in Geology, No. 2
-    *Requires: NumPy for matrix inversion
     '''
-    import numpy as np
-
-    qtz_roma = 2.65
-    cal_roma = 2.71
-    dol_roma = 2.87
-    qtz_uma = 4.80
-    cal_uma = 13.80
-    dol_uma = 9.00
-    unity = 1.00
-
-    inv = np.matrix([[qtz_roma, cal_roma, dol_roma],
-                     [qtz_uma, cal_uma, dol_uma],
-                     [unity, unity, unity]]).I
-
-    qtz = inv[0,0] * romaa + inv[0,1] * umaa + inv[0,2]
-    cal = inv[1,0] * romaa + inv[1,1] * umaa + inv[1,2]
-    dol = inv[2,0] * romaa + inv[2,1] * umaa + inv[2,2]
-    if qtz < 0.0:
-        qtz = 0.0
-    if qtz > 1.0:
-        qtz = 1.0
-    if cal < 0.0:
-        cal = 0.0
-    if cal > 1.0:
-        cal = 1.0
-    if dol < 0.0:
-        dol = 0.0
-    if dol > 1.0:
-        dol = 1.0
-    ur_qtz = qtz / (qtz + cal + dol)
-    ur_cal = cal / (qtz + cal + dol)
-    ur_dol = dol / (qtz + cal + dol)
-
+    ur_qtz, ur_cal, ur_dol = np.moveaxis(ur_solve(umaa, romaa), -1, 0)
     return ur_qtz, ur_cal, ur_dol
 
+def ur_solve(umaa, romaa, endmembers=UR_ENDMEMBERS):
+    '''
+    ur_solve(umaa, romaa, endmembers=UR_ENDMEMBERS)
+    *Input parameters:
+    - umaa - apparent matrix volumetric cross section [barns/cm3], scalar or array
+    - romaa - apparent matrix density [g/cc], scalar or array
+    - endmembers - sequence of (name, roma, uma) mineral endmembers, default
+      quartz, calcite, dolomite. Three endmembers are solved exactly, any other
+      number by least-squares (pseudo-inverse); the inverse is computed once
+      per endmember set and cached.
+    *Returns:
+    - array of shape (n_samples, n_minerals) of mineral volumes (v/v), clamped
+      to [0, 1] and normalized to sum to 1
+    '''
+    umaa = np.asarray(umaa, dtype=float)
+    romaa = np.asarray(romaa, dtype=float)
+    inv = _ur_inverse(tuple((float(roma), float(uma)) for name, roma, uma in endmembers))
+    fractions = romaa[..., np.newaxis] * inv[:, 0] + umaa[..., np.newaxis] * inv[:, 1] + inv[:, 2]
+    np.clip(fractions, 0.0, 1.0, out=fractions)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        fractions /= fractions.sum(axis=-1, keepdims=True)
+    return fractions
+
+@lru_cache(maxsize=32)
+def _ur_inverse(endmembers):
+    '''(pseudo-)inverse of the [roma; uma; unity] endmember matrix, cached per endmember set'''
+    matrix = np.array([[roma for roma, uma in endmembers],
+                       [uma for roma, uma in endmembers],
+                       [1.0 for roma, uma in endmembers]])
+    if matrix.shape == (3, 3):
+        inv = np.linalg.inv(matrix)
+    else:
+        inv = np.linalg.pinv(matrix)
+    inv.setflags(write=False)
+    return inv
@@ -1,4 +1,4 @@
-from .permeability import phiperm, fperm, tixier, wyllie_rose, timur, morris_biggs_oil, morris_biggs_gas, schlumberger, coates_dumanoir, coates_deno, lucia, fractureperm    
+from .permeability import phiperm, fperm, tixier, wyllie_rose, timur, morris_biggs_oil, morris_biggs_gas, schlumberger, coates_dumanoir, coates_deno, lucia, lucia_table, fractureperm    
 
 __all__ = ['phiperm',
            'fperm',
@@ -11,6 +11,7 @@ __all__ = ['phiperm',
            'coates_dumanoir',
            'coates_deno',
            'lucia',
+           'lucia_table',
            'fractureperm'
            ]
 
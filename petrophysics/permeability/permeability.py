@@ -1,6 +1,10 @@
-__all__ = ['phiperm', 'fperm', 'tixier', 'wyllie_rose', 'timur', 'morris_biggs_oil', 'morris_biggs_gas', 'schlumberger', 'coates_dumanoir', 'coates_deno', 'lucia', 'fractureperm']
+__all__ = ['phiperm', 'fperm', 'tixier', 'wyllie_rose', 'timur', 'morris_biggs_oil', 'morris_biggs_gas', 'schlumberger', 'coates_dumanoir', 'coates_deno', 'lucia', 'lucia_table', 'fractureperm']
 import math
 
+import numpy as np
+
+from ..compute.lut import LookupTable
+
 '''
 List of functions:
 - based on crossplotting between core phi and perm:
@@ -200,10 +204,33 @@ def lucia(phie, phisec, swirr):
          - k - permeability (mD) calculated by Lucia(2003) formula
         '''
         phig = phie - phisec
-        rfn = math.exp(7.163 + 1.883 * math.log(phig) + math.log(swirr)) / (3.063 + 0.610 * math.log(phig))
-        k = math.exp((27.56 - 12.08 * math.log(rfn)) + ((8.671 - 3.603 * math.log(rfn)) * math.log(phig)))
+        rfn = np.exp(7.163 + 1.883 * np.log(phig) + np.log(swirr)) / (3.063 + 0.610 * np.log(phig))
+        k = np.exp((27.56 - 12.08 * np.log(rfn)) + ((8.671 - 3.603 * np.log(rfn)) * np.log(phig)))
         return k
 
+def lucia_table(phisec, swirr, low=None, high=0.5, nodes=4097):
+        '''
+        lucia_table(phisec, swirr, low=None, high=0.5, nodes=4097)
+        Lucia permeability tabulated against phie for fixed phisec and swirr (e.g. per zone);
+        about 1.6 times as fast as lucia on long curves (benchmarks/lookup_tables.py)
+        *Input parameters:
+         - phisec, swirr - secondary porosity index and water saturation, scalars
+         - low, high - tabulated phie range (default low: phisec + 0.02; lucia has a
+           pole near phie - phisec = 0.0066 and is undefined below it)
+         - nodes - table size
+        *Returns:
+         - compute.LookupTable; table(phie) is the permeability (mD), NaN outside the range,
+           table.max_rel_error its measured relative error (~1e-3 with 4097 nodes,
+           largest at the low end of the range)
+        *Exemple:
+         perm = lucia_table(0.02, 0.15)
+         k = perm(phie)
+        '''
+        if np.ndim(phisec) or np.ndim(swirr):
+            raise ValueError('lucia_table needs scalar phisec and swirr, use lucia for curves')
+        low = phisec + 0.02 if low is None else low
+        return LookupTable(lambda phie: lucia(phie, phisec, swirr), low, high, nodes)
+
 def fractureperm(wf, df, kf1):
         '''
         fractureperm(wf, df, kf1)
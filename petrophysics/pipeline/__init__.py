@@ -0,0 +1,16 @@
+from .pipeline import Pipeline, constant
+from .streaming import chunks, zip_chunks, stream, collect
+from .batch import run_wells
+from .zoned import Zones, ZonedRun
+
+__all__ = ['Pipeline',
+           'constant',
+           'chunks',
+           'zip_chunks',
+           'stream',
+           'collect',
+           'run_wells',
+           'Zones',
+           'ZonedRun'
+           ]
+
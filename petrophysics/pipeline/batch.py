@@ -0,0 +1,99 @@
+'''
+Multi-well batch runner:
+run_wells - runs a Pipeline over many wells on a process pool; curves are
+            handed to the workers through shared memory instead of being pickled
+'''
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from ..compute.precision import get_precision, working_precision
+
+def run_wells(pipeline, wells, processes=None, chunk_size=65536, keep=None):
+    '''
+    run_wells(pipeline, wells, processes=None, chunk_size=65536, keep=None)
+    *Input parameters:
+    - pipeline - Pipeline (its functions must be importable module functions, not lambdas)
+    - wells - list of dicts with keys:
+        'name' - well name
+        'curves' - dict of mnemonic -> 1-D array
+        'params' - dict of per-well parameters (a, m, n, Rw, gr_clean, gr_clay ...)
+    - processes - number of worker processes (default: number of CPUs);
+      processes=1 runs the wells in the calling process
+    - chunk_size - depth chunk size passed to Pipeline.run
+    - keep - names of the outputs to return (default all pipeline outputs)
+    *Returns:
+    - list (in the order of wells) of dicts with keys 'name', 'curves' (the outputs),
+      'samples' and 'seconds' (wall time of the interpretation in the worker)
+    The wells are evaluated in the working precision of the caller (compute.set_precision),
+    which is also the dtype of the shared memory blocks.
+    *Exemple:
+    results = run_wells(p, [{'name': 'A-1', 'curves': {'GR': gr1, 'RT': rt1}, 'params': {'Rw': 0.04}},
+                            {'name': 'A-2', 'curves': {'GR': gr2, 'RT': rt2}, 'params': {'Rw': 0.06}}])
+    '''
+    keep = pipeline.outputs if keep is None else list(keep)
+    if processes == 1:
+        results = []
+        for well in wells:
+            start = time.perf_counter()
+            curves = pipeline.run(well['curves'], chunk_size, keep, **well.get('params', {}))
+            results.append({'name': well.get('name'), 'curves': curves,
+                            'samples': _size(well['curves']),
+                            'seconds': time.perf_counter() - start})
+        return results
+    dtype = get_precision()
+    blocks = []
+    try:
+        jobs = []
+        for well in wells:
+            size = _size(well['curves'])
+            names = list(well['curves'])
+            inputs = _block(len(names) * size, dtype)
+            outputs = _block(len(keep) * size, dtype)
+            blocks.extend([inputs, outputs])
+            view = _view(inputs, len(names), size, dtype)
+            for row, name in enumerate(names):
+                view[row] = well['curves'][name]
+            jobs.append((pipeline, inputs.name, names, outputs.name, keep, size,
+                         chunk_size, well.get('params', {}), dtype.str))
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            seconds = list(pool.map(_run_well, jobs))
+        results = []
+        for index, well in enumerate(wells):
+            size = _size(well['curves'])
+            view = _view(blocks[2 * index + 1], len(keep), size, dtype)
+            results.append({'name': well.get('name'),
+                            'curves': dict((name, view[row].copy()) for row, name in enumerate(keep)),
+                            'samples': size, 'seconds': seconds[index]})
+        return results
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def _run_well(job):
+    '''worker: attaches to the shared blocks of one well and runs the pipeline into them'''
+    pipeline, inputs_name, names, outputs_name, keep, size, chunk_size, params, dtype = job
+    dtype = np.dtype(dtype)
+    inputs = shared_memory.SharedMemory(name=inputs_name)
+    outputs = shared_memory.SharedMemory(name=outputs_name)
+    try:
+        start = time.perf_counter()
+        with working_precision(dtype):
+            pipeline.run(dict(zip(names, _view(inputs, len(names), size, dtype))), chunk_size, keep,
+                         out=dict(zip(keep, _view(outputs, len(keep), size, dtype))), **params)
+        return time.perf_counter() - start
+    finally:
+        inputs.close()
+        outputs.close()
+
+def _size(curves):
+    return len(next(iter(curves.values())))
+
+def _block(count, dtype):
+    return shared_memory.SharedMemory(create=True, size=max(count, 1) * dtype.itemsize)
+
+def _view(block, rows, size, dtype):
+    return np.ndarray((rows, size), dtype=dtype, buffer=block.buf)
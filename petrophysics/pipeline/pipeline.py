@@ -0,0 +1,208 @@
+'''
+Whole-well interpretation pipeline:
+Pipeline - chains formula functions (vclgr -> density -> sw -> permeability -> ooip)
+           and evaluates them in one chunked pass over the depth axis, or
+           streams them over iterators of depth chunks (Pipeline.stream)
+constant - marks a binding value as a constant (e.g. a string option like 'clavier')
+'''
+import inspect
+
+import numpy as np
+
+from ..compute.precision import asfloat, get_precision
+from .streaming import zip_chunks
+
+class constant(object):
+    '''
+    constant(value)
+    Wraps a value used in step bindings so it is passed to the function as is,
+    instead of being looked up as a curve/output name.
+    *Exemple:
+    ('vsh', clayvolume.vclgr, {'gr_log': 'GR', 'correction': constant('clavier')})
+    '''
+    def __init__(self, value):
+        self.value = value
+
+class Pipeline(object):
+    '''
+    Pipeline(steps)
+    *Input parameters:
+    - steps - list of (output, function) or (output, function, bindings) tuples.
+      output - name of the curve returned by function (a tuple of names
+               unpacks functions returning tuples, e.g. lithology.ur_lith)
+      bindings - dict mapping a function argument to the name of a curve,
+               parameter or earlier output (str) or to a constant value.
+      Arguments that are not bound are looked up by their own name; arguments
+      with a default value keep it when the name is not available. A name bound
+      explicitly must be found (bind constant(...) to pass a string option).
+    Steps may be declared in any order, they are sorted by their dependencies.
+    *Exemple:
+    p = Pipeline([('vsh', clayvolume.vclgr, {'gr_log': 'GR'}),
+                  ('phie', porosity.density, {'den': 'RHOB', 'vcl': 'vsh'}),
+                  ('sw', saturation.sw.indonesian, {'Rt': 'RT', 'Phi': 'phie', 'Vsh': 'vsh'}),
+                  ('k', permeability.timur, {'phi': 'phie', 'swirr': 'sw'})])
+    curves = p.run({'GR': gr, 'RHOB': rhob, 'RT': rt},
+                   gr_clean=20, gr_clay=120, den_ma=2.65, den_fl=1.0,
+                   Rw=0.05, Rsh=4, a=1, m=2, n=2)
+    '''
+    def __init__(self, steps):
+        parsed = [_parse_step(step) for step in steps]
+        self.steps = _sort_steps(parsed)
+
+    @property
+    def outputs(self):
+        '''names of all curves produced by the pipeline, in evaluation order'''
+        return [name for outputs, func, args in self.steps for name in outputs]
+
+    @property
+    def inputs(self):
+        '''names the pipeline needs from the caller (curves or parameters)'''
+        produced = set(self.outputs)
+        names = []
+        for outputs, func, args in self.steps:
+            for arg, source, has_default in args:
+                if isinstance(source, str) and source not in produced and not has_default and source not in names:
+                    names.append(source)
+        return names
+
+    def evaluate(self, env):
+        '''
+        evaluate(env)
+        Evaluates every step once on env (a dict of curves/parameters, modified in place)
+        *Returns:
+        - dict with the outputs of all steps
+        '''
+        results = {}
+        for outputs, func, args in self.steps:
+            kwargs = _arguments(func, args, env)
+            value = func(**kwargs)
+            values = (value,) if len(outputs) == 1 else tuple(value)
+            for name, value in zip(outputs, values):
+                env[name] = value
+                results[name] = value
+        return results
+
+    def run(self, curves, chunk_size=65536, keep=None, out=None, **params):
+        '''
+        run(curves, chunk_size=65536, keep=None, out=None, **params)
+        *Input parameters:
+        - curves - dict of equal length 1-D arrays (GR, RHOB, RT ...)
+        - chunk_size - number of depth samples evaluated at a time
+        - keep - names of the outputs to return (default all); intermediate
+          curves that are not kept never exist at full length
+        - out - optional dict of name -> preallocated array receiving the kept outputs
+        - params - scalar parameters (gr_clean, Rw, a, m, n ...)
+        *Returns:
+        - dict of full length output curves
+        Curves are evaluated in the working precision (see compute.set_precision),
+        one chunk at a time, so a float64 store is never copied whole to float32.
+        '''
+        curves = dict((name, np.asarray(curve)) for name, curve in curves.items())
+        lengths = set(len(curve) for curve in curves.values())
+        if len(lengths) != 1:
+            raise ValueError('curves must have the same length, got %s' % sorted(lengths))
+        size = lengths.pop()
+        keep = self.outputs if keep is None else list(keep)
+        params = dict((name, asfloat(value)) for name, value in params.items())
+        results = dict(out or {})
+        for start in range(0, size, chunk_size):
+            stop = min(start + chunk_size, size)
+            env = dict(params)
+            for name, curve in curves.items():
+                env[name] = asfloat(curve[start:stop])
+            chunk = self.evaluate(env)
+            for name in keep:
+                value = np.asarray(chunk[name])
+                if name not in results:
+                    results[name] = np.empty(size, dtype=np.result_type(value, get_precision()))
+                results[name][start:stop] = value
+        for name in keep:
+            # zero-length curves: the loop above never ran
+            if name not in results:
+                results[name] = np.empty(size, dtype=get_precision())
+        return results
+
+    def stream(self, curves, keep=None, **params):
+        '''
+        stream(curves, keep=None, **params)
+        *Input parameters:
+        - curves - dict of name -> iterator of depth chunks (see streaming.chunks)
+        - keep - names of the outputs to yield (default all)
+        - params - scalar parameters
+        *Returns:
+        - generator of dicts name -> output chunk; memory use is bounded by the
+          chunk size, not by the length of the well
+        '''
+        keep = self.outputs if keep is None else list(keep)
+        params = dict((name, asfloat(value)) for name, value in params.items())
+        for chunk in zip_chunks(curves):
+            env = dict(params)
+            env.update((name, asfloat(value)) for name, value in chunk.items())
+            results = self.evaluate(env)
+            yield dict((name, results[name]) for name in keep)
+
+def _parse_step(step):
+    '''
+    _parse_step(step)
+    Parses an (output, function[, bindings]) step into (outputs, function, args),
+    args being (argument, source, has_default) for every argument of function;
+    has_default is False for explicitly bound arguments, whose source must resolve
+    '''
+    if len(step) == 2:
+        output, func = step
+        bindings = {}
+    else:
+        output, func, bindings = step
+    outputs = (output,) if isinstance(output, str) else tuple(output)
+    parameters = inspect.signature(func).parameters
+    unknown = set(bindings) - set(parameters)
+    if unknown:
+        raise ValueError('%s has no argument(s) %s' % (func.__name__, ', '.join(sorted(unknown))))
+    args = []
+    for arg, parameter in parameters.items():
+        source = bindings.get(arg, arg)
+        has_default = parameter.default is not inspect.Parameter.empty and arg not in bindings
+        args.append((arg, source, has_default))
+    return outputs, func, args
+
+def _arguments(func, args, env):
+    '''keyword arguments of a parsed step, looked up in env (a dict of curves/parameters)'''
+    kwargs = {}
+    for arg, source, has_default in args:
+        if isinstance(source, constant):
+            kwargs[arg] = source.value
+        elif not isinstance(source, str):
+            kwargs[arg] = source
+        elif source in env:
+            kwargs[arg] = env[source]
+        elif source != arg:
+            raise KeyError('%s: argument %s is bound to "%s", which is not a curve, parameter or output '
+                           '(bind constant(%r) to pass it as a value)' % (func.__name__, arg, source, source))
+        elif not has_default:
+            raise KeyError('%s needs "%s" for argument %s' % (func.__name__, source, arg))
+    return kwargs
+
+def _sort_steps(steps):
+    '''orders steps so that every step comes after the steps producing its inputs'''
+    producers = {}
+    for index, (outputs, func, args) in enumerate(steps):
+        for name in outputs:
+            if name in producers:
+                raise ValueError('output "%s" is produced by more than one step' % name)
+            producers[name] = index
+    ordered = []
+    state = {}
+    def visit(index):
+        if state.get(index) == 'done':
+            return
+        if state.get(index) == 'visiting':
+            raise ValueError('circular dependency at %s' % (steps[index][1].__name__))
+        state[index] = 'visiting'
+        for arg, source, has_default in steps[index][2]:
+            if isinstance(source, str) and producers.get(source, index) != index:
+                visit(producers[source])
+        state[index] = 'done'
+        ordered.append(steps[index])
+    for index in range(len(steps)):
+        visit(index)
+    return ordered
@@ -0,0 +1,111 @@
+'''
+Streaming (bounded memory) evaluation of formulas over depth chunks:
+chunks - splits a curve (array, memmap) into fixed-size depth chunks
+stream - evaluates any formula function chunk by chunk and yields output chunks
+collect - concatenates output chunks (of stream or Pipeline.stream)
+'''
+from collections.abc import Iterator
+from itertools import chain, zip_longest
+
+import numpy as np
+
+_missing = object()
+
+def chunks(curve, chunk_size=65536):
+    '''
+    chunks(curve, chunk_size=65536)
+    *Input parameters:
+    - curve - 1-D array (or np.memmap) of log readings
+    - chunk_size - number of depth samples per chunk
+    *Returns:
+    - generator of views of curve, chunk_size samples each (the last may be shorter)
+    '''
+    for start in range(0, len(curve), chunk_size):
+        yield curve[start:start + chunk_size]
+
+def zip_chunks(streams):
+    '''
+    zip_chunks(streams)
+    *Input parameters:
+    - streams - dict of name -> iterator of chunks
+    *Returns:
+    - generator of dicts name -> chunk, one per depth chunk;
+      raises ValueError if the iterators do not yield the same number of chunks
+    '''
+    names = list(streams)
+    for values in zip_longest(*[streams[name] for name in names], fillvalue=_missing):
+        if any(value is _missing for value in values):
+            raise ValueError('streams %s ended before the others' % ', '.join(
+                str(name) for name, value in zip(names, values) if value is _missing))
+        yield dict(zip(names, values))
+
+def stream(func, *args, **kwargs):
+    '''
+    stream(func, *args, **kwargs)
+    Evaluates func chunk by chunk. Every argument given as an iterator/generator
+    of depth chunks is streamed; every other argument (zone parameters, options)
+    is passed unchanged to each call.
+    *Exemple:
+    rt = chunks(np.load('rt.npy', mmap_mode='r'))
+    phi = chunks(np.load('phie.npy', mmap_mode='r'))
+    for sw_chunk in stream(saturation.sw.archie, 0.05, rt, phi, 1, 2, 2):
+        ...
+    *Returns:
+    - generator of output chunks
+    '''
+    arguments = dict(enumerate(args))
+    arguments.update(kwargs)
+    streamed = dict((key, value) for key, value in arguments.items() if isinstance(value, Iterator))
+    if not streamed:
+        raise ValueError('stream needs at least one iterator of chunks')
+    for chunk in zip_chunks(streamed):
+        arguments.update(chunk)
+        positional = [arguments[index] for index in range(len(args))]
+        named = dict((key, arguments[key]) for key in kwargs)
+        yield func(*positional, **named)
+
+def collect(output_chunks, out=None):
+    '''
+    collect(output_chunks, out=None)
+    *Input parameters:
+    - output_chunks - iterator of output chunks: arrays (from stream) or dicts of
+      name -> array (from Pipeline.stream)
+    - out - optional preallocated array (or np.memmap opened for writing) that
+      receives the chunks back to back; a dict of them for dict chunks
+    *Returns:
+    - the concatenated curve, or a dict of name -> concatenated curve for dict chunks
+    *Exemple:
+    curves = collect(pipeline.stream({'GR': chunks(gr), 'RHOB': chunks(rhob)}, **params))
+    '''
+    output_chunks = iter(output_chunks)
+    first = next(output_chunks, None)
+    if first is None:
+        return np.empty(0) if out is None else out
+    output_chunks = chain([first], output_chunks)
+    if not isinstance(first, dict):
+        return _collect(output_chunks, out)
+    names = list(first)
+    if out is None:
+        pieces = dict((name, []) for name in names)
+        for chunk in output_chunks:
+            for name in names:
+                pieces[name].append(np.atleast_1d(chunk[name]))
+        return dict((name, np.concatenate(pieces[name])) for name in names)
+    start = 0
+    for chunk in output_chunks:
+        for name in names:
+            value = np.atleast_1d(chunk[name])
+            out[name][start:start + len(value)] = value
+        start += len(value)
+    return out
+
+def _collect(output_chunks, out):
+    '''concatenates array chunks (see collect)'''
+    if out is None:
+        return np.concatenate([np.atleast_1d(chunk) for chunk in output_chunks])
+    start = 0
+    for chunk in output_chunks:
+        chunk = np.atleast_1d(chunk)
+        out[start:start + len(chunk)] = chunk
+        start += len(chunk)
+    return out
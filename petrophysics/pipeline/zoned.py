@@ -0,0 +1,236 @@
+'''
+Zone by zone evaluation of a pipeline:
+Zones - zonation of a depth index (zone tops -> contiguous ranges of samples)
+ZonedRun - evaluates a Pipeline zone by zone with per-zone parameter tables and
+           keeps the output curves; after a parameter or curve change only the
+           zones affected, and in them only the steps downstream of the change,
+           are evaluated again and spliced into the output curves
+'''
+import numpy as np
+
+from ..compute.precision import asfloat, get_precision
+from .pipeline import _arguments
+
+class Zones(object):
+    '''
+    Zones(depth, tops, names=None, base=None)
+    *Input parameters:
+    - depth - increasing depth index of the well
+    - tops - increasing zone tops; a zone extends down to the next top (the last
+      one down to base)
+    - names - zone names (default 'zone 1', 'zone 2' ...)
+    - base - base of the last zone (default the bottom of the well)
+    Samples above the first top or below base belong to no zone.
+    *Attributes:
+    - starts, stops - sample range [start, stop) of every zone
+    - labels - zone number of every sample (-1 outside the zones)
+    *Exemple:
+    zones = Zones(las.depth, [1510.0, 1587.5, 1642.0], names=['A', 'B', 'C'], base=1720.0)
+    zones.slice('B')
+    '''
+    def __init__(self, depth, tops, names=None, base=None):
+        depth = np.asarray(depth, dtype=np.float64)
+        tops = np.atleast_1d(np.asarray(tops, dtype=np.float64))
+        if np.any(np.diff(depth) < 0):
+            raise ValueError('the depth index must be increasing')
+        if np.any(np.diff(tops) <= 0) or (base is not None and base <= tops[-1]):
+            raise ValueError('zone tops must be increasing and above the base')
+        self.tops = tops
+        self.base = base
+        self.names = ['zone %d' % (index + 1) for index in range(len(tops))] if names is None else list(names)
+        if len(self.names) != len(tops):
+            raise ValueError('%d zone names for %d tops' % (len(self.names), len(tops)))
+        bounds = np.searchsorted(depth, np.append(tops, np.inf if base is None else base))
+        self.starts = bounds[:-1]
+        self.stops = bounds[1:]
+        self.size = len(depth)
+        self.labels = np.full(self.size, -1, dtype=np.intp)
+        for zone, (start, stop) in enumerate(zip(self.starts, self.stops)):
+            self.labels[start:stop] = zone
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return 'Zones(%s)' % ', '.join('%s: %d-%d' % zone for zone in zip(self.names, self.starts, self.stops))
+
+    def index(self, zone):
+        '''zone number of zone (a name or a number)'''
+        if isinstance(zone, (int, np.integer)):
+            if not -len(self) <= zone < len(self):
+                raise IndexError('zone %d out of %d zones' % (zone, len(self)))
+            return int(zone) % len(self)
+        try:
+            return self.names.index(zone)
+        except ValueError:
+            raise KeyError('no zone "%s", zones: %s' % (zone, ', '.join(self.names)))
+
+    def slice(self, zone):
+        '''slice of the samples of zone (a name or a number)'''
+        zone = self.index(zone)
+        return slice(int(self.starts[zone]), int(self.stops[zone]))
+
+class ZonedRun(object):
+    '''
+    ZonedRun(pipeline, curves, zones, table=None, **params)
+    *Input parameters:
+    - pipeline - Pipeline (e.g. clayvolume -> porosity -> saturation steps)
+    - curves - dict of full length 1-D arrays (GR, RHOB, RT ...)
+    - zones - Zones of the well
+    - table - per-zone parameters: dict of parameter -> sequence of one value per zone
+      (None for a zone using the common value)
+    - params - parameters common to all zones (a table entry overrides them)
+    *Attributes:
+    - results - dict of output name -> full length curve (NaN outside the zones)
+    The pipeline is evaluated on every zone when the run is created. After set(),
+    set_params() or set_curve(), update() evaluates again only the zones whose
+    parameters or curve samples changed and, in a zone, only the steps depending on
+    the change; the new values are written into the existing result arrays.
+    *Exemple:
+    run = ZonedRun(p, {'GR': gr, 'RHOB': rhob, 'RT': rt}, zones,
+                   table={'gr_clean': [18, 22, 25], 'gr_clay': [115, 120, 130], 'Rw': [0.05, 0.05, 0.08]},
+                   den_ma=2.65, den_fl=1.0, Rsh=4, a=1, m=2, n=2)
+    run.set('C', Rw=0.07)
+    run.update()          # {'C': ['sw', 'k']}, vsh and phie are kept
+    sw = run.results['sw']
+    '''
+    def __init__(self, pipeline, curves, zones, table=None, **params):
+        self.pipeline = pipeline
+        self.zones = zones
+        self.curves = {}
+        self.params = dict((name, asfloat(value)) for name, value in params.items())
+        self.table = {}
+        self.results = {}
+        self._changes = dict((zone, None) for zone in range(len(zones)))
+        for name, curve in curves.items():
+            self.curves[name] = self._curve(name, curve)
+        for name, values in (table or {}).items():
+            values = [asfloat(value) for value in values]
+            if len(values) != len(zones):
+                raise ValueError('"%s" has %d values for %d zones' % (name, len(values), len(zones)))
+            self.table[name] = values
+        self.update()
+
+    def set(self, zone, **params):
+        '''
+        set(zone, **params)
+        Changes parameters of one zone (a name or a number)
+        '''
+        zone = self.zones.index(zone)
+        for name, value in params.items():
+            value = asfloat(value)
+            if name not in self.table:
+                self.table[name] = [None] * len(self.zones)
+            if not _same(self._value(zone, name), value):
+                self.table[name][zone] = value
+                self._change(zone, name)
+
+    def set_params(self, **params):
+        '''
+        set_params(**params)
+        Changes parameters common to all zones (zones with a table entry keep theirs)
+        '''
+        for name, value in params.items():
+            value = asfloat(value)
+            if not _same(self.params.get(name), value):
+                self.params[name] = value
+                for zone in range(len(self.zones)):
+                    if name not in self.table or self.table[name][zone] is None:
+                        self._change(zone, name)
+
+    def set_curve(self, name, curve):
+        '''
+        set_curve(name, curve)
+        Replaces an input curve (with a new array, not one edited in place); only the
+        zones holding samples that differ are evaluated again
+        '''
+        curve = self._curve(name, curve)
+        if name in self.curves:
+            previous = self.curves[name]
+            with np.errstate(invalid='ignore'):
+                changed = (previous != curve) & ~(np.isnan(previous) & np.isnan(curve))
+            zones = np.unique(self.zones.labels[changed])
+        else:
+            zones = range(len(self.zones))
+        self.curves[name] = curve
+        for zone in zones:
+            if zone >= 0:
+                self._change(zone, name)
+
+    @property
+    def pending(self):
+        '''names of the zones update() would evaluate'''
+        return [self.zones.names[zone] for zone in sorted(self._changes)]
+
+    def update(self):
+        '''
+        update()
+        Evaluates the zones changed since the last update
+        *Returns:
+        - dict of zone name -> names of the outputs evaluated in the zone
+        '''
+        evaluated = {}
+        for zone in sorted(self._changes):
+            changed = self._changes.pop(zone)
+            changed = None if changed is None else set(changed)
+            evaluated[self.zones.names[zone]] = self._evaluate(zone, changed)
+        return evaluated
+
+    def _evaluate(self, zone, changed):
+        '''evaluates the steps of one zone depending on the changed names (all steps if changed is None)'''
+        samples = self.zones.slice(zone)
+        env = dict(self.params)
+        env.update((name, values[zone]) for name, values in self.table.items() if values[zone] is not None)
+        env.update((name, asfloat(curve[samples])) for name, curve in self.curves.items())
+        evaluated = []
+        for outputs, func, args in self.pipeline.steps:
+            sources = [source for arg, source, has_default in args if isinstance(source, str)]
+            if changed is not None and not changed.intersection(sources) and \
+                    all(name in self.results for name in outputs):
+                for name in outputs:
+                    env[name] = self.results[name][samples]
+                continue
+            value = func(**_arguments(func, args, env))
+            values = (value,) if len(outputs) == 1 else tuple(value)
+            for name, value in zip(outputs, values):
+                env[name] = value
+                if name not in self.results:
+                    self.results[name] = _empty(self.zones.size, np.result_type(value, get_precision()))
+                self.results[name][samples] = value
+                evaluated.append(name)
+            if changed is not None:
+                changed.update(outputs)
+        return evaluated
+
+    def _value(self, zone, name):
+        '''parameter name of zone: its table entry, else the common value'''
+        value = self.table[name][zone] if name in self.table else None
+        return self.params.get(name) if value is None else value
+
+    def _change(self, zone, name):
+        if zone not in self._changes:
+            self._changes[zone] = set()
+        if self._changes[zone] is not None:
+            self._changes[zone].add(name)
+
+    def _curve(self, name, curve):
+        curve = np.asarray(curve)
+        if curve.shape != (self.zones.size,):
+            raise ValueError('"%s" has shape %s, the zones cover %d samples' % (name, curve.shape, self.zones.size))
+        return curve
+
+def _same(a, b):
+    '''True when two parameter values are equal (arrays compared element-wise)'''
+    if a is b:
+        return True
+    if a is None or b is None:
+        return False
+    try:
+        return bool(np.array_equal(a, b))
+    except TypeError:
+        return a == b
+
+def _empty(size, dtype):
+    if dtype.kind in 'fc':
+        return np.full(size, np.nan, dtype=dtype)
+    return np.zeros(size, dtype=dtype)
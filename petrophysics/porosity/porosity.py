@@ -1,8 +1,15 @@
+'''
+Porosity transforms; out=den turns a density curve into porosity in place,
+block by block (compute.transform).
+'''
+from ..compute.transform import transform
 
+@transform
 def phie (phit, vcl, phish):
     phie = phit - vcl * phish
     return phie
 
+@transform
 def density(den, den_ma, den_fl, vcl=0, den_sh=0):
     '''
     density(den, den_ma, den_fl, vcl, den_sh)
@@ -16,6 +23,7 @@ def density(den, den_ma, den_fl, vcl=0, den_sh=0):
     phid_sh_corr = phid - vcl * phid_sh
     return phid_sh_corr
 
+@transform
 def willie(dt, dt_ma, dt_fl, vcl=0, dt_sh=0, cp = 1):
     '''
     willie(dt, dt_ma, dt_fl, vcl=0, dt_sh=0, cp = 1)
@@ -29,6 +37,7 @@ def willie(dt, dt_ma, dt_fl, vcl=0, dt_sh=0, cp = 1):
     phis_w_sh_corr = phis_w - vcl * phis_w_sh
     return phis_w_sh_corr
 
+@transform
 def raymer(dt, dt_ma, dt_fl, vcl=0, dt_sh=0, alpha = 5/8):
     '''
     raymer(dt, dt_ma, dt_fl, vcl=0, dt_sh=0, alpha = 5/8)
@@ -42,6 +51,7 @@ def raymer(dt, dt_ma, dt_fl, vcl=0, dt_sh=0, alpha = 5/8):
     phis_rhg_sh_corr = phis_rhg - vcl * phis_rhg_sh
     return phis_rhg_sh_corr
 
+@transform
 def neutronic(neut, vcl, neut_sh):
     '''
     neutronic(neut, vcl, neut_sh)
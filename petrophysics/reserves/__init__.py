@@ -1 +1,4 @@
 from . import volumetrics
+from . import montecarlo
+from . import summation
+from . import cutoffs
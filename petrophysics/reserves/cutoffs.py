@@ -0,0 +1,115 @@
+'''
+Cutoff sensitivity of net pay:
+cutoff_cube - net pay and hydrocarbon pore thickness of every zone for every
+              combination of Vsh, phi and Sw cutoffs on given grids
+lookup - the per-zone values of a cube for one (vsh_cut, phi_cut, sw_cut)
+
+The samples are binned once between the cutoff values (np.searchsorted), the
+bins are summed per zone in one weighted histogram (np.bincount) and the cube
+follows from cumulative sums along the three cutoff axes. The cost does not
+depend on the number of cutoff combinations, while re-thresholding the curves
+(summation.summation) costs a pass over the samples per combination.
+'''
+import numpy as np
+
+from ..compute.precision import ACCUMULATOR
+from .summation import _ranges, _segment_sum, _thickness
+
+def cutoff_cube(depth, phi, sw, vsh, zones=None, vsh_cuts=None, phi_cuts=None, sw_cuts=None):
+    '''
+    cutoff_cube(depth, phi, sw, vsh, zones=None, vsh_cuts=None, phi_cuts=None, sw_cuts=None)
+    *Input parameters:
+    - depth, phi, sw, vsh, zones - as in summation.summation
+    - vsh_cuts - increasing Vsh cutoffs (default 0, 0.05 ... 1); net has vsh <= vsh_cut
+    - phi_cuts - increasing porosity cutoffs (default 0, 0.02 ... 0.4); net has phi >= phi_cut
+    - sw_cuts - increasing Sw cutoffs (default 0, 0.05 ... 1); pay is net with sw <= sw_cut
+    *Returns:
+    - dict with:
+      'vsh_cuts', 'phi_cuts', 'sw_cuts' - the cutoff grids
+      'gross' - thickness of every zone
+      'pay', 'hpv' - net pay and hydrocarbon pore thickness, arrays of shape
+      (zones, vsh cuts, phi cuts, sw cuts); (vsh cuts, phi cuts, sw cuts) when zones is None
+    The values equal summation.summation(...)['pay'] and ['hpv'] for the same cutoffs.
+    *Exemple:
+    cube = cutoff_cube(las.depth, phie, sw, vsh, zones=zones)
+    pay = cube['pay'][:, 8, 4, 12]        # vsh <= 0.4, phi >= 0.08, sw <= 0.6
+    lookup(cube, 0.4, 0.08, 0.6)['pay']   # the same, by cutoff value
+    '''
+    depth = np.asarray(depth, dtype=np.float64)
+    phi = np.asarray(phi)
+    sw = np.asarray(sw)
+    vsh = np.asarray(vsh)
+    vsh_cuts = _grid(np.linspace(0, 1, 21) if vsh_cuts is None else vsh_cuts, 'vsh_cuts')
+    phi_cuts = _grid(np.linspace(0, 0.4, 21) if phi_cuts is None else phi_cuts, 'phi_cuts')
+    sw_cuts = _grid(np.linspace(0, 1, 21) if sw_cuts is None else sw_cuts, 'sw_cuts')
+    starts, stops = _ranges(zones, len(depth))
+    thickness = _thickness(depth, starts, stops)
+
+    # samples of the zones, with their zone number
+    counts = stops - starts
+    offsets = np.cumsum(counts) - counts
+    samples = np.arange(counts.sum()) - np.repeat(offsets - starts, counts)
+    labels = np.repeat(np.arange(len(starts)), counts)
+    with np.errstate(invalid='ignore'):
+        use = np.isfinite(phi[samples]) & np.isfinite(sw[samples]) & np.isfinite(vsh[samples])
+    samples = samples[use]
+    labels = labels[use]
+    h = thickness[samples]
+    v = vsh[samples]
+    p = phi[samples]
+    s = sw[samples]
+
+    # bin b of a cutoff axis holds the samples passing the cutoffs of index >= b
+    # (vsh, sw) or < b (phi); cutoffs are compared in the precision of the curves
+    nv, np_, ns = len(vsh_cuts) + 1, len(phi_cuts) + 1, len(sw_cuts) + 1
+    index = labels * nv + np.searchsorted(_cast(vsh_cuts, v), v, 'left')
+    index = index * np_ + np.searchsorted(_cast(phi_cuts, p), p, 'right')
+    index = index * ns + np.searchsorted(_cast(sw_cuts, s), s, 'left')
+    shape = (len(starts), nv, np_, ns)
+    size = int(np.prod(shape))
+    pay = np.bincount(index, h, minlength=size).reshape(shape)
+    hpv = h * p.astype(ACCUMULATOR) * (1 - s.astype(ACCUMULATOR))
+    hpv = np.bincount(index, hpv, minlength=size).reshape(shape)
+
+    result = {'vsh_cuts': vsh_cuts, 'phi_cuts': phi_cuts, 'sw_cuts': sw_cuts,
+              'gross': _segment_sum(np.append(thickness, 0), starts, stops)}
+    for name, cube in (('pay', pay), ('hpv', hpv)):
+        cube = np.cumsum(cube, axis=1)[:, :-1]
+        cube = np.cumsum(cube[:, :, ::-1], axis=2)[:, :, ::-1][:, :, 1:]
+        cube = np.cumsum(cube, axis=3)[..., :-1]
+        result[name] = cube[0] if zones is None else cube
+    if zones is None:
+        result['gross'] = result['gross'][0]
+    return result
+
+def lookup(cube, vsh_cut, phi_cut, sw_cut):
+    '''
+    lookup(cube, vsh_cut, phi_cut, sw_cut)
+    *Input parameters:
+    - cube - result of cutoff_cube
+    - vsh_cut, phi_cut, sw_cut - cutoffs, values of the cube grids
+    *Returns:
+    - dict with the per-zone 'pay', 'hpv' and 'pay_to_gross' for these cutoffs
+    '''
+    index = (_find(cube['vsh_cuts'], vsh_cut, 'vsh_cut'), _find(cube['phi_cuts'], phi_cut, 'phi_cut'),
+             _find(cube['sw_cuts'], sw_cut, 'sw_cut'))
+    pay = cube['pay'][(Ellipsis,) + index]
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {'pay': pay, 'hpv': cube['hpv'][(Ellipsis,) + index], 'pay_to_gross': pay / cube['gross']}
+
+def _grid(cuts, name):
+    cuts = np.atleast_1d(np.asarray(cuts, dtype=np.float64))
+    if np.any(np.diff(cuts) <= 0) or not np.all(np.isfinite(cuts)):
+        raise ValueError('%s must be finite and increasing' % name)
+    return cuts
+
+def _cast(cuts, curve):
+    return cuts.astype(curve.dtype) if curve.dtype.kind == 'f' else cuts
+
+def _find(cuts, cut, name):
+    '''index of cut in the cutoff grid, found by bisection'''
+    index = np.searchsorted(cuts, cut)
+    for candidate in (index - 1, index):
+        if 0 <= candidate < len(cuts) and np.isclose(cuts[candidate], cut, rtol=1e-9, atol=1e-12):
+            return candidate
+    raise ValueError('%s=%g is not on the cube grid %s' % (name, cut, cuts))
@@ -0,0 +1,192 @@
+'''
+Probabilistic (Monte Carlo) volumetrics:
+ooip_mc - P90/P50/P10 original oil in place
+ogip_mc - P90/P50/P10 original gas in place
+simulate - draws realizations of any volumetric function in vectorized batches
+
+Every input can be a constant or a distribution given as a tuple:
+    ('uniform', low, high)
+    ('triangular', low, mode, high)
+    ('normal', mean, sd) or ('normal', mean, sd, low, high) - clipped to [low, high]
+    ('lognormal', mu, sigma) - mu, sigma of the underlying normal distribution
+Correlations between inputs are given as {('phi', 'sw'): -0.6, ...} and are
+honoured through a Gaussian copula.
+P90 is the low estimate (90% probability that the volume is exceeded), i.e.
+the 10th percentile of the simulated volumes; P10 is the high estimate.
+Realizations are evaluated in the working precision (compute.set_precision),
+the mean is always accumulated in float64.
+Exact percentiles need every realization in memory (realizations x 8 bytes in
+float64); batch_size only bounds the memory of the inputs drawn for a batch.
+With exact=False the volumes of a batch are reduced as soon as they are
+evaluated, memory is bounded by batch_size and the percentiles are the
+averages of the batch percentiles (their bias shrinks as 1/batch_size).
+'''
+import numpy as np
+
+from ..compute.precision import ACCUMULATOR, asfloat, get_precision
+from .volumetrics import ooip, ogip
+
+def ooip_mc(area, thickness, sw, phi, ngr, bo, metric=True, realizations=100000,
+            correlations=None, batch_size=1000000, seed=None, return_samples=False, exact=True):
+    '''
+    ooip_mc(area, thickness, sw, phi, ngr, bo, metric=True, realizations=100000,
+            correlations=None, batch_size=1000000, seed=None, return_samples=False, exact=True)
+    *Input parameters:
+    - area, thickness, sw, phi, ngr, bo - constants or distributions (see module doc)
+    - realizations - number of Monte Carlo realizations
+    - correlations - dict of (name1, name2) -> correlation coefficient
+    - batch_size - realizations drawn and evaluated at a time
+    - seed - random seed
+    - exact - exact percentiles of all the realizations (kept in memory), or
+      batch averaged percentiles with memory bounded by batch_size (see module doc)
+    *Returns:
+    - dict with 'p90', 'p50', 'p10', 'mean' (and 'samples' if return_samples) in [m3] or [bbl]
+    *Exemple:
+    ooip_mc(('triangular', 2e6, 3e6, 5e6), ('normal', 20, 3, 10, 30), ('uniform', 0.2, 0.4),
+            ('normal', 0.22, 0.03, 0.05, 0.35), 0.8, 1.2, correlations={('phi', 'sw'): -0.5})
+    '''
+    inputs = dict(area=area, thickness=thickness, sw=sw, phi=phi, ngr=ngr, bo=bo)
+    return _summarize(ooip, inputs, realizations, correlations, batch_size, seed,
+                      return_samples, exact, metric=metric)
+
+def ogip_mc(area, thickness, sw, phi, ngr, bg, metric=True, realizations=100000,
+            correlations=None, batch_size=1000000, seed=None, return_samples=False, exact=True):
+    '''
+    ogip_mc(area, thickness, sw, phi, ngr, bg, metric=True, realizations=100000,
+            correlations=None, batch_size=1000000, seed=None, return_samples=False, exact=True)
+    *Input parameters:
+    - area, thickness, sw, phi, ngr, bg - constants or distributions (see module doc)
+    - realizations, correlations, batch_size, seed, exact - see ooip_mc
+    *Returns:
+    - dict with 'p90', 'p50', 'p10', 'mean' (and 'samples' if return_samples) in [m3] or [scf]
+    '''
+    inputs = dict(area=area, thickness=thickness, sw=sw, phi=phi, ngr=ngr, bg=bg)
+    return _summarize(ogip, inputs, realizations, correlations, batch_size, seed,
+                      return_samples, exact, metric=metric)
+
+def simulate(func, inputs, realizations, correlations=None, batch_size=1000000, seed=None, **fixed):
+    '''
+    simulate(func, inputs, realizations, correlations=None, batch_size=1000000, seed=None, **fixed)
+    *Input parameters:
+    - func - volumetric function evaluated on arrays (e.g. volumetrics.ooip)
+    - inputs - dict of argument name -> constant or distribution
+    - fixed - extra keyword arguments passed unchanged to func (e.g. metric=True)
+    *Returns:
+    - array of realizations simulated volumes (in the working precision)
+    '''
+    volumes = np.empty(realizations, dtype=get_precision())
+    start = 0
+    for batch in _batches(func, inputs, realizations, correlations, batch_size, seed, **fixed):
+        volumes[start:start + len(batch)] = batch
+        start += len(batch)
+    return volumes
+
+def summary(volumes, return_samples=False):
+    '''
+    summary(volumes, return_samples=False)
+    *Returns:
+    - dict with 'p90' (10th percentile), 'p50', 'p10' (90th percentile) and 'mean' of volumes
+    '''
+    p90, p50, p10 = np.percentile(volumes, [10, 50, 90])
+    result = {'p90': float(p90), 'p50': float(p50), 'p10': float(p10),
+              'mean': float(volumes.mean(dtype=ACCUMULATOR))}
+    if return_samples:
+        result['samples'] = volumes
+    return result
+
+def _summarize(func, inputs, realizations, correlations, batch_size, seed, return_samples, exact, **fixed):
+    '''summary of the simulated volumes, exact or reduced batch by batch'''
+    if exact:
+        volumes = simulate(func, inputs, realizations, correlations, batch_size, seed, **fixed)
+        return summary(volumes, return_samples)
+    if return_samples:
+        raise ValueError('return_samples needs exact=True')
+    percentiles = np.zeros(3)
+    total = 0.0
+    for batch in _batches(func, inputs, realizations, correlations, batch_size, seed, **fixed):
+        percentiles += len(batch) * np.percentile(batch, [10, 50, 90])
+        total += batch.sum(dtype=ACCUMULATOR)
+    p90, p50, p10 = percentiles / realizations
+    return {'p90': float(p90), 'p50': float(p50), 'p10': float(p10), 'mean': float(total / realizations)}
+
+def _batches(func, inputs, realizations, correlations, batch_size, seed, **fixed):
+    '''yields the simulated volumes batch after batch'''
+    rng = np.random.default_rng(seed)
+    names = [name for name, value in inputs.items() if isinstance(value, tuple)]
+    correlated, chol = _copula(names, correlations)
+    for start in range(0, realizations, batch_size):
+        size = min(batch_size, realizations - start)
+        z = rng.standard_normal((size, len(correlated))) @ chol.T if correlated else None
+        kwargs = dict(fixed)
+        for name, value in inputs.items():
+            if not isinstance(value, tuple):
+                kwargs[name] = asfloat(value)
+            elif name in correlated:
+                kwargs[name] = asfloat(_transform(value, z[:, correlated.index(name)]))
+            else:
+                kwargs[name] = asfloat(_draw(value, rng, size))
+        yield np.broadcast_to(np.asarray(func(**kwargs), dtype=get_precision()), (size,))
+
+def _copula(names, correlations):
+    '''returns the correlated input names and the Cholesky factor of their correlation matrix'''
+    if not correlations:
+        return [], None
+    correlated = []
+    for pair in correlations:
+        for name in pair:
+            if name not in names:
+                raise ValueError('correlated input "%s" is not a distribution' % name)
+            if name not in correlated:
+                correlated.append(name)
+    corr = np.eye(len(correlated))
+    for (name1, name2), rho in correlations.items():
+        i, j = correlated.index(name1), correlated.index(name2)
+        corr[i, j] = corr[j, i] = rho
+    try:
+        chol = np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        raise ValueError('correlation matrix is not positive definite')
+    return correlated, chol
+
+def _draw(dist, rng, size):
+    kind = dist[0]
+    if kind == 'uniform':
+        return rng.uniform(dist[1], dist[2], size)
+    if kind == 'triangular':
+        return rng.triangular(dist[1], dist[2], dist[3], size)
+    if kind == 'normal':
+        return _clip(dist, rng.normal(dist[1], dist[2], size))
+    if kind == 'lognormal':
+        return rng.lognormal(dist[1], dist[2], size)
+    raise ValueError('unknown distribution "%s"' % kind)
+
+def _transform(dist, z):
+    '''maps standard normal deviates z to dist (inverse CDF)'''
+    kind = dist[0]
+    if kind == 'normal':
+        return _clip(dist, dist[1] + dist[2] * z)
+    if kind == 'lognormal':
+        return np.exp(dist[1] + dist[2] * z)
+    u = _ndtr(z)
+    if kind == 'uniform':
+        return dist[1] + (dist[2] - dist[1]) * u
+    if kind == 'triangular':
+        low, mode, high = dist[1:4]
+        fc = (mode - low) / (high - low)
+        return np.where(u < fc, low + np.sqrt(u * (high - low) * (mode - low)),
+                        high - np.sqrt((1 - u) * (high - low) * (high - mode)))
+    raise ValueError('unknown distribution "%s"' % kind)
+
+def _clip(dist, values):
+    if len(dist) > 3:
+        np.clip(values, dist[3], dist[4], out=values)
+    return values
+
+def _ndtr(z):
+    '''standard normal CDF, via the erfc approximation from Numerical Recipes (error < 1.2e-7)'''
+    x = np.abs(z) / np.sqrt(2)
+    t = 1 / (1 + 0.5 * x)
+    poly = -1.26551223 + t * (1.00002368 + t * (0.37409196 + t * (0.09678418 + t * (-0.18628806 +
+           t * (0.27886807 + t * (-1.13520398 + t * (1.48851587 + t * (-0.82215223 + t * 0.17087277))))))))
+    erfc = t * np.exp(-x * x + poly)
+    return np.where(z >= 0, 1 - 0.5 * erfc, 0.5 * erfc)
@@ -0,0 +1,155 @@
+'''
+Zone summation of interpreted curves (net reservoir and net pay):
+summation - applies Vsh/phi/Sw cutoffs and returns per-zone gross, net and pay
+            thickness, N/G, thickness weighted averages and hydrocarbon pore thickness
+zone_ooip - original oil in place of every zone from a summation
+zone_ogip - original gas in place of every zone from a summation
+
+Zones are contiguous sample ranges, reduced all at once with np.add.reduceat,
+so thousands of zones of many wells (curves concatenated well after well)
+are summed without a loop over zones or samples. Sums are accumulated in
+float64 whatever the precision of the curves.
+'''
+import numpy as np
+
+from ..compute.precision import ACCUMULATOR
+
+def summation(depth, phi, sw, vsh=None, zones=None, vsh_cut=None, phi_cut=None, sw_cut=None):
+    '''
+    summation(depth, phi, sw, vsh=None, zones=None, vsh_cut=None, phi_cut=None, sw_cut=None)
+    *Input parameters:
+    - depth - depth of the samples (increasing within a zone)
+    - phi - effective porosity (fractional)
+    - sw - water saturation (fractional)
+    - vsh - shale volume (fractional), needed for vsh_cut
+    - zones - pipeline.Zones, or start indices of contiguous zones (a zone runs to the
+      start of the next one, like np.add.reduceat), or None for a single zone
+    - vsh_cut - net reservoir has vsh <= vsh_cut
+    - phi_cut - net reservoir has phi >= phi_cut
+    - sw_cut - net pay is net reservoir with sw <= sw_cut
+    A cutoff left to None is not applied; samples with a NaN phi or vsh are not
+    net reservoir, samples with a NaN sw are not pay. Every sample stands for the
+    interval down to the next sample of its zone (the last sample of a zone for
+    the interval above it).
+    *Returns:
+    - dict of per-zone arrays (scalars when zones is None):
+      'gross', 'net', 'pay' - thicknesses
+      'net_to_gross', 'pay_to_gross' - N/G of net reservoir and of net pay
+      'phi_net', 'vsh_net' - thickness weighted averages over net reservoir
+      'phi_pay' - thickness weighted average porosity over net pay
+      'sw_pay' - pore volume weighted average saturation over net pay
+      'phih' - porosity thickness of net pay
+      'hpv' - hydrocarbon pore thickness of net pay, sum of h*phi*(1-sw)
+    *Exemple:
+    sums = summation(las.depth, phie, sw, vsh, zones=zones, vsh_cut=0.4, phi_cut=0.08, sw_cut=0.6)
+    volumes = zone_ooip(sums, area=2.5e6, bo=1.2)
+    '''
+    depth = np.asarray(depth, dtype=np.float64)
+    phi = np.asarray(phi)
+    sw = np.asarray(sw)
+    size = len(depth)
+    starts, stops = _ranges(zones, size)
+
+    thickness = _thickness(depth, starts, stops)
+    with np.errstate(invalid='ignore'):
+        net = np.isfinite(phi)
+        if vsh is not None:
+            net &= np.isfinite(vsh)
+        if vsh_cut is not None:
+            if vsh is None:
+                raise ValueError('vsh_cut needs the vsh curve')
+            net &= np.asarray(vsh) <= vsh_cut
+        if phi_cut is not None:
+            net &= phi >= phi_cut
+        pay = net & np.isfinite(sw)
+        if sw_cut is not None:
+            pay &= sw <= sw_cut
+
+    # every sum goes through one float64 buffer with a trailing zero, so that
+    # zones ending at the last sample are valid reduceat indices
+    buffer = np.zeros(size + 1, dtype=ACCUMULATOR)
+    values = buffer[:size]
+    def total(mask, *factors):
+        values[...] = 0
+        np.copyto(values, thickness, where=mask)
+        for factor in factors:
+            np.multiply(values, factor, out=values, where=mask)
+        return _segment_sum(buffer, starts, stops)
+
+    gross = _segment_sum(np.append(thickness, 0), starts, stops)
+    net_h = total(net)
+    pay_h = total(pay)
+    phih_net = total(net, phi)
+    phih = total(pay, phi)
+    swh = total(pay, phi, sw)
+    vshh_net = total(net, vsh) if vsh is not None else np.full(len(starts), np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        result = {'gross': gross, 'net': net_h, 'pay': pay_h,
+                  'net_to_gross': net_h / gross, 'pay_to_gross': pay_h / gross,
+                  'phi_net': phih_net / net_h, 'vsh_net': vshh_net / net_h,
+                  'phi_pay': phih / pay_h, 'sw_pay': swh / phih,
+                  'phih': phih, 'hpv': phih - swh}
+    if zones is None:
+        result = dict((key, value[0]) for key, value in result.items())
+    return result
+
+def zone_ooip(sums, area, bo, metric=True):
+    '''
+    zone_ooip(sums, area, bo, metric=True)
+    *Input parameters:
+    - sums - result of summation
+    - area - [m2] or [acres], scalar or per zone
+    - bo - Oil Volume Factor [res bbl/ ST bbl], scalar or per zone
+    *Returns:
+    - volumetrics.ooip of every zone in [m3] or [bbl], from the hydrocarbon pore
+      thickness: area * hpv / bo (7758 bbl/acre-ft in field units); 0 for zones without pay
+    '''
+    ooip = area * sums['hpv'] / bo
+    return ooip if metric==True else 7758 * ooip
+
+def zone_ogip(sums, area, bg, metric=True):
+    '''
+    zone_ogip(sums, area, bg, metric=True)
+    *Input parameters:
+    - sums - result of summation
+    - area - [m2] or [acres], scalar or per zone
+    - bg - Gas Volume Factor [res ft3/ scf], scalar or per zone
+    *Returns:
+    - volumetrics.ogip of every zone in [m3] or [scf], from the hydrocarbon pore
+      thickness: area * hpv / bg (43560 ft2/acre in field units); 0 for zones without pay
+    '''
+    ogip = area * sums['hpv'] / bg
+    return ogip if metric==True else 43560 * ogip
+
+def _ranges(zones, size):
+    '''start and stop sample of every zone (see summation)'''
+    if zones is None:
+        starts, stops = np.zeros(1, dtype=np.intp), np.full(1, size, dtype=np.intp)
+    elif hasattr(zones, 'starts'):
+        starts, stops = np.asarray(zones.starts, dtype=np.intp), np.asarray(zones.stops, dtype=np.intp)
+    else:
+        starts = np.atleast_1d(np.asarray(zones, dtype=np.intp))
+        stops = np.append(starts[1:], size)
+    if np.any(starts > stops) or (len(starts) and (starts[0] < 0 or stops[-1] > size)):
+        raise ValueError('zones must be increasing sample ranges within the %d samples' % size)
+    return starts, stops
+
+def _thickness(depth, starts, stops):
+    '''thickness of every sample: step to the next sample of its zone, the last one the step above it'''
+    thickness = np.zeros(len(depth))
+    if len(depth) > 1:
+        np.subtract(depth[1:], depth[:-1], out=thickness[:-1])
+    last = stops[stops > starts] - 1
+    single = last == starts[stops > starts]
+    thickness[last[~single]] = thickness[last[~single] - 1]
+    thickness[last[single]] = 0
+    return thickness
+
+def _segment_sum(buffer, starts, stops):
+    '''sums of buffer[start:stop] for every zone; buffer ends with a zero'''
+    indices = np.empty(2 * len(starts), dtype=np.intp)
+    indices[0::2] = starts
+    indices[1::2] = stops
+    sums = np.add.reduceat(buffer, indices)[0::2]
+    sums[starts == stops] = 0
+    return sums
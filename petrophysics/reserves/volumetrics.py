@@ -31,24 +31,24 @@ def ooip(area, thickness, sw, phi, ngr, bo, metric=True):
         ooip = 7758 * area * thickness * so * phi * ngr / bo
     return ooip
 
-def ogip(area, thickness, sw, phi, ngr, bg):
+def ogip(area, thickness, sw, phi, ngr, bg, metric=True):
     '''
-    ogip(area, thickness, sw, phi, ngr, bo, metric=True)
+    ogip(area, thickness, sw, phi, ngr, bg, metric=True)
     *Input parameters:
-    - area - in [m2] or [uk]
+    - area - [m2] or [acres]
     - thickness - gross thickness in [m] or [ft]
     - sw - water saturation (fractional)
     - phi - effective porosity (fractional)
     - ngr - Net/Gross Ratio (fractional)
-    - bo - Gas Volume Factor for gas at initial conditions
+    - bg - Gas Volume Factor for gas at initial conditions [res ft3/ scf]
     *Returns:
-     - ogip (original oil in place) in [m3] or [bbl]
+     - ogip (original gas in place) in [m3] or [scf]
     '''
     sg = 1 - sw
     if metric==True:
         ogip = area * thickness * sg * phi * ngr / bg
     else:
-        ogip = 7758 * area * thickness * sg * phi * ngr / bg
+        ogip = 43560 * area * thickness * sg * phi * ngr / bg
     return ogip
     
 def oil(ooip, RF):
@@ -1,4 +1,5 @@
 from .resistivity import arp, ssp, rwsp, rwsp1, rwratio, rwarchie, rwchloride
+from .profiles import temperature_profiles, arp_profiles
 
 __all__ = ['arp',
            'ssp',
@@ -6,7 +7,9 @@ __all__ = ['arp',
            'rwsp1',
            'rwratio',
            'rwarchie',
-           'rwchloride'
+           'rwchloride',
+           'temperature_profiles',
+           'arp_profiles'
            ]
 
 
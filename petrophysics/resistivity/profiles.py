@@ -0,0 +1,52 @@
+'''
+Resistivity profiles along the borehole:
+temperature_profiles - formation temperature from a gradient model (temperature.tf)
+                       and Rw / Rmf / Rm ... converted to it at every depth sample
+arp_profiles - resistivities converted to a formation temperature curve
+
+Both evaluate arp(r0, t0, tf) = r0*(t0 + k)/(tf + k) with tf + k computed once
+for all the resistivities.
+'''
+import numpy as np
+
+from ..compute.precision import asfloat
+from ..temperature.temperature import tf as formation_temperature
+
+def temperature_profiles(depth, t0, gradient, celsius=True, **references):
+    '''
+    temperature_profiles(depth, t0, gradient, celsius=True, **references)
+    *Input parameters:
+    - depth - depth curve [m] or [ft]
+    - t0 - annual surface mean temperature [C] or [F]
+    - gradient - [C/m] or [F/ft]
+    - celsius - temperatures in Celsius (True) or Fahrenheit (False)
+    - references - name=(r0, t0_ref): resistivity r0 measured at temperature t0_ref
+      (e.g. Rm=(0.92, 20), Rmf=(0.65, 20), Rw=(0.04, 25))
+    *Returns:
+    - dict with 'tf' (formation temperature curve) and a curve per reference,
+      in the working precision (compute.set_precision)
+    *Exemple:
+    curves = temperature_profiles(las.depth, 15, 0.03, Rm=(0.92, 20), Rmf=(0.65, 20))
+    rw = rwsp1(las['SP'], 0.65, 20, curves['tf'])
+    '''
+    tf = asfloat(np.asarray(formation_temperature(t0, gradient, depth)))
+    profiles = arp_profiles(tf, celsius, **references)
+    profiles['tf'] = tf
+    return profiles
+
+def arp_profiles(tf, celsius=True, **references):
+    '''
+    arp_profiles(tf, celsius=True, **references)
+    *Input parameters:
+    - tf - formation temperature (scalar or curve)
+    - celsius - temperatures in Celsius (True) or Fahrenheit (False)
+    - references - name=(r0, t0): resistivity r0 measured at temperature t0
+    *Returns:
+    - dict of name -> resistivity at tf, equal to arp(r0, t0, tf, celsius)
+    '''
+    k = 21.5 if celsius == True else 6.77
+    denominator = np.add(tf, k)
+    profiles = {}
+    for name, (r0, t0) in references.items():
+        profiles[name] = (r0*(t0 + k) / denominator)[()]
+    return profiles
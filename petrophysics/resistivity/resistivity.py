@@ -1,6 +1,8 @@
 __all__ = ['arp', 'ssp', 'rwsp', 'rwsp1', 'rwratio', 'rwarchie', 'rwchloride']
 
-import math
+import numpy as np
+
+from .profiles import arp_profiles
 
 def arp(r0, t0, tf, celsius = True):
     '''
@@ -30,26 +32,27 @@ def ssp (sp, bed_thickness, Rm, Ri, metric = True):
     ssp (sp, bed_thickness, Rm, Ri)
     Exemples:
     ssp(-90,22,0.92,10)
-    ssp(-90,22, arp(1.57,68,121,metric=False),10)
+    ssp(-90,22, arp(1.57,68,121,celsius=False),10)
     *Input parameters:
-    sp - sp reading from log
+    sp - sp reading from log (scalar or curve)
     bed_thickness - bed thickness in m (for metric==True) or ft (metric==False)
     Rm - mud resistivity (already converted at formation temperature)
     Ri - shallow resistivity (in the invaded zone)
+    Every input can be a curve; the correction is chosen sample by sample.
     *Calculated parameters:
     SSP - static sp corrected for bed_thickness thickness and invasion
     Formulation of sp correction factor (from Western Atlas 1992, bed_thickness>3ft <50ft and Ri/Rm>5)
     '''
     if metric == True:
         bed_thickness = bed_thickness * 3.28084
-    if (bed_thickness > 50 or Ri/Rm < 5):
-        sp_correction = 1
-    else:
-        term1 = (4*(Ri/Rm)+2)**(1/3.65)-1.5
-        term2 = bed_thickness - ((Ri/Rm + 11)/0.65)**1/6.05 - 0.1
-        sp_correction = term1/term2+0.95
+    ratio = np.divide(Ri, Rm)
+    # both branches are evaluated on every sample, the correction is discarded where it does not apply
+    with np.errstate(divide='ignore', invalid='ignore'):
+        term1 = (4*ratio+2)**(1/3.65)-1.5
+        term2 = bed_thickness - ((ratio + 11)/0.65)**1/6.05 - 0.1
+        sp_correction = np.where((bed_thickness > 50) | (ratio < 5), 1, term1/term2+0.95)
     SSP = sp * sp_correction
-    return SSP
+    return SSP[()]
 
 def rwsp(sp, Rm0, Rmf0, Ri, t0, tf, bed_thickness, metric = True):
     '''
@@ -61,46 +64,48 @@ def rwsp(sp, Rm0, Rmf0, Ri, t0, tf, bed_thickness, metric = True):
     - Ri - shallow resistivity (in the invaded zone)
     - t0 - temperature at surface
     - tf - formation temperature
+    - bed_thickness - bed thickness in m (for metric==True) or ft (metric==False)
+    - metric - temperatures in Celsius and thickness in m (True) or Fahrenheit and ft (False)
+    sp, Ri, tf and bed_thickness can be curves: the whole Rw profile comes from one call.
     *Calculated parameters:
     - Rwe - equivalent water resistivity
     - RwSP - water resistivity from SP log
     '''
     if metric==True:
         tff = 9 /5 * tf + 32
+        t0f = 9 /5 * t0 + 32
     else:
         tff = tf
+        t0f = t0
     K = 61+0.133*tff
     
-    Rm = arp(Rm0, t0, tff, metric = False)
+    # mud and mud filtrate resistivities at formation temperature, from one tf + k
+    mud = arp_profiles(tff, celsius = False, Rm = (Rm0, t0f), Rmf = (Rmf0, t0f))
+    Rm = mud['Rm']
 
     #Correct sp to ssp:
     if metric == True:
         bed_thickness = bed_thickness * 3.28084
-    SSP = ssp (sp, bed_thickness, Rm, Ri)
+    SSP = ssp (sp, bed_thickness, Rm, Ri, metric = False)
 
     # formulation from Crain
-    Rmftf = arp(Rmf0, t0, tff, metric = False)
-    Rmf = arp(Rmf0, t0, tff, metric = False)
-    if Rmf > 0.1:
-        Rmfe =  0.85 * Rmf
-    else:
-        Rmfe = (146 * Rmf - 5) / (337 * Rmf + 77)
-    Rwe = Rmfe * 10**(SSP/K)
-
-    if Rwe > 0.12:
-        RwSP = -0.58 -10 **(0.69 * Rwe - 0.24)
-    else:
-        RwSP = (77 * Rwe + 5)/(146-337*Rwe)
-    return RwSP
+    Rmf = mud['Rmf']
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        Rmfe = np.where(Rmf > 0.1, 0.85 * Rmf, (146 * Rmf - 5) / (337 * Rmf + 77))
+        Rwe = Rmfe * 10**(SSP/K)
+        RwSP = np.where(Rwe > 0.12, -0.58 -10 **(0.69 * Rwe - 0.24), (77 * Rwe + 5)/(146-337*Rwe))
+    return RwSP[()]
 
 def rwsp1(sp, Rmf0, t0, tf, metric = True):
     '''
-    rwsp1(sp, Rmf0, t0, tf, units)
+    rwsp1(sp, Rmf0, t0, tf, metric = True)
     Formula from Djeebbar_Tiab_... book (p.825)
     *Input parameters:
+    - sp - sp reading from log (scalar or curve)
     - Rmf0 - mud filtrate resistivity
     - t0 - temperature at surface
-    - tf - formation temperature
+    - tf - formation temperature (scalar or curve)
+    - metric - temperatures in Celsius (True) or Fahrenheit (False)
     *Calculated parameters:
     - k - temperature correction
     - SSP - sp correction of bed_thickness thickness and invasion
@@ -110,20 +115,20 @@ def rwsp1(sp, Rmf0, t0, tf, metric = True):
     - RwSP - water resistivity from sp
     '''
     if metric == True:
-        tff = 5/9 * tf + 32
+        tff = 9/5 * tf + 32
+        t0 = 9/5 * t0 + 32
     else:
         tff = tf
     k = 61+0.133*tff
     
-    Rmf = arp(Rmf0, t0, tff, metric == False)
+    Rmf = arp(Rmf0, t0, tff, celsius = False)
     SSP = sp
     Rwe = Rmf / 10**(-SSP/k)
 
-    if Rwe > 0.08:
-        RwSP = Rwe
-    else:
-        RwSP = (Rwe + 0.131 * 10**((1/math.log(tff/19.9))-2))/(-0.5*Rwe+10**(0.0426/(math.log(tff/50.8))))         
-    return RwSP
+    with np.errstate(divide='ignore', invalid='ignore'):
+        RwSP = np.where(Rwe > 0.08, Rwe,
+                        (Rwe + 0.131 * 10**((1/np.log(tff/19.9))-2))/(-0.5*Rwe+10**(0.0426/(np.log(tff/50.8)))))
+    return RwSP[()]
 
 def rwratio(Rt, Rmf, Rxo):
     '''
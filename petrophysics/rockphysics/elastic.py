@@ -7,8 +7,21 @@ List of functions:
 - shear_modulus - (G) 
 - young_modulus - (E) 
 - poisson - ratio (mu)
+- elastic_moduli - all of the above, the impedances and the velocity ratios
+  as one structured array
+
+The single moduli take out= as well (compute.transform); elastic_moduli fills
+its structured array in blocks itself.
 '''
+import numpy as np
+
+from ..compute.transform import transform
+from . import impedance, ratio
+
+MODULI = ('pwave_modulus', 'shear_modulus', 'bulk_modulus', 'lame1st', 'young_modulus', 'poisson',
+          'acoustic_impedance', 'shear_impedance', 'vp_over_vs', 'vs_over_vp')
 
+@transform
 def pwave_modulus(den, vp):
     '''
     den - kg/m3
@@ -19,6 +32,7 @@ def pwave_modulus(den, vp):
     m = (den*vp**2)/10**9
     return m
 
+@transform
 def shear_modulus(den, vs):
     '''
     den - kg/m3
@@ -29,6 +43,7 @@ def shear_modulus(den, vs):
     g = (den*vs**2)/10**9
     return g
 
+@transform
 def bulk_modulus(den,vp,vs):
     '''
     den - kg/m3
@@ -37,9 +52,10 @@ def bulk_modulus(den,vp,vs):
     Returns:
     k - GPa (equation adds division by 10^9 and the final result is in GPa)
     '''
-    k = (den*vp**2-(4/3)*vs**2)/10**9
+    k = (den*(vp**2-(4/3)*vs**2))/10**9
     return k
 
+@transform
 def lame1st(den, vp, vs):
     '''
     den - kg/m3
@@ -51,6 +67,7 @@ def lame1st(den, vp, vs):
     lame1st = (den *(vp**2 - 2*vs**2))/10**9
     return lame1st
 
+@transform
 def young_modulus(den, vp, vs):
     '''
     den - kg/m3
@@ -62,13 +79,82 @@ def young_modulus(den, vp, vs):
     e = ((den*vs**2*(3*vp**2-4*vs**2))/(vp**2-vs**2))/10**9
     return e
 
+@transform
 def poisson(den, vp, vs):
     '''
-    den - kg/m3
+    den - kg/m3, ignored (kept for compatibility, the ratio depends on the velocities only)
     vp - m/s
     vs - m/s
     Returns:
-    mu - GPa (equation adds division by 10^9 and the final result is in GPa)
+    mu - Poisson's ratio (vp**2-2*vs**2)/(2*(vp**2-vs**2)), dimensionless
     '''
-    mu = ((den*vs**2*(3*vp**2-4*vs**2))/(vp**2-vs**2))/10**9
+    mu = (vp**2-2*vs**2)/(2*(vp**2-vs**2))
     return mu
+
+def elastic_moduli(den, vp, vs, out=None, block_size=16384):
+    '''
+    elastic_moduli(den, vp, vs, out=None, block_size=16384)
+    *Input parameters:
+    - den - kg/m3
+    - vp - m/s
+    - vs - m/s
+    - out - structured array receiving the results (default a new one), or a dict of
+      name -> contiguous array; separate arrays are faster to fill on millions of samples
+    - block_size - samples evaluated at a time (the temporaries of a block stay in cache)
+    *Returns:
+    - out when it is a dict, else a structured array of the broadcast shape of the inputs, with the fields
+      (see MODULI) pwave_modulus, shear_modulus, bulk_modulus, lame1st,
+      young_modulus [GPa], poisson, acoustic_impedance, shear_impedance
+      (impedance.acoustic, impedance.shear), vp_over_vs and vs_over_vp
+      (ratio.vp_over_vs, ratio.vs_over_vp); a single record for scalar inputs
+    vp**2, vs**2 and their combinations are computed once per block for all the
+    moduli; every field equals the result of the corresponding function.
+    *Exemple:
+    moduli = elastic_moduli(las['RHOB'] * 1000, 1e6 / las['DT'], 1e6 / las['DTS'])
+    k, mu = moduli['bulk_modulus'], moduli['poisson']
+    '''
+    shape = np.broadcast_shapes(np.shape(den), np.shape(vp), np.shape(vs))
+    if out is None:
+        dtype = np.result_type(den, vp, vs, 1.0)
+        out = np.empty(shape, dtype=[(name, dtype) for name in MODULI])
+    arrays = out.values() if isinstance(out, dict) else [out]
+    if any(array.shape != shape or not array.flags.c_contiguous for array in arrays):
+        raise ValueError('out must hold contiguous arrays of shape %s' % (shape,))
+    if isinstance(out, dict):
+        fields = dict((name, out[name].reshape(-1)) for name in MODULI)
+        select = lambda block: dict((name, field[block]) for name, field in fields.items())
+    else:
+        records = out.reshape(-1)
+        select = lambda block: records[block]
+    size = int(np.prod(shape))
+    den, vp, vs = [_flat(value, shape) for value in (den, vp, vs)]
+    for start in range(0, max(size, 1), block_size):
+        block = slice(start, start + block_size)
+        _moduli(*[value[block] if np.ndim(value) else value for value in (den, vp, vs)], select(block))
+    if isinstance(out, dict):
+        return out
+    return out[()] if out.ndim == 0 else out
+
+def _moduli(den, vp, vs, out):
+    '''every field of elastic_moduli written to out, from shared squares'''
+    vp2 = vp**2
+    vs2 = vs**2
+    shear = den*vs2
+    difference = vp2-vs2
+    lame = vp2-2*vs2
+    out['pwave_modulus'][...] = (den*vp2)/10**9
+    out['shear_modulus'][...] = shear/10**9
+    out['bulk_modulus'][...] = (den*(vp2-(4/3)*vs2))/10**9
+    out['lame1st'][...] = (den*lame)/10**9
+    out['young_modulus'][...] = ((shear*(3*vp2-4*vs2))/difference)/10**9
+    out['poisson'][...] = lame/(2*difference)
+    impedance.acoustic(vp, den, out=out['acoustic_impedance'])
+    impedance.shear(vs, den, out=out['shear_impedance'])
+    ratio.vp_over_vs(vp, vs, out=out['vp_over_vs'])
+    ratio.vs_over_vp(vs, vp, out=out['vs_over_vp'])
+
+def _flat(value, shape):
+    '''scalars as they are, arrays broadcast to shape and flattened (a view when possible)'''
+    if np.ndim(value) == 0:
+        return value
+    return np.broadcast_to(np.asarray(value), shape).reshape(-1)
@@ -2,12 +2,17 @@
 List of functions:
 - acoustic - impedance vp*den
 - shear - impedance vs*den
+
+Impedances are written to out= when given (compute.transform).
 '''
+from ..compute.transform import transform
 
+@transform
 def acoustic(vp, den):
     pwave_impedance = vp * den
     return pwave_impedance
 
+@transform
 def shear(vs, den):
     shear_impedance = vs * den
     return shear_impedance
@@ -2,12 +2,17 @@
 List of functions:
 - vp_over_vs - vp/vs
 - vp_over_vs - vs/vp
+
+out= takes a preallocated ratio curve (compute.transform).
 '''
+from ..compute.transform import transform
 
+@transform
 def vp_over_vs(vp, vs):
     vp_vs_ratio = vp / vs
     return vp_vs_ratio
 
+@transform
 def vs_over_vp(vs, vp):
     vs_vp_ratio = vs / vp 
     return vs_vp_ratio
@@ -1,4 +1,7 @@
+from . import models
 from . import mvi
+from . import pickett
+from . import sensitivity
 from . import soil
 from . import sw
 from . import sxo
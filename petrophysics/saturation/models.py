@@ -0,0 +1,118 @@
+'''
+Side by side evaluation of several water saturation models on the same curves:
+evaluate - runs a set of models from sw in one pass, sharing intermediate curves
+           (Phi**m, 1/Rt, a*Rw, Vsh/Rsh ...) between them
+Cache - least recently used store of the intermediate curves
+MODELS - names of the models evaluate supports
+
+Every call uses a new Cache unless one is passed with cache=. A Cache kept
+between calls reuses its intermediates on the same curves with other models
+or other saturation exponents; it keys the input arrays by identity and holds
+a reference to them, so an identity is never reused while an entry is alive,
+and an input array modified in place must be followed by cache.clear().
+The final step of every model is the sw function's own (sw._quadratic,
+sw._indonesian ...), so results are identical to calling the sw functions one by one.
+'''
+from collections import OrderedDict
+
+import numpy as np
+
+from . import sw
+
+MODELS = ('archie', 'simandoux', 'modified_simandoux', 'schlumberger',
+          'poupon', 'indonesian', 'modified_indonesian')
+SHALY = ('simandoux', 'modified_simandoux', 'schlumberger', 'poupon',
+         'indonesian', 'modified_indonesian')
+
+class Cache(object):
+    '''
+    Cache(size=64)
+    Least recently used store of intermediate curves, size entries at most.
+    *Attributes:
+    - hits, misses - number of intermediates reused and computed
+    '''
+    def __init__(self, size=64):
+        self.size = size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, name, func, *operands):
+        '''
+        get(name, func, *operands)
+        Returns func(*operands), computed once per name and operands.
+        '''
+        key = (name,) + tuple(_key(operand) for operand in operands)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key][0]
+        self.misses += 1
+        value = func(*operands)
+        self.entries[key] = (value, operands)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+def _key(value):
+    if isinstance(value, np.ndarray):
+        return ('id', id(value))
+    return (type(value).__name__, value)
+
+def evaluate(models, Rw, Rt, Phi, Rsh=None, Vsh=None, a=1, m=2, n=2, cache=None):
+    '''
+    evaluate(models, Rw, Rt, Phi, Rsh=None, Vsh=None, a=1, m=2, n=2, cache=None)
+    *Input parameters:
+    - models - names of the models to evaluate (see MODELS), None for all of them
+    - Rw, Rt, Phi, Rsh, Vsh, a, m, n - see sw; Rsh and Vsh are needed by the shaly
+      sand models only
+    - cache - Cache holding the intermediates, kept by the caller to reuse them in
+      later calls (default: a new Cache for this call)
+    *Returns:
+    - dict of model name -> water saturation
+    *Exemple:
+    sws = evaluate(['archie', 'simandoux', 'indonesian'], Rw=0.05, Rt=rt, Phi=phie, Rsh=4, Vsh=vsh)
+    '''
+    models = MODELS if models is None else list(models)
+    unknown = [model for model in models if model not in MODELS]
+    if unknown:
+        raise ValueError('unknown model(s) %s, expected %s' % (', '.join(unknown), ', '.join(MODELS)))
+    if (Rsh is None or Vsh is None) and any(model in SHALY for model in models):
+        raise ValueError('Rsh and Vsh are needed by %s' % ', '.join(model for model in models if model in SHALY))
+    c = Cache() if cache is None else cache
+    phim = lambda: c.get('Phi**m', lambda Phi, m: Phi**m, Phi, m)
+    arw = lambda: c.get('a*Rw', lambda a, Rw: a*Rw, a, Rw)
+    inv_rt = lambda: c.get('1/Rt', lambda Rt: 1/Rt, Rt)
+    vsh_rsh = lambda: c.get('Vsh/Rsh', lambda Vsh, Rsh: Vsh/Rsh, Vsh, Rsh)
+    clean = lambda: c.get('1-Vsh', lambda Vsh: 1-Vsh, Vsh)
+    arw_clean = lambda: c.get('a*Rw*(1-Vsh)', lambda a, Rw, Vsh: arw()*clean(), a, Rw, Vsh)
+    sqrt_rt = lambda: c.get('1/Rt**(1/2)', lambda Rt: 1/Rt**(1/2), Rt)
+    sqrt_rsh = lambda: c.get('Rsh**(1/2)', lambda Rsh: Rsh**(1/2), Rsh)
+    sqrt_conductance = lambda: c.get('(Phi**m/(a*Rw))**(1/2)', lambda Phi, m, a, Rw: (phim()/arw())**(1/2),
+                                     Phi, m, a, Rw)
+
+    results = {}
+    for model in models:
+        if model == 'archie':
+            F = c.get('a/Phi**m', lambda a, Phi, m: a / phim(), a, Phi, m)
+            results[model] = sw._archie(F, Rw, Rt, n)
+        elif model in ('simandoux', 'modified_simandoux'):
+            term1 = phim()/arw() if model == 'simandoux' else phim()/arw_clean()
+            results[model] = sw._quadratic(term1, vsh_rsh(), -inv_rt())
+        elif model == 'schlumberger':
+            phi2 = c.get('Phi**2', lambda Phi: Phi**2, Phi)
+            results[model] = sw._schlumberger(Rw, Rt, phi2, vsh_rsh(), clean())
+        elif model == 'poupon':
+            results[model] = sw._poupon(inv_rt() - vsh_rsh(), arw_clean() / phim(), n)
+        else:
+            if model == 'indonesian':
+                term3 = c.get('Vsh**(1-Vsh/2)/Rsh**(1/2)', lambda Vsh, Rsh: Vsh ** (1-Vsh/2)/sqrt_rsh(), Vsh, Rsh)
+            else:
+                term3 = c.get('Vsh**((1-Vsh)/2)/Rsh**(1/2)', lambda Vsh, Rsh: Vsh**(clean()/2) / sqrt_rsh(), Vsh, Rsh)
+            results[model] = sw._indonesian(sqrt_rt(), sqrt_conductance(), term3, n)
+    return results
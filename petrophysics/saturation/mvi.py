@@ -3,8 +3,12 @@ List of functions:
 sw_sxo - movable hydrocarbon index
 swr - movable hydrocarbon index
 bvw - bulk volume of water
+
+out= writes an index into a preallocated curve (compute.transform).
 '''
+from ..compute.transform import transform
 
+@transform
 def sw_sxo(Rxo, Rmf, Rw, Rt):
         '''
         sw/sxo - is called movable hydrocarbon index
@@ -17,6 +21,7 @@ def sw_sxo(Rxo, Rmf, Rw, Rt):
         sw_sxo = (Rxo/Rmf * Rw/Rt)**(1/2)
         return sw_sxo
 
+@transform
 def swr(Rxo, Rmf, Rw, Rt):
         '''
         swr - movable hydrocarbon index
@@ -32,6 +37,7 @@ def swr(Rxo, Rmf, Rw, Rt):
 
 #BVW
 
+@transform
 def bvw(sw,phi):
         bvw = sw * phi
         return bvw
@@ -0,0 +1,127 @@
+'''
+Pickett plot / Archie parameter fitting:
+fit_pickett - fits m and a*Rw (Rw for a given a) from water-zone Rt and Phi,
+              for many zones in one batched (optionally robust) regression
+pickett_line - Rt of the Pickett line for a given saturation
+'''
+import numpy as np
+
+def fit_pickett(rt, phi, zones=None, mask=None, a=1.0, m=None, robust=None, n_iter=20, tol=1e-6):
+    '''
+    fit_pickett(rt, phi, zones=None, mask=None, a=1.0, m=None, robust=None, n_iter=20, tol=1e-6)
+    Fits log10(Rt) = log10(a*Rw) - m*log10(Phi) (Archie with Sw=1) by weighted least squares,
+    independently for every zone, with closed-form per-zone sums (no loop over zones).
+    *Input parameters:
+    - rt - true resistivity [ohm.m] of water-bearing samples
+    - phi - porosity [decimal]
+    - zones - zone label of every sample (default: a single zone)
+    - mask - boolean array selecting the samples to fit (e.g. water zones, good hole)
+    - a - tortuosity factor used to split a*Rw into Rw
+    - m - cementation exponent; if given only Rw is fitted
+    - robust - None (least squares), 'huber' or 'bisquare' iteratively reweighted fit
+    - n_iter, tol - iterations and convergence tolerance of the robust fit
+    *Returns:
+    - dict with 'zones', 'm', 'rw', 'a_rw', 'rms' (log10 units), 'n' (samples used) per zone
+      (scalars if zones is None) and 'residuals' (log10 Rt residual per sample, NaN if unused)
+    *Exemple:
+    fit = fit_pickett(rt, phie, zones=zone_curve, mask=vsh < 0.1, robust='huber')
+    '''
+    rt = np.asarray(rt, dtype=float)
+    phi = np.asarray(phi, dtype=float)
+    if zones is None:
+        labels, index = np.zeros(1), np.zeros(rt.shape, dtype=np.intp)
+    else:
+        labels, index = _labels(np.asarray(zones))
+        index = index.reshape(rt.shape)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        use = np.isfinite(rt) & np.isfinite(phi) & (rt > 0) & (phi > 0)
+        if mask is not None:
+            use &= np.asarray(mask, dtype=bool)
+        x = np.log10(phi[use])
+        y = np.log10(rt[use])
+    index = index[use]
+    nzones = len(labels)
+
+    weights = np.ones(len(x))
+    slope, intercept = _wls(x, y, weights, index, nzones, m)
+    if robust:
+        # residual scale from the least-squares fit (robust itself, being a median)
+        scale = _mad(y - intercept[index] - slope[index] * x, index, nzones)
+        scale = np.where(scale > 0, scale, np.inf)
+    for iteration in range(n_iter if robust else 0):
+        u = (y - intercept[index] - slope[index] * x) / scale[index]
+        if robust == 'huber':
+            k = 1.345
+            weights = np.minimum(1, k / np.maximum(np.abs(u), 1e-12))
+        elif robust == 'bisquare':
+            k = 4.685
+            weights = np.where(np.abs(u) < k, (1 - (u / k) ** 2) ** 2, 0)
+        else:
+            raise ValueError('unknown robust weighting "%s"' % robust)
+        previous = np.concatenate([slope, intercept])
+        slope, intercept = _wls(x, y, weights, index, nzones, m)
+        if np.nanmax(np.abs(np.concatenate([slope, intercept]) - previous), initial=0) < tol:
+            break
+
+    residuals = np.full(rt.shape, np.nan)
+    residuals[use] = y - intercept[index] - slope[index] * x
+    count = np.bincount(index, minlength=nzones)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rms = np.sqrt(np.bincount(index, residuals[use] ** 2, minlength=nzones) / count)
+    result = {'zones': labels, 'm': -slope, 'a_rw': 10 ** intercept, 'rw': 10 ** intercept / a,
+              'rms': rms, 'n': count}
+    if zones is None:
+        result = dict((key, value[0]) for key, value in result.items())
+    result['residuals'] = residuals
+    return result
+
+def pickett_line(phi, rw, a=1.0, m=2.0, n=2.0, sw=1.0):
+    '''
+    pickett_line(phi, rw, a=1.0, m=2.0, n=2.0, sw=1.0)
+    *Returns:
+    - Rt on the Pickett plot line of constant water saturation sw: Rt = a*Rw / (Phi**m * Sw**n)
+    '''
+    return a * rw / (phi ** m * sw ** n)
+
+def _labels(zones):
+    '''zone labels and the label index of every sample (bincount based for small integer labels)'''
+    if zones.dtype.kind in 'iu' and zones.size:
+        low, high = zones.min(), zones.max()
+        if high - low < 4 * zones.size + 1024:
+            present = np.bincount((zones - low).ravel()) > 0
+            lookup = np.cumsum(present) - 1
+            return np.flatnonzero(present) + low, lookup[zones - low]
+    return np.unique(zones, return_inverse=True)
+
+def _wls(x, y, w, index, nzones, m):
+    '''weighted least squares line per zone from bincount sums; slope is fixed to -m if m is given'''
+    wx = w * x
+    sw = np.bincount(index, w, minlength=nzones)
+    sx = np.bincount(index, wx, minlength=nzones)
+    sy = np.bincount(index, w * y, minlength=nzones)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if m is not None:
+            slope = np.full(nzones, -float(m))
+        else:
+            sxx = np.bincount(index, wx * x, minlength=nzones)
+            sxy = np.bincount(index, wx * y, minlength=nzones)
+            slope = (sw * sxy - sx * sy) / (sw * sxx - sx ** 2)
+        intercept = (sy - slope * sx) / sw
+    return slope, intercept
+
+def _mad(residuals, index, nzones):
+    '''normalized median absolute deviation of the residuals of every zone'''
+    count = np.bincount(index, minlength=nzones)
+    if not len(index):
+        return np.full(nzones, np.nan)
+    # sorted by zone, and by deviation within a zone (stable radix sort of the labels)
+    deviation = np.abs(residuals)
+    order = np.argsort(deviation)
+    order = order[np.argsort(index[order], kind='stable')]
+    deviation = deviation[order]
+    start = np.cumsum(count) - count
+    lower = np.clip(start + (count - 1) // 2, 0, len(deviation) - 1)
+    upper = np.clip(start + count // 2, 0, len(deviation) - 1)
+    median = (deviation[lower] + deviation[upper]) / 2
+    median[count == 0] = np.nan
+    return median / 0.6745
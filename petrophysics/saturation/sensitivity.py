@@ -0,0 +1,116 @@
+'''
+Parameter sweep / sensitivity analysis of the saturation models:
+sweep - evaluates a model over the Cartesian product of parameter grids and a well
+tornado - low/high swings of a well statistic for one parameter at a time
+derivatives - partial derivatives of a well statistic with respect to each parameter
+
+Every parameter grid is laid on its own array axis and the curves on the last
+one, so a single broadcast call per depth tile covers all the combinations and
+sub-expressions depending on one parameter only (e.g. Phi**m) are computed
+once per value of that parameter instead of once per combination.
+'''
+import numpy as np
+
+def sweep(func, curves, grids, reduce=None, tile_size=2**22, **fixed):
+    '''
+    sweep(func, curves, grids, reduce=None, tile_size=2**22, **fixed)
+    *Input parameters:
+    - func - saturation function (sw.archie, sw.simandoux, sw.indonesian ...)
+    - curves - dict of argument -> curve (Rt, Phi, Vsh ...), all of the same length
+    - grids - dict of argument -> values to sweep (m, n, Rw ...), in axis order
+    - reduce - None to return every depth, 'mean' or 'sum' to return the (NaN ignoring)
+      mean or sum over depth only; the full cube is then never allocated
+    - tile_size - largest number of elements (combinations x depths) evaluated at a time
+    - fixed - the other arguments of func
+    *Returns:
+    - array of shape (len(grid1), len(grid2), ..., n_depth), or without the depth axis if reduce
+    *Exemple:
+    sw_cube = sweep(sw.archie, {'Rt': rt, 'Phi': phie},
+                    {'m': np.linspace(1.8, 2.2, 9), 'n': np.linspace(1.9, 2.3, 9)}, Rw=0.05, a=1)
+    '''
+    names = list(grids)
+    values = [np.asarray(grids[name], dtype=float) for name in names]
+    shape = tuple(len(value) for value in values)
+    axes = {}
+    for axis, (name, value) in enumerate(zip(names, values)):
+        view = [1] * (len(names) + 1)
+        view[axis] = len(value)
+        axes[name] = value.reshape(view)
+    curves = dict((name, np.asarray(curve)) for name, curve in curves.items())
+    size = len(next(iter(curves.values())))
+    combinations = int(np.prod(shape))
+    tile = max(1, tile_size // max(combinations, 1))
+    if reduce is None:
+        result = np.empty(shape + (size,))
+    elif reduce in ('mean', 'sum'):
+        total = np.zeros(shape)
+        count = np.zeros(shape)
+    else:
+        raise ValueError('unknown reduction "%s"' % reduce)
+    for start in range(0, size, tile):
+        stop = min(start + tile, size)
+        kwargs = dict(fixed)
+        kwargs.update(axes)
+        for name, curve in curves.items():
+            kwargs[name] = curve[start:stop]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            block = np.broadcast_to(func(**kwargs), shape + (stop - start,))
+        if reduce is None:
+            result[..., start:stop] = block
+        else:
+            total += np.nansum(block, axis=-1)
+            count += np.sum(~np.isnan(block), axis=-1)
+    if reduce is None:
+        return result
+    if reduce == 'sum':
+        return total
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return total / count
+
+def tornado(func, curves, base, ranges, reduce='mean', **fixed):
+    '''
+    tornado(func, curves, base, ranges, reduce='mean', **fixed)
+    *Input parameters:
+    - func, curves, fixed - see sweep
+    - base - dict of parameter -> base case value
+    - ranges - dict of parameter -> (low, high)
+    - reduce - well statistic, 'mean' or 'sum' over depth
+    *Returns:
+    - list of dicts with 'parameter', 'low', 'high', 'value_low', 'value_high',
+      'swing' (= |value_high - value_low|) and 'base' (statistic of the base case),
+      sorted by decreasing swing
+    '''
+    kwargs = dict(fixed)
+    kwargs.update(base)
+    reference = float(sweep(func, curves, {}, reduce=reduce, **kwargs))
+    bars = []
+    for name, (low, high) in ranges.items():
+        others = dict(kwargs)
+        others.pop(name, None)
+        value_low, value_high = sweep(func, curves, {name: [low, high]}, reduce=reduce, **others)
+        bars.append({'parameter': name, 'low': low, 'high': high,
+                     'value_low': value_low, 'value_high': value_high,
+                     'swing': abs(value_high - value_low), 'base': reference})
+    return sorted(bars, key=lambda bar: -bar['swing'])
+
+def derivatives(func, curves, base, reduce='mean', rel_step=1e-4, **fixed):
+    '''
+    derivatives(func, curves, base, reduce='mean', rel_step=1e-4, **fixed)
+    *Input parameters:
+    - func, curves, fixed - see sweep
+    - base - dict of parameter -> value at which the derivatives are taken
+    - reduce - None for per-depth derivatives, 'mean' or 'sum' for the well statistic
+    - rel_step - relative central difference step
+    *Returns:
+    - dict of parameter -> derivative (array over depth if reduce is None)
+    '''
+    kwargs = dict(fixed)
+    kwargs.update(base)
+    result = {}
+    for name, value in base.items():
+        step = rel_step * abs(value) if value else rel_step
+        others = dict(kwargs)
+        others.pop(name)
+        low, high = sweep(func, curves, {name: [value - step, value + step]}, reduce=reduce, **others)
+        result[name] = (high - low) / (2 * step)
+    return result
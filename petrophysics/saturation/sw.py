@@ -1,4 +1,3 @@
-import math
 '''
 List of water saturation formulas:
 - archie
@@ -16,8 +15,17 @@ Eq that require PhiT:
 - archiet
 Eq requiring Rw,Rt,Rmf,Rxo:
 - ratio
+
+Every argument may be a scalar or a NumPy array; arrays (log curves) and
+scalars (zone parameters) are broadcast together and the result is an array.
+With out= (compute.transform) a model is evaluated block by block into a
+preallocated curve, e.g. out=rt to replace Rt by Sw without a second full array.
 '''
+import numpy as np
+
+from ..compute.transform import transform
 
+@transform
 def archie(Rw, Rt, Phi, a, m, n):
         '''
         archie(Rw, Rt, Phi, a, m, n)
@@ -33,9 +41,10 @@ def archie(Rw, Rt, Phi, a, m, n):
          - archie - water saturation from Archie equation
         '''
         F = a / (Phi**m)
-        archie = (F * Rw/Rt)**n
+        archie = _archie(F, Rw, Rt, n)
         return archie
     
+@transform
 def simandoux(Rw, Rt, Phi, Rsh, Vsh, a, m):
         '''
         simandoux(Rw, Rt, Poro, Rsh, Vsh, a, m)
@@ -57,10 +66,10 @@ def simandoux(Rw, Rt, Phi, Rsh, Vsh, a, m):
         term1 = Phi**m/(a*Rw)
         term2 = Vsh/Rsh
         term3 = -1/Rt
-        delta = (term2**2 - 4*term1*term3)**(1/2)
-        simandoux = ((-1)*term2 + delta) / 2*term1
+        simandoux = _quadratic(term1, term2, term3)
         return simandoux
 
+@transform
 def modified_simandoux(Rw, Rt, Phi, Rsh, Vsh, a, m):
         '''
         modified_simandoux(Rw, Rt, Poro, Rsh, Vsh, a, m)
@@ -82,10 +91,10 @@ def modified_simandoux(Rw, Rt, Phi, Rsh, Vsh, a, m):
         term1 = Phi**m/(a*Rw*(1-Vsh))
         term2 = Vsh/Rsh
         term3 = -1/Rt
-        delta = (term2**2 - 4*term1*term3)**(1/2)
-        modified_simandoux = ((-1)*term2 + delta) / 2*term1
+        modified_simandoux = _quadratic(term1, term2, term3)
         return modified_simandoux
 
+@transform
 def schlumberger(Rw, Rt, Phi, Rsh, Vsh):
         '''
         schlumberger(Rw, Rt, Phi, Rsh, Vsh)
@@ -101,11 +110,10 @@ def schlumberger(Rw, Rt, Phi, Rsh, Vsh):
          - schlumberger - water saturation
         Formula taken from Asquite (Basic Log Intepretation)
         '''
-        term1= sqrt((Vsh/Rsh)**2 + Phi**2/(0.2*Rw*Rt*(1-Vsh)))-(Vsh/Rsh)
-        term2= Phi**2 /(0.4*Rw*(1-Vsh))
-        schlumberger = term1 / term2
+        schlumberger = _schlumberger(Rw, Rt, Phi**2, Vsh/Rsh, 1-Vsh)
         return schlumberger
 
+@transform
 def fertl(Rw, Rt, Phi, Rsh, Vsh, a):
         '''
         fertl(Rw, Rt, Phi, Rsh, Vsh, a)
@@ -125,9 +133,10 @@ def fertl(Rw, Rt, Phi, Rsh, Vsh, a):
         Formula taken from Asquite (Basic Log Intepretation)
         Exemple for parameter a: 0.25 for Golf Coast; 0.35 for Rocky Mountains
         ''' 
-        fertl=(1/Phi)*(sqrt(Rw/Rt+((a*Vsh)/2)**2)-a*Vsh/2)
+        fertl=(1/Phi)*(np.sqrt(Rw/Rt+((a*Vsh)/2)**2)-a*Vsh/2)
         return fertl
 
+@transform
 def poupon(Rw, Rt, Phi, Rsh, Vsh, a, m, n):
         '''
         poupon(Rw, Rt, Phi, Rsh, Vsh, a, m, n)
@@ -145,10 +154,11 @@ def poupon(Rw, Rt, Phi, Rsh, Vsh, a, m, n):
         - poupon - water saturation from Poupon equation
         '''
         term1 = (1/Rt - Vsh/Rsh)
-        term2 = a * Rw * (1-Vcl) / Phi**m
-        poupon = (term1 * term2)**(1/n)
+        term2 = a * Rw * (1-Vsh) / Phi**m
+        poupon = _poupon(term1, term2, n)
         return poupon
 
+@transform
 def indonesian(Rw, Rt, Phi, Rsh, Vsh, a, m, n):
         '''
         indonesian(Rw, Rt, Phi, Rsh, Vsh, a, m, n)
@@ -168,9 +178,10 @@ def indonesian(Rw, Rt, Phi, Rsh, Vsh, a, m, n):
         term1 = 1/Rt**(1/2)
         term2 = (Phi**m/(a*Rw))**(1/2)
         term3 = Vsh ** (1-Vsh/2)/Rsh**(1/2)
-        indonesian = (term1 / (term2 + term3))**(2/n)
+        indonesian = _indonesian(term1, term2, term3, n)
         return indonesian        
         
+@transform
 def modified_indonesian(Rw, Rt, Phi, Rsh, Vsh, a, m, n):
         '''
         modified_indonesian(Rw, Rt, Phi, Rsh, Vsh, a, m, n)
@@ -186,12 +197,13 @@ def modified_indonesian(Rw, Rt, Phi, Rsh, Vsh, a, m, n):
         term1 = 1/Rt**(1/2)
         term2 = (Phi**m / (a*Rw))**(1/2)
         term3 = Vsh**((1-Vsh)/2) / Rsh**(1/2)
-        modified_indonesian = (term1 / (term2 + term3))**(2/n)
+        modified_indonesian = _indonesian(term1, term2, term3, n)
         return modified_indonesian
 
-def waxmansmith(Rw, Rt, phiT, aa, mm, CEC):
+@transform
+def waxmansmith(Rw, Rt, phiT, aa, mm, CEC, den_ma=2.65):
         '''
-        waxmansmith(Rw, Rt, PhiT, aa, mm, CEC)
+        waxmansmith(Rw, Rt, PhiT, aa, mm, CEC, den_ma=2.65)
         **Waxman-Smith CEC method (does not require VCL)
           but requires core measurements of CEC
           Eq solved for n=2
@@ -208,14 +220,15 @@ def waxmansmith(Rw, Rt, phiT, aa, mm, CEC):
         *Returns:
          - SwTotal - total water saturation
         '''
-        B = 4.6 * (1 - 0.6 * math.exp(-0.77/Rw))
+        B = 4.6 * (1 - 0.6 * np.exp(-0.77/Rw))
         Qv = CEC * (1 - phiT) * den_ma / (100*phiT)      
-        term1 = phi ** mm / aa * Rw
+        term1 = phiT ** mm / (aa * Rw)
         term2 = B * Qv * phiT **mm / aa
         term3 = (-1) / Rt
-        swT = ((-1)* term2 + (term2 ** 2 - 4*term1*term2)**(1/2)) / (2 * term1) #solve of quadratic eq for positive delta
+        swT = ((-1)* term2 + (term2 ** 2 - 4*term1*term3)**(1/2)) / (2 * term1) #solve of quadratic eq for positive delta
         return swT
 
+@transform
 def juhasz(Rw, Rt, PhiT, PhiSh, a, m, Vsh, Rsh, Temp):
         '''
         juhasz(Rw, Rt, PhiT, PhiSh, a, m, Vsh, Rsh, Temp)
@@ -227,22 +240,27 @@ def juhasz(Rw, Rt, PhiT, PhiSh, a, m, Vsh, Rsh, Temp):
          - a - tortuosity saturation
          - m - cementation exponent
          - Rw - formation water resistivity ohm.m
-         - Bn - "normalized" cation mobility (mho cm2 / meq) 
-         - Qvn - "normalized Qv (ranges from 0-clean sands to 1-shales) (meq/gm)
-         - Temp - Formation temperature in Celsius
+         - Vsh - volume of shale
+         - Rsh - shale resistivity ohm.m
+         - Temp - formation temperature in Celsius (not used, kept for compatibility;
+           Bn is taken from the shale point)
+         - Bn - "normalized" cation conductance: Cwsh - Cw, with the apparent shale
+           water conductivity Cwsh = Fsh / Rsh
+         - Qvn - "normalized Qv (ranges from 0-clean sands to 1-shales)
         *Returns:
-         - SwT - total water saturation
+         - SwT - total water saturation, root of Sw**2 / (F*Rw) + Sw * Bn*Qvn / F = 1 / Rt
         '''
-        Bn = (-1.28+0.255*Temp - 4.059 * 10**(-4) * Temp**(-2))/(1 + Rw**1.23*(0.045*Temp-0.27)) #Thomas relation
-        Qvn = Vsh * PhiSh / PhiT       
-        F = a / Phi ** m
+        F = a / PhiT ** m
         Fsh = a / PhiSh ** m
+        Bn = Fsh / Rsh - 1 / Rw
+        Qvn = Vsh * PhiSh / PhiT
         term1 = 1 / (F * Rw)
-        term2 = (1 /(Fsh * Rsh) - 1 / Rw) * Vsh * Phish / PhiT
+        term2 = Bn * Qvn / F
         term3 = (-1) / Rt
-        swT = ((-1)* term2 + (term2 ** 2 - 4*term1*term2)**(1/2)) / 2 * term1 #solve of quadratic eq for positive delta
+        swT = ((-1)* term2 + (term2 ** 2 - 4*term1*term3)**(1/2)) / (2 * term1) #solve of quadratic eq for positive delta
         return swT
 
+@transform
 def dualwater(Rw, Rt, PhiT, PhiTSh, Vsh, Rsh):
         '''
         dualwater(Rw, Rt, PhiT, PhiTSh, Vsh, Rsh)
@@ -259,15 +277,16 @@ def dualwater(Rw, Rt, PhiT, PhiTSh, Vsh, Rsh):
          *Returns:
          - sw - efective water saturation (or water saturation in effective pore space)
         '''
-        Sb = Vsh * PhiTsh / PhiT
-        Rb = Rsh * PhiTsh**2
+        Sb = Vsh * PhiTSh / PhiT
+        Rb = Rsh * PhiTSh**2
         term1 = 1
         term2 = (-1)*Sb*(1-Rw/Rb)
         term3 = (-1)*Rw / (Rt*PhiT**2)
-        swT = ((-1)* term2 + (term2 ** 2 - 4*term1*term2)**(1/2)) / 2 * term1 #solve of quadratic eq for positive delta
+        swT = ((-1)* term2 + (term2 ** 2 - 4*term1*term3)**(1/2)) / (2 * term1) #solve of quadratic eq for positive delta
         sw = (swT - Sb) / (1 - Sb)
         return sw
         
+@transform
 def archiet(Rw, Rt, PhiT, a, m, n):
         '''
         archiet(Rw, Rt, PhiT, a, m, n)
@@ -286,6 +305,7 @@ def archiet(Rw, Rt, PhiT, a, m, n):
         archieT = (F * Rw/Rt)**n
         return archieT
 
+@transform
 def ratio(Rw, Rt, Rmf, Rxo):
         '''
         ratio(rw, rt, rmf, rxo)
@@ -299,3 +319,29 @@ def ratio(Rw, Rt, Rmf, Rxo):
         '''
         swRatio = ((Rxo/Rt) / (Rmf/Rw)) ** (5/8)
         return swRatio
+
+# Final steps of the models from their terms, shared with saturation.models.evaluate
+# which passes terms computed once for several models.
+
+def _archie(F, Rw, Rt, n):
+        '''archie from the formation factor F'''
+        return (F * Rw/Rt)**n
+
+def _quadratic(term1, term2, term3):
+        '''simandoux / modified_simandoux: positive root of term1*Sw**2 + term2*Sw + term3 = 0'''
+        delta = (term2**2 - 4*term1*term3)**(1/2)
+        return ((-1)*term2 + delta) / (2*term1)
+
+def _schlumberger(Rw, Rt, Phi2, VshRsh, Clean):
+        '''schlumberger from Phi**2, Vsh/Rsh and 1-Vsh'''
+        term1= np.sqrt(VshRsh**2 + Phi2/(0.2*Rw*Rt*Clean))-VshRsh
+        term2= Phi2 /(0.4*Rw*Clean)
+        return term1 / term2
+
+def _poupon(term1, term2, n):
+        '''poupon from 1/Rt - Vsh/Rsh and a*Rw*(1-Vsh)/Phi**m'''
+        return (term1 * term2)**(1/n)
+
+def _indonesian(term1, term2, term3, n):
+        '''indonesian / modified_indonesian from 1/Rt**(1/2), (Phi**m/(a*Rw))**(1/2) and the shale term'''
+        return (term1 / (term2 + term3))**(2/n)
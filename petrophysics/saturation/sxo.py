@@ -1,55 +1,69 @@
 from . import sw
+from ..compute.transform import transform
 
 # Water Saturation of invaded zone
 # it uses formulas from sw module
 # by replacing the Rmf with Rw, Rxo with Rt
+# out= receives Sxo
 
+@transform
 def archie(Rmf, Rxo, Phi, a, m, n):
         archie = sw.archie(Rmf, Rxo, Phi, a, m, n)
         return archie
     
+@transform
 def simandoux(Rmf, Rxo, Phi, Rsh, Vsh, a, m):
         simandoux = sw.simandoux(Rmf, Rxo, Phi, Rsh, Vsh, a, m)
         return simandoux
 
+@transform
 def modified_simandoux(Rmf, Rxo, Phi, Rsh, Vsh, a, m):
         modified_simandoux = sw.modified_simandoux(Rmf, Rxo, Phi, Rsh, Vsh, a, m)
         return modified_simandoux
 
+@transform
 def schlumberger(Rmf, Rxo, Phi, Rsh, Vsh):
         schlumberger = sw.schlumberger(Rmf, Rxo, Phi, Rsh, Vsh)
         return schlumberger
 
+@transform
 def fertl(Rmf, Rxo, Phi, Rsh, Vsh, a):
         fertl= sw.fertl(Rmf, Rxo, Phi, Rsh, Vsh, a)
-        return sw_fertl
+        return fertl
 
+@transform
 def poupon(Rmf, Rxo, Phi, Rsh, Vsh, a, m, n):
         poupon = sw.poupon(Rmf, Rxo, Phi, Rsh, Vsh, a, m, n)
         return poupon
 
+@transform
 def indonesian(Rmf, Rxo, Phi, Rsh, Vsh, a, m, n):
         indonesian = sw.indonesian(Rmf, Rxo, Phi, Rsh, Vsh, a, m, n)
         return indonesian        
         
+@transform
 def modified_indonesian(Rmf, Rxo, Phi, Rsh, Vsh, a, m, n):
         modified_indonesian = sw.modified_indonesian(Rmf, Rxo, Phi, Rsh, Vsh, a, m, n)
         return modified_indonesian
 
-def waxmansmith(Rmf, Rxo, PhiT, aa, mm, CEC):
-        waxmansmith = sw.waxmansmith(Rmf, Rxo, PhiT, aa, mm, CEC)
+@transform
+def waxmansmith(Rmf, Rxo, PhiT, aa, mm, CEC, den_ma=2.65):
+        waxmansmith = sw.waxmansmith(Rmf, Rxo, PhiT, aa, mm, CEC, den_ma)
         return waxmansmith
 
 
+@transform
 def juhasz(Rmf, Rxo, PhiT, PhiSh, a, m, Vsh, Rsh, Temp):
         juhasz = sw.juhasz(Rmf, Rxo, PhiT, PhiSh, a, m, Vsh, Rsh, Temp)
         return juhasz
 
 
+@transform
 def dualwater(Rmf, Rxo, PhiT, PhiTSh, Vsh, Rsh):
         dualwater = sw.dualwater(Rmf, Rxo, PhiT, PhiTSh, Vsh, Rsh)
         return dualwater
 
+@transform
 def archiet(Rmf, Rxo, PhiT, a, m, n):
-        archiet = sw. archiet(Rmf, Rxo, PhiT, a, m, n)
+        archiet = sw.archiet(Rmf, Rxo, PhiT, a, m, n)
         return archiet
@@ -1,8 +1,12 @@
-from .temperature import tf, gradient, horner
+from .temperature import tf, gradient, horner, horner_batch
+from .model import GradientModel, fit_gradient
 
 __all__ = ['tf',
            'gradient',
            'horner',
+           'horner_batch',
+           'GradientModel',
+           'fit_gradient',
            ]
 
 
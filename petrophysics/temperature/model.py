@@ -0,0 +1,110 @@
+'''
+Piecewise (multi-layer) geothermal gradient models:
+GradientModel - continuous temperature-depth profile, linear within layers,
+                evaluated at every log sample with np.searchsorted
+fit_gradient - least-squares fit of a GradientModel to (Horner corrected) BHTs
+
+A model with no breakpoint is the single gradient of tf and gradient. The
+temperature curve of a model feeds resistivity.arp / arp_profiles,
+salinity.salinity and saturation.sw.juhasz (Temp) sample by sample.
+'''
+import numpy as np
+
+from ..compute.precision import asfloat
+
+class GradientModel(object):
+    '''
+    GradientModel(t0, gradients, breakpoints=())
+    *Input parameters:
+    - t0 - temperature of the first layer extended to depth 0 (surface temperature)
+    - gradients - gradient of every layer, from the top [C/m] or [F/ft]
+    - breakpoints - increasing depths of the layer boundaries (one less than gradients)
+    *Attributes:
+    - rms, residuals - fit residuals, for models returned by fit_gradient
+    *Exemple:
+    model = GradientModel(15, [0.025, 0.035, 0.028], [1200, 2100])
+    temp = model(las.depth)
+    '''
+    def __init__(self, t0, gradients, breakpoints=()):
+        self.t0 = float(t0)
+        self.gradients = np.atleast_1d(np.asarray(gradients, dtype=np.float64))
+        self.breakpoints = np.atleast_1d(np.asarray(breakpoints, dtype=np.float64))
+        if len(self.gradients) != len(self.breakpoints) + 1:
+            raise ValueError('%d gradients for %d breakpoints, expected one more gradient than breakpoints'
+                             % (len(self.gradients), len(self.breakpoints)))
+        if np.any(np.diff(self.breakpoints) <= 0):
+            raise ValueError('breakpoints must be increasing')
+        # temperature at depth 0 of the line of every layer, for continuity at the breakpoints
+        self.offsets = self.t0 + np.concatenate([[0], np.cumsum(-np.diff(self.gradients) * self.breakpoints)])
+        self.rms = None
+        self.residuals = None
+
+    def __repr__(self):
+        return 'GradientModel(t0=%g, gradients=%s, breakpoints=%s)' % (
+            self.t0, self.gradients.tolist(), self.breakpoints.tolist())
+
+    def __call__(self, depth):
+        '''
+        model(depth)
+        Returns the temperature at depth (scalar or curve), in the working precision
+        '''
+        depth = np.asarray(depth, dtype=np.float64)
+        layer = np.searchsorted(self.breakpoints, depth, 'right')
+        temperature = np.asarray(self.offsets[layer])
+        temperature += self.gradients[layer] * depth
+        return asfloat(temperature)[()]
+
+    def gradient(self, depth):
+        '''
+        gradient(depth)
+        Returns the gradient of the layer of every depth
+        '''
+        return self.gradients[np.searchsorted(self.breakpoints, depth, 'right')][()]
+
+def fit_gradient(depth, temperature, breakpoints=(), t0=None, weights=None):
+    '''
+    fit_gradient(depth, temperature, breakpoints=(), t0=None, weights=None)
+    Fits a continuous piecewise linear temperature profile (hinge least squares:
+    temperature = t0 + g*depth + sum of d_j*max(depth - breakpoint_j, 0)).
+    *Input parameters:
+    - depth - depths of the temperature stations
+    - temperature - formation temperatures (e.g. horner_batch(...)['temperature'])
+    - breakpoints - increasing depths of the layer boundaries (e.g. formation tops)
+    - t0 - surface temperature; given, the profile passes through it at depth 0,
+      else it is fitted too
+    - weights - weight of every station (e.g. 1/rms**2 of the Horner fits)
+    *Returns:
+    - GradientModel (with rms and residuals); a layer without stations keeps the
+      gradient of the layer above it
+    *Exemple:
+    fit = horner_batch(circulation_times, times, temps)
+    model = fit_gradient(station_depths, fit['temperature'], breakpoints=[1200, 2100], t0=15)
+    temp = model(las.depth)
+    '''
+    depth = np.asarray(depth, dtype=np.float64)
+    temperature = np.asarray(temperature, dtype=np.float64)
+    breakpoints = np.atleast_1d(np.asarray(breakpoints, dtype=np.float64))
+    use = np.isfinite(depth) & np.isfinite(temperature)
+    if weights is not None:
+        weights = np.broadcast_to(np.asarray(weights, dtype=np.float64), depth.shape)
+        use &= np.isfinite(weights) & (weights > 0)
+    z = depth[use]
+    y = temperature[use]
+    columns = [z] + [np.maximum(z - breakpoint, 0) for breakpoint in breakpoints]
+    if t0 is None:
+        columns.insert(0, np.ones(len(z)))
+    else:
+        y = y - t0
+    design = np.column_stack(columns)
+    if weights is not None:
+        scale = np.sqrt(weights[use])
+        coefficients = np.linalg.lstsq(design * scale[:, np.newaxis], y * scale, rcond=None)[0]
+    else:
+        coefficients = np.linalg.lstsq(design, y, rcond=None)[0]
+    if t0 is None:
+        t0, coefficients = coefficients[0], coefficients[1:]
+    model = GradientModel(t0, np.cumsum(coefficients), breakpoints)
+    model.residuals = np.full(depth.shape, np.nan)
+    model.residuals[use] = temperature[use] - np.asarray(model(z), dtype=np.float64)
+    model.rms = float(np.sqrt(np.mean(model.residuals[use] ** 2))) if use.any() else np.nan
+    return model
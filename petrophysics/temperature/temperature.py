@@ -6,6 +6,7 @@ List of functions:
 tf - formation temperature
 gradient -
 horner -
+horner_batch - Horner formation temperatures of many BHT stations in one pass
 '''
 
 def tf(t0, gradient, depth):
@@ -55,3 +56,65 @@ def horner(circulation_time, times, temp):
     slope,intercept = np.polyfit (np.log(horner_time), temp, 1)
     horner_temp=round(slope*np.log(1) +intercept,2)
     return horner_temp
+
+def horner_batch(circulation_time, times, temps, counts=None):
+    '''
+    horner_batch(circulation_time, times, temps, counts=None)
+    Horner correction of many BHT stations (depths of many wells) at once: the
+    least-squares lines temp = slope*log(t/(circulation_time + t)) + intercept of all
+    stations are solved with closed-form per-station sums (np.add.reduceat).
+    *Input parameters:
+    - circulation_time - hours of circulation before the runs, scalar or one per station
+    - times - total time since circulation stopped at every run: a list of sequences
+      (one per station) or, with counts, a flat array of the runs of all stations
+    - temps - the temperatures recorded at these runs, same layout as times
+    - counts - number of runs of every station, when times and temps are flat arrays
+    *Returns:
+    - dict of per-station arrays:
+      'temperature' - formation temperature (the intercept, Horner time ratio 1),
+      as horner() without its rounding to 2 decimals
+      'slope' - slope of the Horner line
+      'r2' - coefficient of determination of the fit
+      'rms' - root mean square temperature residual
+      'runs' - number of runs
+    Stations with less than 2 runs (or all runs at the same time) get NaN.
+    *Exemple:
+    fit = horner_batch([6, 5.5], [(7.0, 11.5, 19.5), (6.0, 12.0)], [(100, 105, 108), (88, 93)])
+    fit['temperature']
+    '''
+    if counts is None:
+        counts = [len(station) for station in times]
+        times = np.concatenate([np.asarray(station, dtype=float) for station in times]) if counts else np.empty(0)
+        temps = np.concatenate([np.asarray(station, dtype=float) for station in temps]) if counts else np.empty(0)
+    counts = np.asarray(counts, dtype=np.intp)
+    times = np.asarray(times, dtype=float)
+    temps = np.asarray(temps, dtype=float)
+    if counts.sum() != len(times) or len(times) != len(temps):
+        raise ValueError('%d runs in counts, %d times and %d temperatures' % (counts.sum(), len(times), len(temps)))
+    station = np.repeat(np.arange(len(counts)), counts)
+    circulation_time = np.broadcast_to(np.asarray(circulation_time, dtype=float), counts.shape)[station]
+    x = np.log(times / (circulation_time + times))
+
+    # centred sums (two passes) keep the fit accurate for nearly equal Horner times
+    starts = np.cumsum(counts) - counts
+    occupied = counts > 0
+    def total(values):
+        sums = np.zeros(len(counts))
+        sums[occupied] = np.add.reduceat(values, starts[occupied])
+        return sums
+    with np.errstate(invalid='ignore', divide='ignore'):
+        x_mean = total(x) / counts
+        y_mean = total(temps) / counts
+        dx = x - x_mean[station]
+        dy = temps - y_mean[station]
+        sxx = total(dx * dx)
+        sxy = total(dx * dy)
+        syy = total(dy * dy)
+        slope = sxy / sxx
+        slope[(counts < 2) | (sxx == 0)] = np.nan
+        intercept = y_mean - slope * x_mean
+        residuals = total((dy - slope[station] * dx) ** 2)
+        r2 = 1 - residuals / syy
+        rms = np.sqrt(residuals / counts)
+    rms[np.isnan(slope)] = np.nan
+    return {'temperature': intercept, 'slope': slope, 'r2': r2, 'rms': rms, 'runs': counts}
@@ -0,0 +1,4 @@
+from .well import Well
+
+__all__ = ['Well'
+           ]
@@ -0,0 +1,200 @@
+'''
+Depth indexed well container:
+Well - curves and parameters of one well, keyed by mnemonic, with derived
+       curves (Vsh, PHIE, Sw, K ...) declared once and computed on demand
+
+A derived curve is computed the first time it is read and kept; it is computed
+again only when a curve or parameter it depends on (directly or through other
+derived curves) has been assigned since, so changing Rw recomputes Sw and K
+but not Vsh or PHIE.
+'''
+import numpy as np
+
+from ..compute.precision import asfloat
+from ..pipeline.pipeline import _arguments, _parse_step
+
+class Well(object):
+    '''
+    Well(depth, curves=None, name=None, **params)
+    *Input parameters:
+    - depth - depth index (float64)
+    - curves - dict of mnemonic -> array of the length of depth (GR, RHOB, RT ...)
+    - name - well name
+    - params - parameters (gr_clean, Rw, a, m, n ...); scalars or, for zoned
+      parameters, arrays of the length of depth
+    Curves and parameters share one namespace: well['RT'] = rt, well['Rw'] = 0.05.
+    Derived curves are declared with derive() using the bindings of pipeline steps.
+    An array modified in place must be assigned again for the change to be seen.
+    *Exemple:
+    well = Well(las.depth, las.curves, name='A-1', gr_clean=20, gr_clay=120,
+                den_ma=2.65, den_fl=1.0, Rw=0.05, Rsh=4, a=1, m=2, n=2)
+    well.derive('vsh', clayvolume.vclgr, {'gr_log': 'GR'})
+    well.derive('phie', porosity.density, {'den': 'RHOB', 'vcl': 'vsh'})
+    well.derive('sw', saturation.sw.indonesian, {'Rt': 'RT', 'Phi': 'phie', 'Vsh': 'vsh'})
+    well.derive('k', permeability.timur, {'phi': 'phie', 'swirr': 'sw'})
+    k = well['k']          # computes vsh, phie, sw and k
+    well['Rw'] = 0.04
+    k = well['k']          # computes sw and k again only
+    '''
+    def __init__(self, depth, curves=None, name=None, **params):
+        self.name = name
+        self.depth = np.asarray(depth, dtype=np.float64)
+        self._values = {}
+        self._stamps = {}
+        self._clock = 0
+        self._steps = {}
+        self._seen = {}
+        self._visiting = set()
+        self.update(curves or {})
+        self.update(params)
+
+    @classmethod
+    def from_las(cls, las, name=None, **params):
+        '''
+        Well.from_las(las, name=None, **params)
+        Returns a Well holding the curves of a LasFile (io.read_las), indexed by its first curve
+        '''
+        index = las.mnemonics[0]
+        curves = dict((mnemonic, curve) for mnemonic, curve in las.curves.items() if mnemonic != index)
+        return cls(las.depth, curves, name, **params)
+
+    def __len__(self):
+        return len(self.depth)
+
+    def __repr__(self):
+        return 'Well(%s, %d samples, inputs: %s, derived: %s)' % (
+            self.name, len(self), ', '.join(sorted(self._stamps.keys() - self._steps.keys())),
+            ', '.join(sorted(self._steps)))
+
+    def __contains__(self, name):
+        return name in self._steps or name in self._values
+
+    def __getitem__(self, name):
+        if name in self._steps:
+            self._evaluate(self._steps[name])
+        elif name not in self._values:
+            raise KeyError('well %s has no curve or parameter "%s"' % (self.name, name))
+        return self._values[name]
+
+    def __setitem__(self, name, value):
+        if name in self._steps:
+            raise ValueError('"%s" is a derived curve, it cannot be assigned' % name)
+        value = asfloat(np.asarray(value) if isinstance(value, (list, tuple)) else value)
+        if np.ndim(value) and len(value) != len(self.depth):
+            raise ValueError('"%s" has %d samples, the depth index has %d' % (name, len(value), len(self.depth)))
+        self._values[name] = value
+        self._stamp(name)
+
+    def __delitem__(self, name):
+        if name in self._steps:
+            step = self._steps[name]
+            for output in step[0]:
+                del self._steps[output]
+                self._values.pop(output, None)
+                self._stamps.pop(output, None)
+            self._seen.pop(step[0], None)
+        else:
+            del self._values[name]
+            del self._stamps[name]
+
+    def update(self, values):
+        '''
+        update(values)
+        Assigns several curves or parameters (a dict) at once
+        '''
+        for name, value in values.items():
+            self[name] = value
+
+    @property
+    def names(self):
+        '''names of the curves, parameters and derived curves'''
+        return sorted(set(self._values) | set(self._steps))
+
+    def derive(self, output, func, bindings=None):
+        '''
+        derive(output, func, bindings=None)
+        *Input parameters:
+        - output - name of the derived curve (a tuple of names for functions returning tuples)
+        - func - function computing it
+        - bindings - dict mapping a function argument to the name of a curve, parameter
+          or derived curve (str) or to a constant value (see pipeline.Pipeline)
+        Declaring an output again replaces its definition.
+        '''
+        step = _parse_step((output, func, bindings or {}))
+        for name in step[0]:
+            if name in self._values and name not in self._steps:
+                raise ValueError('"%s" is an input of well %s, it cannot be derived' % (name, self.name))
+            if name in self._steps and self._steps[name][0] != step[0]:
+                raise ValueError('"%s" is already produced with %s' % (name, ', '.join(self._steps[name][0])))
+            if name in self._steps:
+                del self[name]
+        for name in step[0]:
+            self._steps[name] = step
+
+    def add_pipeline(self, pipeline):
+        '''
+        add_pipeline(pipeline)
+        Declares every step of a pipeline.Pipeline as a derived curve
+        '''
+        for outputs, func, args in pipeline.steps:
+            self.derive(outputs if len(outputs) > 1 else outputs[0], func,
+                        dict((arg, source) for arg, source, has_default in args if source != arg))
+
+    def is_current(self, name):
+        '''
+        is_current(name)
+        True when name is an input, or a derived curve that would not be computed again on access
+        '''
+        if name not in self._steps:
+            return name in self._values
+        outputs, func, args = self._steps[name]
+        sources = self._sources(args)
+        if not all(self.is_current(source) for source in sources):
+            return False
+        return self._seen.get(outputs) == dict((source, self._stamps[source]) for source in sources)
+
+    def invalidate(self):
+        '''drops the derived curves; they are computed again on their next access'''
+        for name in self._steps:
+            self._values.pop(name, None)
+            self._stamps.pop(name, None)
+        self._seen.clear()
+
+    def to_dict(self, names=None):
+        '''
+        to_dict(names=None)
+        Returns a dict of name -> value for names (default all curves, parameters
+        and derived curves), computing the derived curves that are out of date
+        '''
+        return dict((name, self[name]) for name in (self.names if names is None else names))
+
+    def _stamp(self, name):
+        self._clock += 1
+        self._stamps[name] = self._clock
+
+    def _sources(self, args):
+        '''names a step reads from the well (arguments with a default absent from the well are skipped)'''
+        return [source for arg, source, has_default in args if isinstance(source, str) and source in self]
+
+    def _evaluate(self, step):
+        '''brings the outputs of step up to date, evaluating the steps it depends on first'''
+        outputs, func, args = step
+        if outputs in self._visiting:
+            raise ValueError('circular dependency at %s' % func.__name__)
+        self._visiting.add(outputs)
+        try:
+            sources = self._sources(args)
+            for source in sources:
+                if source in self._steps:
+                    self._evaluate(self._steps[source])
+        finally:
+            self._visiting.discard(outputs)
+        seen = dict((source, self._stamps[source]) for source in sources)
+        if self._seen.get(outputs) == seen:
+            return
+        value = func(**_arguments(func, args, self._values))
+        values = (value,) if len(outputs) == 1 else tuple(value)
+        for name, value in zip(outputs, values):
+            self._values[name] = value
+            self._stamp(name)
+        self._seen[outputs] = seen
@@ -7,19 +7,24 @@ setup(
     author_email='m_iorgandopol@yahoo.com',
     packages = ['petrophysics',
                 'petrophysics.clayvolume',
+                'petrophysics.compute',
                 'petrophysics.conversions',
+                'petrophysics.io',
                 'petrophysics.lithology',
                 'petrophysics.permeability',
+                'petrophysics.pipeline',
                 'petrophysics.porosity',
                 'petrophysics.reserves',
                 'petrophysics.resistivity',
                 'petrophysics.rockphysics',
                 'petrophysics.salinity',
                 'petrophysics.saturation',
-                'petrophysics.temperature'],
+                'petrophysics.temperature',
+                'petrophysics.well'],
     url='http://pypi.python.org/pypi/petrophysics/',
     license = ['MIT'],
     description = 'A package containing useful functions for well log interpretation',
     long_description=open('README.rst').read(),
     install_requires = ['numpy'],
+    extras_require = {'fast': ['numexpr']},
 )
@@ -0,0 +1,35 @@
+'''
+rockphysics.elastic moduli on a known rock and elastic_moduli against the single functions.
+'''
+import numpy as np
+from numpy.testing import assert_allclose, assert_array_equal
+
+from petrophysics.rockphysics import elastic
+
+DEN, VP, VS = 2650.0, 6000.0, 4000.0              # quartz-like, kg/m3 and m/s
+
+def test_moduli_identities():
+    g = elastic.shear_modulus(DEN, VS)
+    k = elastic.bulk_modulus(DEN, VP, VS)
+    assert_allclose(g, DEN * VS**2 / 1e9)
+    assert_allclose(k, DEN * (VP**2 - 4 / 3 * VS**2) / 1e9)
+    assert_allclose(elastic.pwave_modulus(DEN, VP), k + 4 / 3 * g)
+    assert_allclose(elastic.young_modulus(DEN, VP, VS), 9 * k * g / (3 * k + g))
+    assert_allclose(elastic.poisson(DEN, VP, VS), (3 * k - 2 * g) / (2 * (3 * k + g)))
+    assert_allclose(elastic.poisson(DEN, VP, VP / np.sqrt(3)), 0.25)      # vp/vs = sqrt(3)
+
+def test_elastic_moduli_fields():
+    rng = np.random.default_rng(0)
+    den = rng.uniform(2000, 2800, 40000)
+    vp = rng.uniform(2500, 6000, 40000)
+    vs = vp / rng.uniform(1.5, 2.2, 40000)
+    moduli = elastic.elastic_moduli(den, vp, vs)
+    for name in ('pwave_modulus', 'bulk_modulus', 'lame1st', 'young_modulus', 'poisson'):
+        func = getattr(elastic, name)
+        expected = func(den, vp) if name == 'pwave_modulus' else func(den, vp, vs)
+        assert_array_equal(moduli[name], expected, err_msg=name)
+    assert_array_equal(moduli['shear_modulus'], elastic.shear_modulus(den, vs))
+    out = dict((name, np.empty(len(den))) for name in elastic.MODULI)
+    assert elastic.elastic_moduli(den, vp, vs, out=out) is out
+    for name in elastic.MODULI:
+        assert_array_equal(out[name], moduli[name], err_msg=name)
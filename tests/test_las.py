@@ -0,0 +1,58 @@
+'''
+io.read_las and io.iter_las on small LAS files.
+'''
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from petrophysics.io.las import iter_las, read_las
+
+HEADER = '''~VERSION INFORMATION
+VERS.   2.0 :
+WRAP.   %s :
+~WELL INFORMATION
+NULL.   -999.25 :
+~CURVE INFORMATION
+DEPT.M     :
+GR.API     :
+RHOB.G/CC  :
+~A
+'''
+
+def write(tmp_path, data, wrap='NO'):
+    path = tmp_path / 'well.las'
+    path.write_text(HEADER % wrap + data)
+    return str(path)
+
+def test_read_las(tmp_path):
+    path = write(tmp_path, '1000.0 50 2.30\n# comment\n1000.5 -999.25 2.40\n\n1001.0 70 2.50\n')
+    las = read_las(path)
+    assert las.mnemonics == ['DEPT', 'GR', 'RHOB']
+    assert_array_equal(las.depth, [1000.0, 1000.5, 1001.0])
+    assert_array_equal(las['GR'], [50, np.nan, 70])
+    assert_array_equal(las['RHOB'], [2.3, 2.4, 2.5])
+
+def test_selection_and_depth_range(tmp_path):
+    path = write(tmp_path, '1000.0 50 2.30\n1000.5 60 2.40\n1001.0 70 2.50\n')
+    las = read_las(path, curves=['RHOB'], top=1000.5, base=1001.0)
+    assert sorted(las.curves) == ['DEPT', 'RHOB']
+    assert_array_equal(las['RHOB'], [2.4, 2.5])
+
+def test_wrapped_file(tmp_path):
+    path = write(tmp_path, '1000.0\n50 2.30\n1000.5\n60 2.40\n', wrap='YES')
+    assert_array_equal(read_las(path)['GR'], [50, 60])
+
+def test_chunks_match_read_las(tmp_path):
+    depth = np.arange(1000, 1010, 0.5)
+    lines = ''.join('%g %g %g\n' % (d, i, 2 + i / 100) for i, d in enumerate(depth))
+    path = write(tmp_path, lines)
+    chunks = list(iter_las(path, chunk_size=6))
+    assert [len(chunk['DEPT']) for chunk in chunks] == [6, 6, 6, 2]
+    las = read_las(path)
+    for name in las.mnemonics:
+        assert_array_equal(np.concatenate([chunk[name] for chunk in chunks]), las[name])
+
+def test_unreadable_value(tmp_path):
+    path = write(tmp_path, '1000.0 50 2.30\n1000.5 x 2.40\n')
+    with pytest.raises(ValueError):
+        read_las(path)
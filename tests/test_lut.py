@@ -0,0 +1,22 @@
+'''
+Lookup tables: reported accuracy and range handling.
+'''
+import numpy as np
+from numpy.testing import assert_allclose
+
+from petrophysics.permeability import permeability
+
+def test_lucia_table_accuracy():
+    table = permeability.lucia_table(0.02, 0.15)
+    phie = np.random.default_rng(0).uniform(table.low, table.high, 100000)
+    exact = permeability.lucia(phie, 0.02, 0.15)
+    # the error measured at build time bounds the observed one
+    assert np.max(np.abs(table(phie) / exact - 1)) <= table.max_rel_error * (1 + 1e-9)
+    assert table.max_rel_error < 2e-3
+    assert_allclose(table(table.grid), table.values)
+
+def test_lucia_table_outside_range():
+    table = permeability.lucia_table(0.02, 0.15)
+    assert np.all(np.isnan(table(np.array([0.01, np.nan, 0.6]))))
+    assert np.isnan(table(0.6))
+    assert_allclose(table(0.2), permeability.lucia(0.2, 0.02, 0.15), rtol=1e-3)
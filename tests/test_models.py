@@ -0,0 +1,25 @@
+'''
+saturation.models.evaluate against the sw functions it shares intermediates for.
+'''
+import inspect
+
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from petrophysics.compute import check_kernels
+from petrophysics.saturation import models, sw
+
+def test_evaluate_matches_sw():
+    rng = np.random.default_rng(0)
+    curves = dict(Rw=0.05, Rt=rng.uniform(2, 50, 1000), Phi=rng.uniform(0.05, 0.3, 1000),
+                  Rsh=4.0, Vsh=rng.uniform(0, 0.4, 1000))
+    curves.update(a=1, m=2, n=2)
+    with np.errstate(invalid='ignore'):      # poupon is NaN where Vsh/Rsh > 1/Rt
+        results = models.evaluate(None, **curves)
+        for model in models.MODELS:
+            func = getattr(sw, model)
+            args = dict((name, curves[name]) for name in inspect.signature(func).parameters)
+            assert_array_equal(results[model], func(**args), err_msg=model)
+
+def test_kernels_match_their_functions():
+    check_kernels()
@@ -0,0 +1,41 @@
+'''
+Pipeline runs and streaming against whole-curve evaluation.
+'''
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+
+from petrophysics.clayvolume import clayvolume
+from petrophysics.pipeline import Pipeline, chunks, collect, constant
+from petrophysics.porosity import porosity
+
+PARAMS = dict(gr_clean=20, gr_clay=120, den_ma=2.65, den_fl=1.0)
+rng = np.random.default_rng(0)
+GR = rng.uniform(20, 120, 1000)
+RHOB = rng.uniform(2.2, 2.6, 1000)
+
+def pipeline():
+    return Pipeline([('vsh', clayvolume.vclgr, {'gr_log': 'GR', 'correction': constant('young')}),
+                     ('phie', porosity.density, {'den': 'RHOB', 'vcl': 'vsh'})])
+
+def test_collect_pipeline_stream():
+    p = pipeline()
+    full = p.run({'GR': GR, 'RHOB': RHOB}, **PARAMS)
+    streamed = collect(p.stream({'GR': chunks(GR, 300), 'RHOB': chunks(RHOB, 300)}, **PARAMS))
+    assert sorted(streamed) == ['phie', 'vsh']
+    for name in streamed:
+        assert_array_equal(streamed[name], full[name])
+
+def test_unresolved_binding_raises():
+    p = Pipeline([('vsh', clayvolume.vclgr, {'gr_log': 'GR', 'correction': 'clavier'})])
+    with pytest.raises(KeyError):
+        p.run({'GR': GR}, **PARAMS)
+
+def test_unbound_default_is_kept():
+    p = Pipeline([('vsh', clayvolume.vclgr, {'gr_log': 'GR'})])
+    assert_array_equal(p.run({'GR': GR}, **PARAMS)['vsh'], clayvolume.vclgr(GR, 20, 120))
+
+def test_run_zero_length_curves():
+    result = pipeline().run({'GR': np.empty(0), 'RHOB': np.empty(0)}, **PARAMS)
+    assert result['vsh'].shape == (0,)
+    assert result['phie'].shape == (0,)
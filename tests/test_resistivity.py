@@ -0,0 +1,39 @@
+'''
+Rw from SP on curves, and the metric / field unit conversions of rwsp and rwsp1.
+'''
+import numpy as np
+from numpy.testing import assert_allclose
+
+from petrophysics.clayvolume import clayvolume
+from petrophysics.resistivity import arp, rwsp, rwsp1, ssp
+
+SP = np.array([-90.0, -60.0, -20.0, -5.0])
+RI = np.array([10.0, 3.0, 20.0, 1.0])
+TF = np.array([60.0, 70.0, 85.0, 95.0])          # Celsius
+BED = np.array([5.0, 20.0, 2.0, 30.0])           # m
+
+def fahrenheit(celsius):
+    return 9 / 5 * celsius + 32
+
+def test_arp_units():
+    assert_allclose(arp(0.32, 25, TF), arp(0.32, fahrenheit(25), fahrenheit(TF), celsius=False), rtol=1e-3)
+
+def test_rwsp_units():
+    metric = rwsp(SP, 0.9, 0.7, RI, 25, TF, BED)
+    field = rwsp(SP, 0.9, 0.7, RI, fahrenheit(25), fahrenheit(TF), BED * 3.28084, metric=False)
+    assert_allclose(metric, field, rtol=1e-12)
+
+def test_rwsp1_units():
+    metric = rwsp1(SP, 0.7, 25, TF)
+    field = rwsp1(SP, 0.7, fahrenheit(25), fahrenheit(TF), metric=False)
+    assert_allclose(metric, field, rtol=1e-12)
+
+def test_curves_match_samples():
+    # the branches are chosen sample by sample
+    for func, args in [(ssp, (SP, BED, 0.5, RI)),
+                       (rwsp, (SP, 0.9, 0.7, RI, 25, TF, BED)),
+                       (rwsp1, (SP, 0.7, 25, TF)),
+                       (clayvolume.vclr, (RI, 30.0, 2.0))]:
+        samples = [func(*[arg[i] if np.ndim(arg) else arg for arg in args]) for i in range(len(SP))]
+        assert np.ndim(samples[0]) == 0
+        assert_allclose(func(*args), samples, rtol=1e-12, err_msg=func.__name__)
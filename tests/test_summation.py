@@ -0,0 +1,30 @@
+'''
+reserves.summation on a hand-checked two-zone interval.
+'''
+import numpy as np
+from numpy.testing import assert_allclose
+
+from petrophysics.reserves import summation, volumetrics
+
+DEPTH = np.arange(1000.0, 1004.0, 0.5)             # 8 samples, 0.5 m thick
+PHI = np.array([0.20, 0.20, 0.05, 0.25, 0.10, 0.10, 0.10, 0.10])
+SW = np.array([0.30, 0.30, 0.30, 0.50, 0.90, 0.90, 0.90, 0.90])
+ZONES = [0, 4]
+
+def test_zone_sums():
+    sums = summation.summation(DEPTH, PHI, SW, zones=ZONES, phi_cut=0.08, sw_cut=0.6)
+    assert_allclose(sums['gross'], [2.0, 2.0])
+    assert_allclose(sums['net'], [1.5, 2.0])
+    assert_allclose(sums['pay'], [1.5, 0.0])
+    assert_allclose(sums['net_to_gross'], [0.75, 1.0])
+    hpv = 0.5 * (0.2 * 0.7 + 0.2 * 0.7 + 0.25 * 0.5)
+    assert_allclose(sums['hpv'], [hpv, 0])
+
+def test_zone_volumes():
+    sums = summation.summation(DEPTH, PHI, SW, zones=ZONES, phi_cut=0.08, sw_cut=0.6)
+    ogip = summation.zone_ogip(sums, 640, 0.005, metric=False)
+    assert_allclose(ogip, [43560 * 640 * sums['hpv'][0] / 0.005, 0])     # no NaN for the zone without pay
+    # sw_pay is pore volume weighted, so volumetrics.ooip of the pay averages gives the same volume
+    ooip = summation.zone_ooip(sums, 2e6, 1.2)
+    assert_allclose(ooip[0], volumetrics.ooip(2e6, sums['gross'][0], sums['sw_pay'][0], sums['phi_pay'][0],
+                                              sums['pay_to_gross'][0], 1.2))
@@ -0,0 +1,77 @@
+'''
+Water saturation models on synthetic formations of known saturation.
+'''
+import numpy as np
+from numpy.testing import assert_allclose
+
+from petrophysics.saturation import soil, sw, sxo
+
+RW = 0.05
+PHI = np.array([0.08, 0.15, 0.25])
+
+def clean_rt(saturation):
+    '''Rt of a clean sand (a=1, m=n=2) at the given water saturation'''
+    return RW / (PHI**2 * saturation**2)
+
+def test_water_sand():
+    rt = clean_rt(1.0)
+    assert_allclose(sw.waxmansmith(RW, rt, PHI, 1, 2, 0), 1)
+    assert_allclose(sw.juhasz(RW, rt, PHI, 0.1, 1, 2, 0, 4, 80), 1)
+    assert_allclose(sw.dualwater(RW, rt, PHI, 0.1, 0, 4), 1)
+    assert_allclose(sw.archie(RW, rt, PHI, 1, 2, 2), 1)
+    assert_allclose(sw.simandoux(RW, rt, PHI, 4, 0, 1, 2), 1)
+    assert_allclose(sw.modified_simandoux(RW, rt, PHI, 4, 0, 1, 2), 1)
+
+def test_clean_sand_half_saturated():
+    rt = clean_rt(0.5)
+    assert_allclose(sw.waxmansmith(RW, rt, PHI, 1, 2, 0), 0.5)
+    assert_allclose(sw.juhasz(RW, rt, PHI, 0.1, 1, 2, 0, 4, 80), 0.5)
+    assert_allclose(sw.dualwater(RW, rt, PHI, 0.1, 0, 4), 0.5)
+    assert_allclose(sw.simandoux(RW, rt, PHI, 4, 0, 1, 2), 0.5)
+
+def test_shaly_sand_roots():
+    # the returned saturations satisfy the n=2 conductivity equations of the models
+    rt, vsh, phish, rsh = 8.0, 0.3, 0.12, 3.0
+    swt = sw.juhasz(RW, rt, PHI, phish, 1, 2, vsh, rsh, 80)
+    F, Fsh = 1 / PHI**2, 1 / phish**2
+    bn_qvn = (Fsh / rsh - 1 / RW) * vsh * phish / PHI
+    assert_allclose(swt**2 / (F * RW) + swt * bn_qvn / F, 1 / rt)
+
+    sb = vsh * phish / PHI
+    rb = rsh * phish**2
+    swe = sw.dualwater(RW, rt, PHI, phish, vsh, rsh)
+    swt = swe * (1 - sb) + sb
+    assert_allclose(PHI**2 * (swt**2 / RW + swt * sb * (1 / rb - 1 / RW)), 1 / rt)
+
+    cec, den_ma = 2.0, 2.65
+    swt = sw.waxmansmith(RW, rt, PHI, 1, 2, cec, den_ma)
+    b = 4.6 * (1 - 0.6 * np.exp(-0.77 / RW))
+    qv = cec * (1 - PHI) * den_ma / (100 * PHI)
+    assert_allclose(PHI**2 * swt**2 * (1 / RW + b * qv / swt), 1 / rt)
+
+    swt = sw.simandoux(RW, rt, PHI, rsh, vsh, 1, 2)
+    assert_allclose(PHI**2 * swt**2 / RW + swt * vsh / rsh, 1 / rt)
+    swt = sw.modified_simandoux(RW, rt, PHI, rsh, vsh, 1, 2)
+    assert_allclose(PHI**2 * swt**2 / (RW * (1 - vsh)) + swt * vsh / rsh, 1 / rt)
+
+def test_out_in_place():
+    rt = clean_rt(0.5)
+    out = rt.copy()
+    assert sw.dualwater(RW, out, PHI, 0.1, 0, 4, out=out) is out
+    assert_allclose(out, 0.5)
+
+def test_curves_match_samples():
+    # schlumberger, fertl and waxmansmith used math functions and took scalars only
+    rt, vsh = np.array([3.0, 10.0, 40.0]), np.array([0.0, 0.2, 0.4])
+    for func, args in [(sw.schlumberger, (RW, rt, PHI, 4, vsh)),
+                       (sw.fertl, (RW, rt, PHI, 4, vsh, 1)),
+                       (sw.waxmansmith, (RW, rt, PHI, 1, 2, vsh * 10)),
+                       (sxo.fertl, (0.5, rt, PHI, 4, vsh, 1))]:
+        samples = [func(*[arg[i] if np.ndim(arg) else arg for arg in args]) for i in range(len(rt))]
+        assert_allclose(func(*args), samples, rtol=1e-12, err_msg=func.__name__)
+
+def test_zoned_parameters():
+    rt = clean_rt(0.5)
+    rw = np.array([RW, RW, RW / 4])
+    assert_allclose(sw.dualwater(rw, rt, PHI, 0.1, 0, 4), [0.5, 0.5, 0.25])
+    assert_allclose(soil.dualwater(rw, rt, PHI, 0.1, 0, 4), [0.5, 0.5, 0.75])
@@ -0,0 +1,30 @@
+'''
+temperature.horner_batch against temperature.horner, station by station.
+'''
+import numpy as np
+from numpy.testing import assert_allclose
+
+from petrophysics.temperature import temperature
+
+def test_matches_horner():
+    rng = np.random.default_rng(0)
+    circulation = rng.uniform(3, 8, 50)
+    times = [np.sort(rng.uniform(4, 30, rng.integers(2, 6))) for _ in circulation]
+    temps = [90 + 10 * np.log1p(t) + rng.normal(0, 0.5, len(t)) for t in times]
+    fit = temperature.horner_batch(circulation, times, temps)
+    expected = [temperature.horner(c, t, y) for c, t, y in zip(circulation, times, temps)]
+    assert_allclose(fit['temperature'], expected, atol=0.005)       # horner rounds to 2 decimals
+    assert list(fit['runs']) == [len(t) for t in times]
+
+def test_flat_runs_and_degenerate_stations():
+    # counts layout; a single run and two runs at the same time cannot be fitted
+    fit = temperature.horner_batch(6, [7.0, 11.5, 19.5, 10.0, 5.0, 5.0], [100, 105, 108, 90, 80, 81],
+                                   counts=[3, 1, 2])
+    assert_allclose(fit['temperature'][0], temperature.horner(6, (7.0, 11.5, 19.5), (100, 105, 108)), atol=0.005)
+    assert np.isnan(fit['temperature'][1:]).all()
+    # an exact Horner line is recovered with r2 = 1
+    x = np.log(np.array([7.0, 11.5, 19.5]) / (6 + np.array([7.0, 11.5, 19.5])))
+    fit = temperature.horner_batch(6, [[7.0, 11.5, 19.5]], [120 + 15 * x])
+    assert_allclose(fit['temperature'], 120)
+    assert_allclose(fit['slope'], 15)
+    assert_allclose(fit['r2'], 1)
@@ -0,0 +1,43 @@
+'''
+out= of the curve transforms (compute.transform) against the allocating call.
+'''
+import numpy as np
+from numpy.testing import assert_array_equal
+
+from petrophysics.clayvolume import clayvolume
+from petrophysics.compute.transform import BLOCK_SIZE
+from petrophysics.porosity import porosity
+from petrophysics.saturation import sw
+
+SIZE = 3 * BLOCK_SIZE + 17
+rng = np.random.default_rng(0)
+GR = rng.uniform(10, 150, SIZE)
+RHOB = rng.uniform(2.2, 2.6, SIZE)
+RT = rng.uniform(1, 50, SIZE)
+
+def test_out_matches_allocating_call():
+    for correction in (None, 'young', 'older', 'clavier', 'steiber'):
+        out = np.empty(SIZE)
+        with np.errstate(invalid='ignore'):
+            assert_array_equal(clayvolume.vclgr(GR, 20, 120, correction, out=out),
+                               clayvolume.vclgr(GR, 20, 120, correction))
+    out = np.empty(SIZE)
+    assert_array_equal(porosity.density(RHOB, 2.65, 1.0, 0.2, 2.45, out=out),
+                       porosity.density(RHOB, 2.65, 1.0, 0.2, 2.45))
+
+def test_out_may_be_an_input():
+    phi = porosity.density(RHOB, 2.65, 1.0)
+    vsh = clayvolume.vclgr(GR, 20, 120)
+    with np.errstate(invalid='ignore'):
+        expected = sw.simandoux(0.05, RT, phi, 4, vsh, 1, 2)
+        rt = RT.copy()
+        assert sw.simandoux(0.05, rt, phi, 4, vsh, 1, 2, out=rt) is rt
+    assert_array_equal(rt, expected)
+
+def test_out_broadcast_parameters():
+    m = np.array([[1.8], [2.0], [2.2]])
+    phi = porosity.density(RHOB, 2.65, 1.0)
+    out = np.empty((3, SIZE))
+    with np.errstate(invalid='ignore'):
+        assert_array_equal(sw.indonesian(0.05, RT, phi, 4, 0.1, 1, m, 2, out=out),
+                           sw.indonesian(0.05, RT, phi, 4, 0.1, 1, m, 2))
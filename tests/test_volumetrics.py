@@ -0,0 +1,29 @@
+'''
+reserves.volumetrics in field units and the Monte Carlo volumes built on it.
+'''
+import pytest
+from numpy.testing import assert_allclose
+
+from petrophysics.reserves import montecarlo, volumetrics
+
+def test_field_units():
+    # 1 acre x 1 ft of rock, all pore space filled with hydrocarbon
+    assert volumetrics.ooip(1, 1, 0, 1, 1, 1, metric=False) == 7758      # bbl per acre-ft
+    assert volumetrics.ogip(1, 1, 0, 1, 1, 1, metric=False) == 43560     # ft3 per acre-ft
+    assert_allclose(volumetrics.ogip(640, 50, 0.3, 0.2, 0.8, 0.005, metric=False),
+                    43560 * 640 * 50 * 0.7 * 0.2 * 0.8 / 0.005)
+
+def test_constant_inputs():
+    result = montecarlo.ogip_mc(640, 50, 0.3, 0.2, 0.8, 0.005, metric=False, realizations=1000, seed=0)
+    expected = volumetrics.ogip(640, 50, 0.3, 0.2, 0.8, 0.005, metric=False)
+    for key in ('p90', 'p50', 'p10', 'mean'):
+        assert result[key] == pytest.approx(expected, rel=1e-6)
+
+def test_batched_percentiles():
+    inputs = (('uniform', 1e6, 3e6), ('normal', 20, 3, 10, 30), ('uniform', 0.2, 0.4),
+              ('normal', 0.22, 0.03, 0.05, 0.35), 0.8, 1.2)
+    exact = montecarlo.ooip_mc(*inputs, realizations=400000, batch_size=100000, seed=1)
+    batched = montecarlo.ooip_mc(*inputs, realizations=400000, batch_size=100000, seed=1, exact=False)
+    assert exact['p90'] < exact['p50'] < exact['p10']
+    for key in ('p90', 'p50', 'p10', 'mean'):
+        assert batched[key] == pytest.approx(exact[key], rel=1e-3)